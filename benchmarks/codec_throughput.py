@@ -0,0 +1,109 @@
+"""Compare todos.json load/save throughput of the old and the fast codec.
+
+Usage:
+    python benchmarks/codec_throughput.py [--count N] [--repeat N]
+
+The "old" path is the code TodoManager used before the codec: a
+from_dict that looks every field up with dict.get, converts the enums
+by calling the Enum classes and computes uuid4()/datetime.now() defaults
+for every record, and a writer that pretty-prints with indent=2. The
+"new" path is codec.load/codec.dump with its default compact output.
+Each path runs against the same file, and the best of --repeat runs is
+reported.
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import codec
+from models import Priority, Status, TodoItem
+
+
+def _old_from_dict(data: dict) -> TodoItem:
+    """TodoItem.from_dict as it was before the fast path."""
+    return TodoItem(
+        id=data.get("id", str(uuid4())),
+        title=data.get("title", ""),
+        details=data.get("details", ""),
+        priority=Priority(data.get("priority", "MID")),
+        status=Status(data.get("status", "PENDING")),
+        owner=data.get("owner", ""),
+        created_at=data.get("created_at", datetime.now().isoformat()),
+        updated_at=data.get("updated_at", datetime.now().isoformat()),
+    )
+
+
+def _old_load(fp) -> list:
+    return [_old_from_dict(item) for item in json.load(fp)]
+
+
+def _old_dump(todos, fp) -> None:
+    json.dump([todo.to_dict() for todo in todos], fp, indent=2)
+
+
+def _todos(count: int) -> list:
+    """Return count todos shaped like real ones."""
+    return [
+        TodoItem(
+            id=str(i + 1),
+            title=f"Todo number {i}",
+            details="Some details about the task",
+            priority=(Priority.HIGH, Priority.MID, Priority.LOW)[i % 3],
+            status=(Status.PENDING, Status.COMPLETED)[i % 2],
+            owner=f"user{i % 1000:05d}",
+            created_at=f"2024-{i % 12 + 1:02d}-01T12:{i % 60:02d}:00.{i % 999999:06d}",
+            updated_at=f"2024-{i % 12 + 1:02d}-02T08:{i % 60:02d}:30.{i % 999999:06d}",
+        )
+        for i in range(count)
+    ]
+
+
+def _best(func, repeat: int) -> float:
+    """Return the fastest of repeat timed calls to func, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Print records/sec for loading and saving with both codecs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    todos = _todos(args.count)
+    text = codec.dumps(todos)
+    assert _old_load(io.StringIO(text)) == codec.load(io.StringIO(text)) == todos
+
+    results = {
+        "load": (
+            _best(lambda: _old_load(io.StringIO(text)), args.repeat),
+            _best(lambda: codec.load(io.StringIO(text)), args.repeat),
+        ),
+        "save": (
+            _best(lambda: _old_dump(todos, io.StringIO()), args.repeat),
+            _best(lambda: codec.dump(todos, io.StringIO()), args.repeat),
+        ),
+    }
+    pretty_size = len(codec.dumps(todos, pretty=True))
+    print(f"records: {args.count}, file size: {len(text)} bytes "
+          f"(indent=2: {pretty_size} bytes)")
+    print(f"{'':6}{'old rec/s':>14}{'new rec/s':>14}{'speedup':>10}")
+    for name, (old, new) in results.items():
+        print(f"{name:6}{args.count / old:14,.0f}{args.count / new:14,.0f}{old / new:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
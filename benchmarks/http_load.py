@@ -0,0 +1,169 @@
+"""Load generator for the HTTP/JSON API (src/httpapi.py).
+
+Usage:
+    python benchmarks/http_load.py [--connections N] [--pipeline N]
+                                   [--requests N] [--writes PCT]
+                                   [--port P --username U --password P]
+
+Without --port a server is started in a subprocess on a throwaway data
+directory with a "bench" user and --todos todos. Each of --connections
+keep-alive connections logs in, then keeps --pipeline requests in
+flight: it writes that many requests back to back and reads the
+responses in order. --writes percent of the requests are PATCHes of a
+todo's details; the rest are GETs of one todo. Latency is measured per
+request, from the moment its batch is written to the moment its
+response has been read, so it includes the time spent queued behind
+earlier requests in the same pipeline.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import AuthManager
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+def _request(method: str, path: str, token: Optional[str] = None, body: Optional[dict] = None) -> bytes:
+    """Serialize one HTTP/1.1 request."""
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    head = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(payload)}"]
+    if token:
+        head.append(f"Authorization: Bearer {token}")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload
+
+
+async def _response(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one response; returns the status code and body."""
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _call(reader, writer, method, path, token=None, body=None) -> Tuple[int, dict]:
+    """Send one request and wait for its response."""
+    writer.write(_request(method, path, token, body))
+    status, payload = await _response(reader)
+    return status, json.loads(payload) if payload else {}
+
+
+async def _connection(host, port, args, ids, latencies: List[float], errors: List[int], quota: int) -> None:
+    """Run quota requests over one keep-alive connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    _, login = await _call(reader, writer, "POST", "/login", body={
+        "username": args.username, "password": args.password,
+    })
+    token = login["token"]
+    rng = random.Random()
+    sent = 0
+    while sent < quota:
+        batch = min(args.pipeline, quota - sent)
+        requests = []
+        for _ in range(batch):
+            todo_id = rng.choice(ids)
+            if rng.random() * 100 < args.writes:
+                requests.append(_request("PATCH", f"/todos/{todo_id}", token,
+                                         {"details": f"edited {rng.random()}"}))
+            else:
+                requests.append(_request("GET", f"/todos/{todo_id}", token))
+        start = time.perf_counter()
+        writer.write(b"".join(requests))
+        for _ in range(batch):
+            status, _ = await _response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+        sent += batch
+    writer.close()
+
+
+async def _run(host: str, port: int, args) -> None:
+    """Seed todos, run the load and print the report."""
+    reader, writer = await asyncio.open_connection(host, port)
+    status, login = await _call(reader, writer, "POST", "/login", body={
+        "username": args.username, "password": args.password,
+    })
+    if status != 200:
+        sys.exit(f"Login failed: {login}")
+    _, page = await _call(reader, writer, "GET", "/todos?limit=1000", login["token"])
+    ids = [todo["id"] for todo in page["items"]]
+    for i in range(len(ids), args.todos):
+        _, todo = await _call(reader, writer, "POST", "/todos", login["token"],
+                              {"title": f"Bench todo {i}", "details": "", "priority": "MID"})
+        ids.append(todo["id"])
+    writer.close()
+
+    latencies: List[float] = []
+    errors: List[int] = []
+    per_connection, extra = divmod(args.requests, args.connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _connection(host, port, args, ids, latencies, errors, per_connection + (i < extra))
+        for i in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+    print(f"connections: {args.connections}, pipeline depth: {args.pipeline}, "
+          f"writes: {args.writes}%")
+    print(f"requests: {len(latencies)} in {elapsed:.2f}s, errors: {len(errors)}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency ms: p50 {pct(50):.2f}  p90 {pct(90):.2f}  p99 {pct(99):.2f}  "
+          f"max {latencies[-1] * 1000:.2f}")
+
+
+def main() -> None:
+    """Run the load test against a given or freshly started server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="existing server; default: start one")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--writes", type=float, default=10.0, help="percent of PATCHes")
+    parser.add_argument("--todos", type=int, default=200, help="todos to seed")
+    args = parser.parse_args()
+
+    if args.port is not None:
+        asyncio.run(_run(args.host, args.port, args))
+        return
+    with tempfile.TemporaryDirectory() as data_dir:
+        AuthManager(data_dir=data_dir).sign_up(args.username, args.password)
+        server = subprocess.Popen(
+            [sys.executable, str(SRC / "httpapi.py"), "--data-dir", data_dir,
+             "--host", args.host, "--port", "0"],
+            stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            port = int(server.stdout.readline().rsplit(":", 1)[1])
+            asyncio.run(_run(args.host, port, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measure resident memory per todo for TodoItem and CompactTodoItem.
+
+Usage:
+    python benchmarks/memory_per_item.py [--count N] [--owners N]
+
+Items are built from freshly decoded JSON records, as TodoManager does
+when it loads todos.json, so every record starts with its own copy of
+the owner and timestamp strings. Memory is measured with tracemalloc.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import CompactTodoItem, TodoItem
+
+
+def _records(count: int, owners: int):
+    """Yield decoded todo records shaped like the ones in todos.json."""
+    for i in range(count):
+        yield json.loads(json.dumps({
+            "id": str(i + 1),
+            "title": f"Todo number {i}",
+            "details": "Some details about the task",
+            "priority": ("HIGH", "MID", "LOW")[i % 3],
+            "status": ("PENDING", "COMPLETED")[i % 2],
+            "owner": f"user{i % owners:05d}",
+            "created_at": f"2024-{i % 12 + 1:02d}-01T12:{i % 60:02d}:00.{i % 999999:06d}",
+            "updated_at": f"2024-{i % 12 + 1:02d}-02T08:{i % 60:02d}:30.{i % 999999:06d}",
+        }))
+
+
+def measure(cls, count: int, owners: int) -> float:
+    """Return the traced bytes per item held by count instances of cls."""
+    gc.collect()
+    tracemalloc.start()
+    items = [cls.from_dict(record) for record in _records(count, owners)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(items) == count
+    del items
+    gc.collect()
+    return current / count
+
+
+def main() -> None:
+    """Print bytes per item for both representations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--owners", type=int, default=1000)
+    args = parser.parse_args()
+
+    before = measure(TodoItem, args.count, args.owners)
+    after = measure(CompactTodoItem, args.count, args.owners)
+    print(f"items: {args.count}, owners: {args.owners}")
+    print(f"TodoItem:        {before:8.1f} bytes/item")
+    print(f"CompactTodoItem: {after:8.1f} bytes/item")
+    print(f"saving:          {1 - after / before:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Time TodoManager and AuthManager operations at growing data sizes.
+
+Usage:
+    python benchmarks/scale.py [--sizes 1000,10000,100000] [--ops N]
+                               [--storage json] [--output results.json]
+                               [--baseline benchmarks/baseline.json]
+                               [--threshold 0.25] [--save-baseline]
+
+For each size a throwaway data directory is seeded by the datagen
+module with that many todos and size / 10 users (at least 10), owners
+Zipf-distributed. Then --ops calls of each operation are timed one by
+one against random targets: create_todo, get_todos_by_owner (the owner
+of a random todo, so busy owners come up more often), get_todo_by_id,
+update_todo, mark_as_completed, delete_todo, sign_up and login. Seeding
+is not part of any timing.
+
+Results are printed and written as JSON (--output). If a baseline file
+exists, each operation's median is compared with the baseline's for the
+same size and storage; the run exits with status 1 if any is more than
+--threshold slower. --save-baseline writes the results to the baseline
+file instead. Baselines are only comparable on the same machine.
+1M todos is supported (--sizes 1000000) but takes several minutes.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from datagen import DatasetSpec, generate_todos, username, write_dataset, write_users
+from managers import AuthManager, TodoManager
+from models import PRIORITY_BY_VALUE, STATUS_BY_VALUE, Priority
+
+BASELINE = Path(__file__).parent / "baseline.json"
+OPERATIONS = (
+    "create_todo", "get_todos_by_owner", "get_todo_by_id", "update_todo",
+    "mark_as_completed", "delete_todo", "sign_up", "login",
+)
+SEED_BATCH = 50_000
+
+
+def _seed(data_dir: str, size: int, storage: str, seed: int) -> DatasetSpec:
+    """Fill data_dir with a generated data set of size todos."""
+    spec = DatasetSpec(todos=size, users=max(10, size // 10), seed=seed)
+    if storage == "json":
+        write_dataset(Path(data_dir), spec)
+        return spec
+    # Other backends store the generated todos through the manager.
+    write_users(Path(data_dir), spec)
+    manager = TodoManager(data_dir=data_dir, storage=storage)
+    records = generate_todos(spec)
+    while batch := list(itertools.islice(records, SEED_BATCH)):
+        for record in batch:
+            record["priority"] = PRIORITY_BY_VALUE[record["priority"]]
+            record["status"] = STATUS_BY_VALUE[record["status"]]
+        manager.create_many(batch)
+    manager.close()
+    return spec
+
+
+def _time(func: Callable[[int], object], ops: int) -> Dict[str, float]:
+    """Call func(i) for i in range(ops) and summarize the latencies."""
+    samples = []
+    clock = time.perf_counter
+    for i in range(ops):
+        start = clock()
+        func(i)
+        samples.append(clock() - start)
+    samples.sort()
+
+    def pct(p: float) -> float:
+        return samples[min(ops - 1, int(ops * p / 100))] * 1e6
+
+    return {
+        "ops_per_sec": ops / sum(samples),
+        "mean_us": sum(samples) / ops * 1e6,
+        "p50_us": pct(50),
+        "p99_us": pct(99),
+    }
+
+
+def run_size(size: int, ops: int, storage: str, seed: int = 0) -> Dict[str, dict]:
+    """Seed a data directory with size todos and time every operation."""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as data_dir:
+        spec = _seed(data_dir, size, storage, seed)
+        todos = TodoManager(data_dir=data_dir, storage=storage)
+        auth = AuthManager(data_dir=data_dir)
+        ids = [str(n) for n in rng.sample(range(1, size + 1), min(size, 3 * ops))]
+        owners = [todos.get_todo_by_id(todo_id).owner for todo_id in ids]
+        created: List[str] = []
+
+        def create(i: int) -> None:
+            created.append(todos.create_todo(f"New {i}", "", Priority.MID, rng.choice(owners)).id)
+
+        # Fetched up front so the timed update is the update alone.
+        edits = [todos.get_todo_by_id(ids[i % len(ids)]) for i in range(ops)]
+
+        def update(i: int) -> None:
+            todo = edits[i]
+            todo.details = f"Edited {i}"
+            todos.update_todo(todo)
+
+        def complete(i: int) -> None:
+            k = (ops + i) % len(ids)
+            todos.mark_as_completed(ids[k], owners[k])
+
+        results = {
+            "create_todo": _time(create, ops),
+            "get_todos_by_owner": _time(lambda i: todos.get_todos_by_owner(rng.choice(owners)), ops),
+            "get_todo_by_id": _time(lambda i: todos.get_todo_by_id(rng.choice(ids)), ops),
+            "update_todo": _time(update, ops),
+            "mark_as_completed": _time(complete, ops),
+            "delete_todo": _time(lambda i: todos.delete_todo(created[i]), ops),
+            "sign_up": _time(lambda i: auth.sign_up(f"new{i:06d}", "secret"), ops),
+            "login": _time(lambda i: auth.login(username(rng.randrange(spec.users)), spec.password), ops),
+        }
+        todos.close()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return a line per operation whose median regressed past threshold."""
+    regressions = []
+    if baseline.get("storage") != results["storage"]:
+        return regressions
+    for size, operations in results["sizes"].items():
+        for name, current in operations.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            ratio = current["p50_us"] / before["p50_us"]
+            current["vs_baseline"] = round(ratio, 3)
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{name} at {int(size):,} todos: p50 {current['p50_us']:.1f}us "
+                    f"vs {before['p50_us']:.1f}us baseline ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Run the suite, print and store the results and check the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--ops", type=int, default=100, help="calls timed per operation")
+    parser.add_argument("--storage", default="json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of a median before failing (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage": args.storage,
+        "ops": args.ops,
+        "sizes": {},
+    }
+    print(f"{'todos':>9} {'operation':<20} {'ops/s':>10} {'p50 us':>10} {'p99 us':>10}")
+    for size in (int(n) for n in args.sizes.split(",")):
+        results["sizes"][str(size)] = operations = run_size(size, args.ops, args.storage, args.seed)
+        for name in OPERATIONS:
+            r = operations[name]
+            print(f"{size:>9,} {name:<20} {r['ops_per_sec']:>10,.0f} "
+                  f"{r['p50_us']:>10.1f} {r['p99_us']:>10.1f}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+        regressions = []
+    elif args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if not regressions:
+            print(f"No operation more than {args.threshold:.0%} slower than {args.baseline}")
+    else:
+        regressions = []
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
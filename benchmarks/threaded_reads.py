@@ -0,0 +1,110 @@
+"""Read throughput of one shared TodoManager while a writer is busy.
+
+Usage:
+    python benchmarks/threaded_reads.py [--todos N] [--threads 1,2,4,8]
+                                        [--seconds S] [--write-interval MS]
+
+One TodoManager on a throwaway data directory is shared by N reader
+threads, each calling get_todo_by_id on random todos, and one writer
+thread updating a random todo every --write-interval milliseconds
+(0: back to back). Every update rewrites and fsyncs todos.json. The run
+is repeated with lock-free reads (ReadView) and with every read taking
+the data directory lock, for each thread count.
+
+CPython runs one thread's bytecode at a time, so pure-Python reads do
+not get faster in aggregate with more threads. What the read view buys
+is that readers no longer queue behind the writer while it holds the
+lock through serialization and fsync: compare the p99 latencies.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import TodoManager
+from models import Priority
+
+
+def _run(data_dir: str, lock_free: bool, threads: int, seconds: float, interval: float) -> dict:
+    """Run one configuration and return its read and write figures."""
+    manager = TodoManager(data_dir=data_dir, lock_free_reads=lock_free)
+    ids = [todo.id for todo in manager.get_all_todos()]
+    stop = threading.Event()
+    latencies: List[List[float]] = [[] for _ in range(threads)]
+    writes = [0]
+
+    def reader(samples: List[float]) -> None:
+        rng = random.Random()
+        clock = time.perf_counter
+        while not stop.is_set():
+            start = clock()
+            manager.get_todo_by_id(rng.choice(ids))
+            samples.append(clock() - start)
+
+    def writer() -> None:
+        rng = random.Random()
+        while not stop.is_set():
+            todo = manager.get_todo_by_id(rng.choice(ids))
+            todo.details = f"edited {rng.random()}"
+            manager.update_todo(todo)
+            writes[0] += 1
+            if interval:
+                stop.wait(interval)
+
+    workers = [threading.Thread(target=reader, args=(samples,)) for samples in latencies]
+    workers.append(threading.Thread(target=writer))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    manager.close()
+
+    merged = sorted(sample for samples in latencies for sample in samples)
+
+    def pct(p: float) -> float:
+        return merged[min(len(merged) - 1, int(len(merged) * p / 100))] * 1e6
+
+    return {
+        "reads": len(merged) / seconds,
+        "writes": writes[0] / seconds,
+        "p50": pct(50),
+        "p99": pct(99),
+    }
+
+
+def main() -> None:
+    """Print read throughput and latency per thread count and read mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=5_000)
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--write-interval", type=float, default=5.0, help="ms between writes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        TodoManager(data_dir=data_dir).create_many(
+            {"title": f"Todo {i}", "details": "", "priority": Priority.MID, "owner": f"user{i % 50}"}
+            for i in range(args.todos)
+        )
+        print(f"todos: {args.todos}, write interval: {args.write_interval} ms, "
+              f"{args.seconds}s per run")
+        print(f"{'threads':>7} {'mode':>9} {'reads/s':>10} {'writes/s':>9} "
+              f"{'p50 us':>8} {'p99 us':>9}")
+        for threads in (int(n) for n in args.threads.split(",")):
+            for lock_free, mode in ((False, "locked"), (True, "lock-free")):
+                r = _run(data_dir, lock_free, threads, args.seconds, args.write_interval / 1000)
+                print(f"{threads:>7} {mode:>9} {r['reads']:>10,.0f} {r['writes']:>9,.0f} "
+                      f"{r['p50']:>8.1f} {r['p99']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
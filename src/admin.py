@@ -0,0 +1,198 @@
+"""Maintenance commands for a todo data directory.
+
+Run as ``python src/admin.py [--data-dir DIR] <command> [options]``.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from bulkio import Progress, detect_format, export_todos, import_todos
+from datagen import DatasetSpec, parse_mix, write_dataset
+from managers import TodoManager
+from models import STATUS_BY_VALUE
+from storage import migrate_json_to_sharded, migrate_json_to_sqlite
+
+
+def compact(args: argparse.Namespace) -> int:
+    """Rewrite the todo store without superseded or deleted records."""
+    manager = TodoManager(data_dir=args.data_dir)
+    try:
+        reclaimed = manager.compact()
+    finally:
+        manager.close()
+    print(f"Compacted {manager.storage} store: {reclaimed} dead records reclaimed.")
+    return 0
+
+
+def migrate(args: argparse.Namespace) -> int:
+    """Move the todos.json data in the data directory to another backend."""
+    try:
+        if args.to == "sqlite":
+            count = migrate_json_to_sqlite(args.data_dir, batch_size=args.batch_size)
+        else:
+            count = migrate_json_to_sharded(args.data_dir, buckets=args.buckets)
+    except (FileNotFoundError, FileExistsError) as e:
+        print(f"Migration failed: {e.__class__.__name__}: {e}", file=sys.stderr)
+        return 1
+    print(f"Migrated {count} todos to {args.to}.")
+    return 0
+
+
+def _progress(verb: str) -> Progress:
+    """Return a progress callback that keeps one status line on stderr."""
+    def report(rows: int, seconds: float) -> None:
+        rate = rows / seconds if seconds else 0.0
+        print(f"\r{verb} {rows:,} rows ({rate:,.0f} rows/s)", end="", file=sys.stderr, flush=True)
+    return report
+
+
+def import_file(args: argparse.Namespace) -> int:
+    """Create todos from a CSV or JSONL file."""
+    manager = TodoManager(data_dir=args.data_dir)
+    try:
+        result = import_todos(
+            manager, Path(args.path), fmt=args.format, workers=args.workers,
+            chunk_bytes=args.chunk_kb * 1024, progress=_progress("Read"),
+        )
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close()
+    print(file=sys.stderr)
+    for error in result.errors:
+        print(f"Rejected {error}", file=sys.stderr)
+    print(f"Imported {result.imported:,} todos in {result.seconds:.2f}s "
+          f"({result.rows_per_second:,.0f} rows/s); {result.rejected:,} rejected.")
+    return 1 if result.rejected else 0
+
+
+def export_file(args: argparse.Namespace) -> int:
+    """Write todos to a CSV or JSONL file, or to stdout with ``-``."""
+    try:
+        fmt = detect_format(Path(args.path), args.format)
+    except ValueError as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    manager = TodoManager(data_dir=args.data_dir)
+    status = STATUS_BY_VALUE[args.status] if args.status else None
+    try:
+        if args.path == "-":
+            count = export_todos(manager, sys.stdout, fmt, args.owner, status, _progress("Wrote"))
+        else:
+            with open(args.path, "w", encoding="utf-8", newline="") as out:
+                count = export_todos(manager, out, fmt, args.owner, status, _progress("Wrote"))
+    finally:
+        manager.close()
+    print(f"\nExported {count:,} todos.", file=sys.stderr)
+    return 0
+
+
+def generate(args: argparse.Namespace) -> int:
+    """Fill the data directory with a generated, production-shaped data set."""
+    try:
+        spec = DatasetSpec(
+            todos=args.todos, users=args.users, seed=args.seed, zipf_s=args.zipf,
+            priority_mix=parse_mix(args.priority_mix), completed=args.completed,
+            days=args.days, password=args.password,
+        )
+        report = _progress("Generated")
+        start = time.perf_counter()
+        write_dataset(
+            Path(args.data_dir), spec, overwrite=args.force,
+            progress=lambda rows: report(rows, time.perf_counter() - start),
+        )
+    except (FileExistsError, ValueError) as e:
+        print(f"Generation failed: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(f"Wrote {spec.todos:,} todos and {spec.users:,} users to {args.data_dir}.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the admin commands."""
+    parser = argparse.ArgumentParser(description="Todo List data maintenance")
+    parser.add_argument(
+        "--data-dir", default="data", help="data directory (default: data)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = commands.add_parser(
+        "compact", help="reclaim space held by dead records"
+    )
+    compact_parser.set_defaults(func=compact)
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="move todos.json into another storage backend"
+    )
+    migrate_parser.add_argument("--to", choices=["sqlite", "sharded"], required=True)
+    migrate_parser.add_argument(
+        "--batch-size", type=int, default=1000, help="todos per transaction (sqlite)"
+    )
+    migrate_parser.add_argument(
+        "--buckets", type=int, default=64, help="number of shards (sharded)"
+    )
+    migrate_parser.set_defaults(func=migrate)
+
+    import_parser = commands.add_parser(
+        "import", help="create todos from a CSV or JSONL file"
+    )
+    import_parser.add_argument("path", help="file to import (.csv or .jsonl)")
+    import_parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from suffix")
+    import_parser.add_argument(
+        "--workers", type=int, help="parser processes (default: CPU count; 1: none)"
+    )
+    import_parser.add_argument(
+        "--chunk-kb", type=int, default=1024, help="input per batch write (default: 1024)"
+    )
+    import_parser.set_defaults(func=import_file)
+
+    export_parser = commands.add_parser(
+        "export", help="write todos to a CSV or JSONL file"
+    )
+    export_parser.add_argument("path", help="output file (.csv or .jsonl), or - for stdout")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from suffix")
+    export_parser.add_argument("--owner", help="only this owner's todos")
+    export_parser.add_argument("--status", choices=sorted(STATUS_BY_VALUE), help="only todos with this status")
+    export_parser.set_defaults(func=export_file)
+
+    generate_parser = commands.add_parser(
+        "generate", help="write a synthetic data set (todos.json, users.json)"
+    )
+    generate_parser.add_argument("--todos", type=int, default=100_000)
+    generate_parser.add_argument("--users", type=int, default=1_000)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument(
+        "--zipf", type=float, default=1.1, help="owner skew exponent (default: 1.1)"
+    )
+    generate_parser.add_argument(
+        "--priority-mix", default="HIGH=20,MID=50,LOW=30", help="relative priority weights"
+    )
+    generate_parser.add_argument(
+        "--completed", type=float, default=0.35, help="fraction completed (default: 0.35)"
+    )
+    generate_parser.add_argument(
+        "--days", type=int, default=730, help="creation period in days (default: 730)"
+    )
+    generate_parser.add_argument("--password", default="secret", help="password of every user")
+    generate_parser.add_argument(
+        "--force", action="store_true", help="replace existing todos.json and users.json"
+    )
+    generate_parser.set_defaults(func=generate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Admin entry point."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""Memory-mapped binary record file with an on-disk hash index.
+
+File layout (all integers little-endian)::
+
+    header   64 bytes   magic, version, slot count, counters, data end
+    slots    N x 16     (key hash, record offset) open-addressing table
+    records  ...        (seq, key len, group len, value len) + key + group + value
+
+Records are only ever appended. A slot offset of 0 marks an empty slot
+and 1 a deleted one. Each record carries a sequence number, so scans can
+return records in insertion order even after updates have appended newer
+copies. A record also carries a small ``group`` string that scans can
+read without decoding the value.
+
+Readers map the file with ``mmap`` and only touch the pages holding the
+slots they probe and the record they decode. Every process mapping the
+file shares the OS page cache. Writers use positional writes on the same
+file. The table is rebuilt into a fresh file, which is then moved into
+place, when it gets too full. Other handles notice the new inode and
+reopen it.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"TODOBIN1"
+VERSION = 1
+
+# magic, version, slot_count, live, tombstones, garbage, data_end, next_seq, generation
+_HEADER = struct.Struct("<8sIIQQQQQQ")
+HEADER_SIZE = _HEADER.size
+_SLOT = struct.Struct("<QQ")
+_RECORD = struct.Struct("<QIII")
+
+EMPTY = 0
+DELETED = 1
+MAX_LOAD = 0.7
+
+
+class Header(NamedTuple):
+    """Decoded file header."""
+
+    magic: bytes
+    version: int
+    slot_count: int
+    live: int
+    tombstones: int
+    garbage: int
+    data_end: int
+    next_seq: int
+    generation: int
+
+
+class Entry(NamedTuple):
+    """A live record found by RecordFile.scan."""
+
+    seq: int
+    key: str
+    group: str
+    offset: int
+
+
+def _hash(key: bytes) -> int:
+    """Return a stable 64-bit hash of key."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _slot_count_for(count: int, minimum: int) -> int:
+    """Return a power-of-two slot count that keeps count records under half load."""
+    slots = max(minimum, 8)
+    while count * 2 > slots:
+        slots *= 2
+    return slots
+
+
+class RecordFile:
+    """Key -> (group, value) record file read through mmap."""
+
+    def __init__(self, path: Path, slot_count: int = 1024):
+        """Open the file at path, creating it with slot_count slots if missing."""
+        self.path = Path(path)
+        self._initial_slots = _slot_count_for(0, slot_count)
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+        self._open()
+
+    # -- file handling -------------------------------------------------
+
+    def _open(self) -> None:
+        """Open and map the file, creating an empty one if needed."""
+        if not self.path.exists():
+            self._write_file([], self._initial_slots, next_seq=0, generation=0)
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._inode = os.fstat(self._fd).st_ino
+        self._remap()
+        header = self.header()
+        if header.magic != MAGIC or header.version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a todo binary store")
+
+    def _remap(self) -> None:
+        """Map the whole current file."""
+        if self._map is not None:
+            self._map.close()
+        size = os.fstat(self._fd).st_size
+        self._map = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+
+    def _check(self) -> None:
+        """Reopen if the file was replaced; remap if it grew."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_ino != self._inode:
+            self.close()
+            self._open()
+        elif st.st_size > len(self._map):
+            self._remap()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def header(self) -> Header:
+        """Return the current header."""
+        return Header(*_HEADER.unpack_from(self._map, 0))
+
+    def _write_header(self, header: Header) -> None:
+        """Write header back to the file."""
+        os.pwrite(self._fd, _HEADER.pack(*header), 0)
+
+    # -- slot table ----------------------------------------------------
+
+    def _slot(self, index: int) -> Tuple[int, int]:
+        """Return (hash, offset) of slot index."""
+        return _SLOT.unpack_from(self._map, HEADER_SIZE + index * _SLOT.size)
+
+    def _write_slot(self, index: int, key_hash: int, offset: int) -> None:
+        """Write (hash, offset) into slot index."""
+        os.pwrite(self._fd, _SLOT.pack(key_hash, offset), HEADER_SIZE + index * _SLOT.size)
+
+    def _record(self, offset: int) -> Tuple[int, bytes, bytes, int, int]:
+        """Return (seq, key, group, value_start, value_end) of the record at offset."""
+        if offset + _RECORD.size > len(self._map):
+            self._remap()
+        seq, key_len, group_len, value_len = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size
+        end = start + key_len + group_len + value_len
+        if end > len(self._map):
+            self._remap()
+        key = self._map[start:start + key_len]
+        group = self._map[start + key_len:start + key_len + group_len]
+        return seq, key, group, start + key_len + group_len, end
+
+    def _find(self, key: bytes, key_hash: int, slot_count: int) -> Tuple[Optional[int], Optional[int]]:
+        """Probe for key. Returns (matching slot, first reusable slot)."""
+        mask = slot_count - 1
+        index = key_hash & mask
+        reusable = None
+        for _ in range(slot_count):
+            slot_hash, offset = self._slot(index)
+            if offset == EMPTY:
+                return None, index if reusable is None else reusable
+            if offset == DELETED:
+                if reusable is None:
+                    reusable = index
+            elif slot_hash == key_hash and self._record(offset)[1] == key:
+                return index, reusable
+            index = (index + 1) & mask
+        return None, reusable
+
+    # -- public API ----------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored for key, or None."""
+        self._check()
+        kb = key.encode("utf-8")
+        slot, _ = self._find(kb, _hash(kb), self.header().slot_count)
+        if slot is None:
+            return None
+        _, _, _, start, end = self._record(self._slot(slot)[1])
+        return self._map[start:end]
+
+    def put(self, key: str, group: str, value: bytes) -> None:
+        """Store value under key, replacing any previous value."""
+        self._check()
+        header = self.header()
+        kb = key.encode("utf-8")
+        gb = group.encode("utf-8")
+        key_hash = _hash(kb)
+        slot, reusable = self._find(kb, key_hash, header.slot_count)
+        if slot is None and (
+            reusable is None
+            or header.live + header.tombstones + 1 > header.slot_count * MAX_LOAD
+        ):
+            self._rebuild(_slot_count_for(header.live + 1, header.slot_count))
+            self.put(key, group, value)
+            return
+
+        if slot is not None:
+            seq = self._record(self._slot(slot)[1])[0]
+            target = slot
+        else:
+            seq = header.next_seq
+            target = reusable
+        record = _RECORD.pack(seq, len(kb), len(gb), len(value)) + kb + gb + value
+        offset = header.data_end
+        os.pwrite(self._fd, record, offset)
+
+        reused_tombstone = slot is None and self._slot(target)[1] == DELETED
+        # Reserve the space in the header before publishing the slot.
+        self._write_header(header._replace(
+            live=header.live + (slot is None),
+            tombstones=header.tombstones - reused_tombstone,
+            garbage=header.garbage + (slot is not None),
+            data_end=offset + len(record),
+            next_seq=header.next_seq + (slot is None),
+            generation=header.generation + 1,
+        ))
+        self._write_slot(target, key_hash, offset)
+
+    def delete(self, key: str) -> bool:
+        """Remove key. Returns True if it was present."""
+        self._check()
+        header = self.header()
+        kb = key.encode("utf-8")
+        key_hash = _hash(kb)
+        slot, _ = self._find(kb, key_hash, header.slot_count)
+        if slot is None:
+            return False
+        self._write_slot(slot, key_hash, DELETED)
+        self._write_header(header._replace(
+            live=header.live - 1,
+            tombstones=header.tombstones + 1,
+            garbage=header.garbage + 1,
+            generation=header.generation + 1,
+        ))
+        return True
+
+    def scan(self) -> List[Entry]:
+        """Return every live record's entry in insertion order.
+
+        Only record headers, keys and groups are read; values stay on disk
+        until read_value is called.
+        """
+        self._check()
+        entries = []
+        for index in range(self.header().slot_count):
+            offset = self._slot(index)[1]
+            if offset > DELETED:
+                seq, key, group, _, _ = self._record(offset)
+                entries.append(Entry(seq, key.decode("utf-8"), group.decode("utf-8"), offset))
+        entries.sort()
+        return entries
+
+    def read_value(self, offset: int) -> bytes:
+        """Return the value of the record at offset (from scan)."""
+        _, _, _, start, end = self._record(offset)
+        return self._map[start:end]
+
+    def iter_values(self, entries: Iterable[Entry]) -> Iterator[bytes]:
+        """Yield the value of each entry, skipping keys deleted since.
+
+        Records are only ever appended, so the offsets from scan stay
+        valid until the file is replaced (compacted or rebuilt). Once this
+        handle has reopened it, the remaining entries are looked up by key.
+        """
+        inode = self._inode
+        for entry in entries:
+            if self._inode == inode:
+                yield self.read_value(entry.offset)
+            else:
+                value = self.get(entry.key)
+                if value is not None:
+                    yield value
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every write; changes when anyone writes."""
+        self._check()
+        return self.header().generation
+
+    def rewrite(self, records: Iterable[Tuple[str, str, bytes]]) -> None:
+        """Replace the whole file with records, given as (key, group, value)."""
+        records = list(records)
+        header = self.header()
+        self._replace_file(
+            [(seq, key, group, value) for seq, (key, group, value) in enumerate(records)],
+            _slot_count_for(len(records), self._initial_slots),
+            next_seq=len(records),
+            generation=header.generation + 1,
+        )
+
+    def compact(self) -> int:
+        """Drop dead records and tombstones. Returns records reclaimed."""
+        self._check()
+        garbage = self.header().garbage
+        if garbage:
+            self._rebuild(_slot_count_for(self.header().live, self._initial_slots))
+        return garbage
+
+    def _rebuild(self, slot_count: int) -> None:
+        """Rewrite the live records into a file with slot_count slots."""
+        header = self.header()
+        records = [
+            (e.seq, e.key, e.group, self.read_value(e.offset)) for e in self.scan()
+        ]
+        self._replace_file(records, slot_count, header.next_seq, header.generation + 1)
+
+    def _replace_file(self, records, slot_count: int, next_seq: int, generation: int) -> None:
+        """Write a new file and move it into place."""
+        self._write_file(records, slot_count, next_seq, generation)
+        self.close()
+        self._open()
+
+    def _write_file(self, records, slot_count: int, next_seq: int, generation: int) -> None:
+        """Atomically write a complete file holding records (seq, key, group, value)."""
+        slots = bytearray(slot_count * _SLOT.size)
+        mask = slot_count - 1
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        offset = HEADER_SIZE + len(slots)
+        with open(tmp_path, "wb") as f:
+            f.seek(offset)
+            for seq, key, group, value in records:
+                kb = key.encode("utf-8")
+                gb = group.encode("utf-8")
+                key_hash = _hash(kb)
+                index = key_hash & mask
+                while _SLOT.unpack_from(slots, index * _SLOT.size)[1] != EMPTY:
+                    index = (index + 1) & mask
+                _SLOT.pack_into(slots, index * _SLOT.size, key_hash, offset)
+                record = _RECORD.pack(seq, len(kb), len(gb), len(value)) + kb + gb + value
+                f.write(record)
+                offset += len(record)
+            f.seek(0)
+            f.write(_HEADER.pack(
+                MAGIC, VERSION, slot_count, len(records), 0, 0, offset, next_seq, generation
+            ))
+            f.write(slots)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
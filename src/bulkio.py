@@ -0,0 +1,327 @@
+"""Bulk import and export of todos as CSV or JSON Lines.
+
+Imports cut the file into chunks of whole records, which worker processes
+decode and validate in parallel while the parent commits earlier chunks.
+Each chunk becomes one TodoManager.create_many call: one ID block and one
+store write. Exports stream from TodoManager.iter_todos, so memory use
+does not grow with the number of todos.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Deque, Iterator, List, Optional, TextIO, Tuple
+
+from managers import TodoManager
+from models import PRIORITY_BY_VALUE, STATUS_BY_VALUE, Status
+
+FORMATS = ("csv", "jsonl")
+# Columns written by export. Import reads the same header but ignores id
+# and version: imported todos get fresh ones.
+FIELDS = ("id", "title", "details", "priority", "status", "owner", "created_at", "updated_at", "version")
+REQUIRED_FIELDS = ("title", "owner")
+MAX_REPORTED_ERRORS = 100
+
+# Called with the number of records handled so far and the seconds elapsed.
+Progress = Callable[[int, float], None]
+# What a worker returns for a chunk: valid records as create_many
+# arguments, (index in chunk, reason) per invalid one, and the record count.
+ParsedChunk = Tuple[List[dict], List[Tuple[int, str]], int]
+
+
+@dataclass
+class ImportResult:
+    """Outcome of import_todos.
+
+    Attributes:
+        imported: Number of todos created.
+        rejected: Number of records that failed validation.
+        errors: ``record N: reason`` for the first MAX_REPORTED_ERRORS
+            rejected records, numbered from 1 in file order.
+        seconds: Wall-clock duration of the import.
+    """
+    imported: int = 0
+    rejected: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Imported todos per second."""
+        return self.imported / self.seconds if self.seconds else 0.0
+
+
+def detect_format(path: Path, fmt: Optional[str] = None) -> str:
+    """Return fmt, or the format implied by path's suffix.
+
+    Raises:
+        ValueError: If fmt is unknown or the suffix names no format.
+    """
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+        return fmt
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of {path}; name it .csv or .jsonl")
+
+
+def _validate(record: object) -> dict:
+    """Return record as create_many arguments, with enum values as strings.
+
+    Raises:
+        ValueError: If a required field is missing or a value is invalid.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("not an object")
+    item = {}
+    for name in REQUIRED_FIELDS:
+        value = record.get(name)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"missing {name}")
+        item[name] = value
+    details = record.get("details") or ""
+    if not isinstance(details, str):
+        raise ValueError("details must be a string")
+    item["details"] = details
+    for name, allowed, default in (
+        ("priority", PRIORITY_BY_VALUE, "MID"),
+        ("status", STATUS_BY_VALUE, "PENDING"),
+    ):
+        value = record.get(name) or default
+        if not isinstance(value, str) or value not in allowed:
+            raise ValueError(f"unknown {name} {value!r}")
+        item[name] = value
+    for name in ("created_at", "updated_at"):
+        value = record.get(name)
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{name} is not an ISO-8601 timestamp") from None
+            item[name] = value
+    for name, value in item.items():
+        try:
+            value.encode("utf-8")
+        except UnicodeEncodeError:
+            # Bytes that were not UTF-8 decode to lone surrogates.
+            raise ValueError(f"{name} is not valid UTF-8") from None
+    return item
+
+
+def _parse_chunk(fmt: str, header: Optional[List[str]], data: bytes) -> ParsedChunk:
+    """Decode and validate one chunk of records; runs in a worker process.
+
+    Invalid UTF-8 and malformed CSV reject just the records they occur in.
+    """
+    # surrogateescape keeps undecodable bytes in the text; _validate then
+    # rejects the records that contain them.
+    text = data.decode("utf-8", errors="surrogateescape")
+    if fmt == "csv":
+        records: Iterator = iter(csv.DictReader(io.StringIO(text, newline=""), fieldnames=header))
+    else:
+        # Only "\n" ends a record; str.splitlines would also split on
+        # characters such as U+2028 that JSON strings may contain.
+        records = (line for line in text.split("\n") if line.strip())
+    items: List[dict] = []
+    errors: List[Tuple[int, str]] = []
+    count = 0
+    while True:
+        try:
+            record = next(records)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            # The reader has skipped the bad record and can go on.
+            errors.append((count, f"malformed CSV: {e}"))
+            count += 1
+            continue
+        count += 1
+        try:
+            if fmt == "jsonl":
+                record = json.loads(record)
+            items.append(_validate(record))
+        except ValueError as e:
+            errors.append((count - 1, str(e)))
+    return items, errors, count
+
+
+def _boundary(block: bytes, fmt: str) -> int:
+    """Return the offset just past the last complete record in block, or 0."""
+    end = block.rfind(b"\n") + 1
+    if fmt == "csv":
+        # A newline inside a quoted field does not end a record. Quotes in
+        # fields are doubled, so a newline ends one exactly when an even
+        # number of quotes precede it.
+        quotes = block.count(b'"', 0, end)
+        while end and quotes % 2:
+            start = block.rfind(b"\n", 0, end - 1) + 1
+            quotes -= block.count(b'"', start, end)
+            end = start
+    return end
+
+
+def _chunks(fp: BinaryIO, fmt: str, chunk_bytes: int) -> Iterator[bytes]:
+    """Yield pieces of fp of about chunk_bytes that end on record boundaries."""
+    rest = b""
+    while True:
+        block = fp.read(chunk_bytes)
+        if not block:
+            if rest.strip():
+                yield rest
+            return
+        block = rest + block
+        end = _boundary(block, fmt)
+        rest = block[end:]
+        if end:
+            yield block[:end]
+
+
+def _read_header(fp: BinaryIO) -> List[str]:
+    """Read the CSV header line from fp and check the required columns."""
+    line = fp.readline().decode("utf-8-sig")
+    header = next(csv.reader([line]), [])
+    missing = [name for name in REQUIRED_FIELDS if name not in header]
+    if missing:
+        raise ValueError(f"CSV header lacks column(s): {', '.join(missing)}")
+    return header
+
+
+def _in_order(pool: ProcessPoolExecutor, jobs: Iterator[tuple], window: int) -> Iterator[ParsedChunk]:
+    """Run _parse_chunk over jobs in pool, yielding results in job order.
+
+    At most window chunks are in flight, so a large file is never read
+    much further ahead than the parent has committed.
+    """
+    pending: Deque[Future] = deque()
+    for job in jobs:
+        pending.append(pool.submit(_parse_chunk, *job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def import_todos(
+    manager: TodoManager,
+    path: Path,
+    fmt: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_bytes: int = 1 << 20,
+    progress: Optional[Progress] = None,
+) -> ImportResult:
+    """Create todos from a CSV or JSONL file.
+
+    CSV files need a header row with at least ``title`` and ``owner``;
+    JSONL files hold one object per line with the same keys. ``details``,
+    ``priority``, ``status``, ``created_at`` and ``updated_at`` are
+    optional; ``id`` and ``version`` are ignored. Invalid records are
+    skipped and reported in the result.
+
+    Args:
+        manager: Manager to create the todos with.
+        path: File to read.
+        fmt: ``csv`` or ``jsonl``; taken from the file suffix if None.
+        workers: Worker processes for decoding and validation; defaults
+            to the CPU count. 0 or 1 does everything in this process.
+        chunk_bytes: Approximate size of a chunk, and so of a write batch.
+        progress: Called after every committed chunk.
+
+    Raises:
+        ValueError: If the format is unknown or the CSV header lacks a
+            required column.
+    """
+    fmt = detect_format(path, fmt)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    result = ImportResult()
+    start = time.perf_counter()
+    with open(path, "rb") as fp:
+        header = _read_header(fp) if fmt == "csv" else None
+        jobs = ((fmt, header, chunk) for chunk in _chunks(fp, fmt, chunk_bytes))
+        pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        try:
+            if pool is None:
+                parsed: Iterator[ParsedChunk] = (_parse_chunk(*job) for job in jobs)
+            else:
+                parsed = _in_order(pool, jobs, 2 * workers)
+            seen = 0
+            for items, errors, count in parsed:
+                for item in items:
+                    item["priority"] = PRIORITY_BY_VALUE[item["priority"]]
+                    item["status"] = STATUS_BY_VALUE[item["status"]]
+                manager.create_many(items)
+                result.imported += len(items)
+                result.rejected += len(errors)
+                for index, reason in errors[:MAX_REPORTED_ERRORS - len(result.errors)]:
+                    result.errors.append(f"record {seen + index + 1}: {reason}")
+                seen += count
+                if progress is not None:
+                    progress(seen, time.perf_counter() - start)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def export_todos(
+    manager: TodoManager,
+    out: TextIO,
+    fmt: str,
+    owner: Optional[str] = None,
+    status: Optional[Status] = None,
+    progress: Optional[Progress] = None,
+    progress_every: int = 10_000,
+) -> int:
+    """Write todos to out as CSV or JSONL and return how many were written.
+
+    Todos are streamed one at a time. The output can be read back by
+    import_todos.
+
+    Args:
+        manager: Manager to read the todos from.
+        out: Text stream to write to; open CSV files with newline="".
+        fmt: ``csv`` or ``jsonl``.
+        owner: Only export this owner's todos if given.
+        status: Only export todos with this status if given.
+        progress: Called every progress_every todos and once at the end.
+        progress_every: Todos between progress calls.
+
+    Raises:
+        ValueError: If fmt is unknown.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    start = time.perf_counter()
+    if fmt == "csv":
+        writer = csv.DictWriter(out, FIELDS)
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+        def write(row: dict) -> None:
+            out.write(encoder.encode(row) + "\n")
+
+    count = 0
+    for todo in manager.iter_todos(owner):
+        if status is not None and todo.status is not status:
+            continue
+        write(todo.to_dict())
+        count += 1
+        if progress is not None and count % progress_every == 0:
+            progress(count, time.perf_counter() - start)
+    if progress is not None:
+        progress(count, time.perf_counter() - start)
+    return count
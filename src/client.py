@@ -0,0 +1,151 @@
+"""Thin clients that talk to a running todo daemon.
+
+RemoteTodoManager and RemoteAuthManager offer the subset of the
+TodoManager and AuthManager methods the CLI uses, with the same
+signatures and return types, so ``App`` works the same either way.
+"""
+
+import socket
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from models import ConflictError, Page, Priority, TodoItem
+from protocol import ERROR_CONFLICT, ERROR_INVALID, recv_message, send_message
+
+
+class DaemonError(RuntimeError):
+    """Raised when the daemon reports an internal error or hangs up."""
+
+
+class DaemonClient:
+    """One connection to the daemon, shared by the remote managers.
+
+    Requests are sent one at a time and wait for their response; the
+    connection is safe to share between threads.
+    """
+
+    def __init__(self, socket_path: Path, timeout: Optional[float] = 30.0):
+        """Connect to the daemon listening on socket_path."""
+        self.socket_path = Path(socket_path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(self.socket_path))
+        self._lock = threading.Lock()
+
+    def call(self, op: str, **args):
+        """Run op on the daemon and return its result.
+
+        Raises ConflictError for version conflicts, ValueError for
+        requests the daemon rejected and DaemonError otherwise.
+        """
+        with self._lock:
+            send_message(self._sock, {"op": op, "args": args})
+            response = recv_message(self._sock)
+        if response is None:
+            raise DaemonError("The daemon closed the connection")
+        if response.get("ok"):
+            return response.get("result")
+        error = response.get("error")
+        if error == ERROR_CONFLICT:
+            raise ConflictError(
+                response["todo_id"], response["expected_version"], response["actual_version"]
+            )
+        if error == ERROR_INVALID:
+            raise ValueError(response.get("message"))
+        raise DaemonError(response.get("message"))
+
+    def close(self) -> None:
+        """Close the connection; the daemon keeps running."""
+        self._sock.close()
+
+
+class RemoteTodoManager:
+    """TodoManager lookalike backed by the daemon."""
+
+    def __init__(self, client: DaemonClient):
+        """Initialize with a connected client."""
+        self._client = client
+
+    def create_todo(self, title: str, details: str, priority: Priority, owner: str) -> TodoItem:
+        """Create a new todo item."""
+        return TodoItem.from_dict(self._client.call(
+            "create_todo", title=title, details=details, priority=priority.value, owner=owner
+        ))
+
+    def get_todos_by_owner(self, owner: str) -> List[TodoItem]:
+        """Retrieve all todos for a specific owner."""
+        return _todos(self._client.call("get_todos_by_owner", owner=owner))
+
+    def get_all_todos(self) -> List[TodoItem]:
+        """Return all todos stored in the system."""
+        return _todos(self._client.call("get_all_todos"))
+
+    def list_todos(
+        self,
+        owner: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        order_by: str = "created",
+    ) -> Page:
+        """Return one page of todos; see TodoManager.list_todos."""
+        page = self._client.call(
+            "list_todos", owner=owner, limit=limit, cursor=cursor, order_by=order_by
+        )
+        return Page(_todos(page["items"]), page["next_cursor"])
+
+    def get_todo_by_id(self, todo_id: str) -> Optional[TodoItem]:
+        """Retrieve a specific todo by ID."""
+        data = self._client.call("get_todo_by_id", todo_id=todo_id)
+        return TodoItem.from_dict(data) if data is not None else None
+
+    def update_todo(self, todo: TodoItem, expected_version: Optional[int] = None) -> None:
+        """Update an existing todo item; see TodoManager.update_todo."""
+        stored = self._client.call(
+            "update_todo", todo=todo.to_dict(), expected_version=expected_version
+        )
+        todo.version = stored["version"]
+        todo.updated_at = stored["updated_at"]
+
+    def delete_todo(self, todo_id: str) -> bool:
+        """Delete a todo item by ID."""
+        return self._client.call("delete_todo", todo_id=todo_id)
+
+    def mark_as_completed(self, todo_id: str, owner: str) -> bool:
+        """Mark a todo as completed if it exists and belongs to the owner."""
+        return self._client.call("mark_as_completed", todo_id=todo_id, owner=owner)
+
+    def search_todos(
+        self, query: str, owner: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[TodoItem]:
+        """Return todos matching query, best match first."""
+        return _todos(self._client.call("search_todos", query=query, owner=owner, limit=limit))
+
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        self._client.close()
+
+
+class RemoteAuthManager:
+    """AuthManager lookalike backed by the daemon."""
+
+    def __init__(self, client: DaemonClient):
+        """Initialize with a connected client."""
+        self._client = client
+
+    def sign_up(self, username: str, password: str) -> bool:
+        """Register a new user."""
+        return self._client.call("sign_up", username=username, password=password)
+
+    def login(self, username: str, password: str) -> bool:
+        """Authenticate a user."""
+        return self._client.call("login", username=username, password=password)
+
+    def user_exists(self, username: str) -> bool:
+        """Check if a user exists."""
+        return self._client.call("user_exists", username=username)
+
+
+def _todos(records: List[dict]) -> List[TodoItem]:
+    """Decode a list of todos from a response."""
+    return [TodoItem.from_dict(record) for record in records]
@@ -0,0 +1,231 @@
+"""Long-running todo daemon serving CLI clients over a Unix domain socket.
+
+Run as ``python src/daemon.py [--data-dir DIR] [--socket PATH]`` and
+point clients at it with ``python src/main.py --socket PATH``.
+
+The daemon keeps one TodoManager and one AuthManager resident, so data
+is parsed once instead of by every CLI process. Requests run
+concurrently and rely on the managers' own locking: reads share the
+data directory lock (or take none with lock-free reads) and only writes
+hold it exclusively. Each connection gets a lightweight thread that
+spends its time blocked on the socket; hundreds of idle sessions cost
+little. See ``protocol`` for the wire format.
+
+Trust model: the daemon does not authenticate requests. Any process
+that can connect may act as any user, exactly like one that can open
+the data directory directly. The socket is therefore created with mode
+0600, so only the user the daemon runs as can connect to it.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from managers import AuthManager, TodoManager
+from models import ConflictError, PRIORITY_BY_VALUE, TodoItem
+from protocol import (
+    ERROR_CONFLICT,
+    ERROR_INTERNAL,
+    ERROR_INVALID,
+    ProtocolError,
+    recv_message,
+    send_message,
+)
+
+SOCKET_NAME = "todo.sock"
+
+
+def _todos(todos: List[TodoItem]) -> List[dict]:
+    """Encode a list of todos for a response."""
+    return [todo.to_dict() for todo in todos]
+
+
+def _create_todo(server: "TodoDaemon", args: dict) -> dict:
+    """Create a todo; the priority arrives as its string value."""
+    todo = server.todo_manager.create_todo(
+        args["title"], args["details"], PRIORITY_BY_VALUE[args["priority"]], args["owner"]
+    )
+    return todo.to_dict()
+
+
+def _list_todos(server: "TodoDaemon", args: dict) -> dict:
+    """Return one page of todos with the cursor for the next."""
+    page = server.todo_manager.list_todos(**args)
+    return {"items": _todos(page.items), "next_cursor": page.next_cursor}
+
+
+def _get_todo_by_id(server: "TodoDaemon", args: dict) -> Optional[dict]:
+    """Return the todo with the given ID, or None."""
+    todo = server.todo_manager.get_todo_by_id(args["todo_id"])
+    return todo.to_dict() if todo is not None else None
+
+
+def _update_todo(server: "TodoDaemon", args: dict) -> dict:
+    """Update a todo and return it with its new version and timestamp."""
+    todo = TodoItem.from_dict(args["todo"])
+    server.todo_manager.update_todo(todo, args.get("expected_version"))
+    return todo.to_dict()
+
+
+# Operations a client may call, by name. Each takes the daemon and the
+# request arguments and returns a JSON-serializable result.
+OPERATIONS: Dict[str, Callable[["TodoDaemon", dict], object]] = {
+    "ping": lambda server, args: "pong",
+    "sign_up": lambda server, args: server.auth_manager.sign_up(**args),
+    "login": lambda server, args: server.auth_manager.login(**args),
+    "user_exists": lambda server, args: server.auth_manager.user_exists(**args),
+    "create_todo": _create_todo,
+    "get_todos_by_owner": lambda server, args: _todos(
+        server.todo_manager.get_todos_by_owner(**args)
+    ),
+    "get_all_todos": lambda server, args: _todos(server.todo_manager.get_all_todos()),
+    "list_todos": _list_todos,
+    "get_todo_by_id": _get_todo_by_id,
+    "update_todo": _update_todo,
+    "delete_todo": lambda server, args: server.todo_manager.delete_todo(**args),
+    "mark_as_completed": lambda server, args: server.todo_manager.mark_as_completed(**args),
+    "search_todos": lambda server, args: _todos(server.todo_manager.search_todos(**args)),
+}
+
+
+class _Connection(socketserver.BaseRequestHandler):
+    """Serves requests from one client until it disconnects."""
+
+    def handle(self) -> None:
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (ProtocolError, OSError) as exc:
+                self._reply({"ok": False, "error": ERROR_INVALID, "message": str(exc)})
+                return
+            if message is None:
+                return
+            if not self._reply(self.server.dispatch(message)):
+                return
+
+    def _reply(self, response: dict) -> bool:
+        """Send response; returns False if the client has gone away."""
+        try:
+            send_message(self.request, response)
+        except OSError:
+            return False
+        return True
+
+
+class TodoDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server in front of resident Todo and Auth managers."""
+
+    daemon_threads = True
+    # socketserver's default backlog of 5 refuses bursts of new sessions.
+    request_queue_size = socket.SOMAXCONN
+
+    def __init__(self, socket_path: Path, data_dir: str = "data", snapshot: bool = True):
+        """Bind socket_path and open the managers on data_dir.
+
+        A leftover socket file from a daemon that is no longer running is
+        replaced; FileExistsError is raised if one is still listening.
+        """
+        self.socket_path = Path(socket_path)
+        _claim_socket(self.socket_path)
+        self.todo_manager = TodoManager(data_dir=data_dir, snapshot=snapshot)
+        self.auth_manager = AuthManager(data_dir=data_dir, snapshot=snapshot)
+        self._served_lock = threading.Lock()
+        self.requests_served = 0
+        super().__init__(str(self.socket_path), _Connection)
+
+    def server_bind(self) -> None:
+        """Bind the socket readable and writable by its owner only."""
+        # Set before bind rather than chmod after it, so the socket is
+        # never reachable by other users, not even briefly.
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def dispatch(self, message: dict) -> dict:
+        """Run one request and return the response message."""
+        operation = OPERATIONS.get(message.get("op"))
+        args = message.get("args") or {}
+        if operation is None or not isinstance(args, dict):
+            return {"ok": False, "error": ERROR_INVALID,
+                    "message": f"Unknown operation {message.get('op')!r}"}
+        with self._served_lock:
+            self.requests_served += 1
+        try:
+            result = operation(self, args)
+        except ConflictError as exc:
+            return {"ok": False, "error": ERROR_CONFLICT, "message": str(exc),
+                    "todo_id": exc.todo_id, "expected_version": exc.expected_version,
+                    "actual_version": exc.actual_version}
+        except (KeyError, TypeError, ValueError) as exc:
+            return {"ok": False, "error": ERROR_INVALID,
+                    "message": f"{exc.__class__.__name__}: {exc}"}
+        except Exception as exc:
+            return {"ok": False, "error": ERROR_INTERNAL,
+                    "message": f"{exc.__class__.__name__}: {exc}"}
+        return {"ok": True, "result": result}
+
+    def server_close(self) -> None:
+        """Stop listening, remove the socket file and close the managers."""
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+        self.todo_manager.close()
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a stale socket file at path, unless a daemon still answers there."""
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        path.unlink(missing_ok=True)
+    else:
+        raise FileExistsError(f"A todo daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the daemon."""
+    parser = argparse.ArgumentParser(description="Todo List daemon")
+    parser.add_argument(
+        "--data-dir", default="data", help="data directory (default: data)"
+    )
+    parser.add_argument(
+        "--socket", help=f"socket path (default: <data-dir>/{SOCKET_NAME})"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Daemon entry point; serves until interrupted or terminated."""
+    args = build_parser().parse_args(argv)
+    socket_path = Path(args.socket or Path(args.data_dir) / SOCKET_NAME)
+    Path(args.data_dir).mkdir(exist_ok=True)
+    try:
+        server = TodoDaemon(socket_path, data_dir=args.data_dir)
+    except FileExistsError as e:
+        print(e, file=sys.stderr)
+        return 1
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Serving {args.data_dir} on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
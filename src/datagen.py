@@ -0,0 +1,226 @@
+"""Seeded generator of large, production-shaped todo data sets.
+
+Output is written straight to ``todos.json``, ``users.json`` and
+``todos.seq`` in the formats TodoManager and AuthManager read, one batch
+of records at a time, so memory use does not depend on the number of
+todos. The same seed always gives the same data.
+"""
+
+import bisect
+import itertools
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+from codec import COMPACT_SEPARATORS
+from models import PRIORITY_BY_VALUE
+
+BATCH = 10_000
+_dumps = json.JSONEncoder(separators=COMPACT_SEPARATORS).encode
+
+_VERBS = (
+    "Call", "Email", "Buy", "Fix", "Review", "Schedule", "Pay", "Book", "Clean",
+    "Update", "Prepare", "Send", "Renew", "Plan", "Cancel", "Check", "Write",
+    "Order", "Return", "Pick up", "Finish", "Draft", "Organize", "Submit",
+)
+_OBJECTS = (
+    "dentist", "invoice", "groceries", "bike", "report", "car insurance",
+    "passport", "flight", "birthday gift", "garage", "slides", "tax return",
+    "rent", "plumber", "library books", "newsletter", "quarterly budget",
+    "team offsite", "doctor appointment", "gym membership", "blog post",
+    "kitchen sink", "phone bill", "pull request", "design doc", "parcel",
+)
+_QUALIFIERS = (
+    "", "", "", "for Monday", "before Friday", "for the team", "with Sam",
+    "at the office", "this week", "again", "for mum", "next month", "online",
+    "before the meeting", "for the Q3 review", "ASAP",
+)
+_SENTENCES = (
+    "Remember to bring the paperwork.",
+    "Check the confirmation email first.",
+    "The old one is in the second drawer.",
+    "Ask whether the price includes delivery.",
+    "Needs sign-off from finance before it goes out.",
+    "Last time this took about an hour.",
+    "Use the shared account, not the personal one.",
+    "Follow up if there is no answer by Thursday.",
+    "Keep the receipt for the expense report.",
+    "Compare at least two quotes.",
+    "Notes from the last call are in the shared folder.",
+    "Not urgent, but it keeps slipping.",
+)
+
+
+def username(n: int) -> str:
+    """Return the name of the nth generated user, counting from 0."""
+    return f"user{n:07d}"
+
+
+@dataclass
+class DatasetSpec:
+    """Shape of a generated data set.
+
+    Attributes:
+        todos: Number of todos.
+        users: Number of registered users; every owner is one of them.
+        seed: Random seed; equal specs give identical output.
+        zipf_s: Exponent of the Zipf distribution of todos over owners.
+            The user of rank k owns a share proportional to 1 / k**s, so
+            a few users own most todos and many own one or two.
+        priority_mix: Relative weights of the priorities.
+        completed: Fraction of todos that are COMPLETED.
+        end: Latest possible timestamp.
+        days: Length of the period todos are created in, ending at end.
+            Creation is skewed towards recent dates.
+        password: Password of every generated user.
+    """
+    todos: int
+    users: int
+    seed: int = 0
+    zipf_s: float = 1.1
+    priority_mix: Dict[str, float] = field(
+        default_factory=lambda: {"HIGH": 0.2, "MID": 0.5, "LOW": 0.3}
+    )
+    completed: float = 0.35
+    end: datetime = datetime(2025, 1, 1)
+    days: int = 730
+    password: str = "secret"
+
+    def __post_init__(self):
+        """Reject sizes no data set can have."""
+        if self.users < 1:
+            raise ValueError(f"A data set needs at least one user, not {self.users}")
+        if self.todos < 0:
+            raise ValueError(f"Cannot generate {self.todos} todos")
+
+
+def _title(rng: random.Random) -> str:
+    """Return a short title of the kind people type, 2 to ~8 words."""
+    words = [rng.choice(_VERBS), rng.choice(_OBJECTS), rng.choice(_QUALIFIERS)]
+    return " ".join(w for w in words if w)
+
+
+def _details(rng: random.Random) -> str:
+    """Return empty details for about a third of todos, else 1-4 sentences."""
+    count = rng.choice((0, 0, 0, 1, 1, 1, 2, 2, 3, 4))
+    return " ".join(rng.choice(_SENTENCES) for _ in range(count))
+
+
+def generate_todos(spec: DatasetSpec) -> Iterator[dict]:
+    """Yield spec.todos todo records, as TodoItem.to_dict would produce.
+
+    IDs run from "1" upwards in creation order.
+    """
+    rng = random.Random(spec.seed)
+    cumulative = list(itertools.accumulate(1 / k ** spec.zipf_s for k in range(1, spec.users + 1)))
+    total = cumulative[-1]
+    last = spec.users - 1
+    priorities = list(spec.priority_mix)
+    priority_weights = list(itertools.accumulate(spec.priority_mix.values()))
+    span = spec.days * 86400.0
+    end = spec.end
+    for n in range(1, spec.todos + 1):
+        owner = username(min(bisect.bisect(cumulative, rng.random() * total), last))
+        # sqrt skews creation towards the end of the period: usage grows.
+        created = end - timedelta(seconds=span * (1 - rng.random() ** 0.5))
+        completed = rng.random() < spec.completed
+        # Most todos are touched again within days; completed ones later.
+        delay = rng.expovariate(1 / (5 * 86400 if completed else 86400))
+        updated = min(created + timedelta(seconds=delay), end)
+        yield {
+            "id": str(n),
+            "title": _title(rng),
+            "details": _details(rng),
+            "priority": rng.choices(priorities, cum_weights=priority_weights)[0],
+            "status": "COMPLETED" if completed else "PENDING",
+            "owner": owner,
+            "created_at": created.isoformat(timespec="microseconds"),
+            "updated_at": updated.isoformat(timespec="microseconds"),
+            "version": 1 + int(rng.expovariate(1.0)) + completed,
+        }
+
+
+def _stream(path: Path, opening: str, items: Iterator[str], closing: str,
+            progress: Optional[Callable[[int], None]] = None) -> None:
+    """Write opening, comma-separated items and closing to path atomically."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    written = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(opening)
+        while True:
+            batch = list(itertools.islice(items, BATCH))
+            if not batch:
+                break
+            if written:
+                f.write(",")
+            f.write(",".join(batch))
+            written += len(batch)
+            if progress is not None:
+                progress(written)
+        f.write(closing)
+    os.replace(tmp_path, path)
+
+
+def write_dataset(
+    data_dir: Path,
+    spec: DatasetSpec,
+    overwrite: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Write a generated data set into data_dir.
+
+    Creates ``todos.json``, ``users.json`` and a ``todos.seq`` counter
+    past the last generated ID.
+
+    Args:
+        data_dir: Directory to write to; created if missing.
+        spec: What to generate.
+        overwrite: Replace existing todos.json and users.json.
+        progress: Called with the number of todos written after each batch.
+
+    Raises:
+        FileExistsError: If data_dir already holds data and not overwrite.
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    if not overwrite:
+        for name in ("todos.json", "users.json"):
+            if (data_dir / name).exists():
+                raise FileExistsError(f"{data_dir / name} already exists")
+    _stream(data_dir / "todos.json", "[", map(_dumps, generate_todos(spec)), "]", progress)
+    with open(data_dir / "todos.seq", "w") as f:
+        f.write(f"{spec.todos}\n")
+    write_users(data_dir, spec)
+
+
+def write_users(data_dir: Path, spec: DatasetSpec) -> None:
+    """Write only the generated users to ``users.json`` in data_dir."""
+    password = _dumps(spec.password)
+    _stream(
+        Path(data_dir) / "users.json", "{",
+        (f"{_dumps(username(n))}:{password}" for n in range(spec.users)), "}",
+    )
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a priority mix such as ``HIGH=20,MID=50,LOW=30``.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown priority.
+    """
+    mix: Dict[str, float] = {}
+    for entry in text.split(","):
+        name, sep, weight = entry.partition("=")
+        name = name.strip().upper()
+        if not sep or name not in PRIORITY_BY_VALUE:
+            raise ValueError(f"Bad priority weight {entry!r}; expected e.g. HIGH=20")
+        mix[name] = float(weight)
+        if mix[name] < 0:
+            raise ValueError(f"Negative priority weight {entry!r}")
+    if not any(mix.values()):
+        raise ValueError("At least one priority weight must be positive")
+    return mix
@@ -0,0 +1,429 @@
+"""Local HTTP/JSON API over TodoManager, built on asyncio streams.
+
+Run as ``python src/httpapi.py [--data-dir DIR] [--host H] [--port P]``.
+
+Endpoints (all bodies are JSON):
+
+    POST   /login                  {"username", "password"} -> {"token"}
+    POST   /logout
+    GET    /todos?limit=&cursor=&order_by=   the caller's todos, one page
+    POST   /todos                  {"title", "details"?, "priority"?}
+    GET    /todos/<id>
+    PATCH  /todos/<id>             {"title"?, "details"?, "priority"?, "version"?}
+    DELETE /todos/<id>
+    POST   /todos/<id>/complete
+
+Everything except /login needs ``Authorization: Bearer <token>``. A
+todo owned by someone else answers 404, exactly like a missing one.
+Every PATCH is a compare-and-swap (TodoManager.update_todo) against
+``version`` if given, else the version just read; a stale version
+answers 409 with the current version, and a todo deleted meanwhile 404.
+
+Connections are kept alive (HTTP/1.1 default) and may pipeline:
+requests on one connection are read and answered strictly in order.
+The managers do blocking file I/O, so every call runs on a one-thread
+executor. The event loop keeps accepting and parsing while a call is
+in flight, and the single worker serializes writes the way the daemon's
+dispatch lock does.
+"""
+
+import argparse
+import asyncio
+import json
+import secrets
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import codec
+from managers import AuthManager, TodoManager
+from models import ConflictError, PRIORITY_BY_VALUE, Priority, TodoItem
+
+# Limits that keep one client from tying up unbounded memory.
+MAX_HEADER_LINES = 100
+MAX_BODY = 1024 * 1024
+
+
+class HttpError(Exception):
+    """An error response: status code plus a JSON body."""
+
+    def __init__(self, status: HTTPStatus, message: str, **extra):
+        """Initialize with the status and the error message for the body."""
+        super().__init__(message)
+        self.status = status
+        self.body = {"error": message, **extra}
+
+
+class SessionStore:
+    """Bearer tokens of logged-in users, expiring after ttl idle seconds."""
+
+    def __init__(self, ttl: float = 3600.0):
+        """Initialize an empty store."""
+        self.ttl = ttl
+        self._sessions: Dict[str, Tuple[str, float]] = {}
+        self._purge_at = 1024
+
+    def __len__(self) -> int:
+        """Return the number of sessions, including expired ones not yet purged."""
+        return len(self._sessions)
+
+    def create(self, username: str) -> str:
+        """Start a session for username and return its token.
+
+        Expired sessions are swept whenever the store has doubled since
+        the last sweep, so abandoned tokens cannot pile up forever.
+        """
+        if len(self._sessions) >= self._purge_at:
+            cutoff = time.monotonic() - self.ttl
+            self._sessions = {
+                token: session
+                for token, session in self._sessions.items()
+                if session[1] >= cutoff
+            }
+            self._purge_at = max(1024, 2 * len(self._sessions))
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = (username, time.monotonic())
+        return token
+
+    def user_for(self, token: str) -> Optional[str]:
+        """Return the user a live token belongs to, refreshing its expiry."""
+        session = self._sessions.get(token)
+        if session is None:
+            return None
+        username, last_seen = session
+        now = time.monotonic()
+        if now - last_seen > self.ttl:
+            del self._sessions[token]
+            return None
+        self._sessions[token] = (username, now)
+        return username
+
+    def end(self, token: str) -> None:
+        """End the session for token, if any."""
+        self._sessions.pop(token, None)
+
+
+class Request:
+    """One parsed HTTP request."""
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str], body: bytes):
+        """Initialize from the parsed request line, headers and body."""
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path.rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the connection stays open after the response."""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> dict:
+        """Return the body as a JSON object; an empty body is {}."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON") from None
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        return data
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read the next request from reader, or None at end of stream."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+    if "transfer-encoding" in headers:
+        raise HttpError(HTTPStatus.NOT_IMPLEMENTED, "Only Content-Length bodies are supported")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+    if length > MAX_BODY:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return Request(method.upper(), target, version, headers, body)
+
+
+def render_response(status: HTTPStatus, body: Optional[object], keep_alive: bool) -> bytes:
+    """Serialize a response with a JSON body (none for 204)."""
+    payload = b""
+    if body is not None:
+        payload = json.dumps(body, separators=codec.COMPACT_SEPARATORS).encode("utf-8")
+    head = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Length: {len(payload)}"]
+    if payload:
+        head.append("Content-Type: application/json")
+    head.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload
+
+
+def _priority(value: object) -> Priority:
+    """Parse a priority name from a request body."""
+    try:
+        return PRIORITY_BY_VALUE[value]
+    except (KeyError, TypeError):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "priority must be HIGH, MID or LOW") from None
+
+
+def _text(data: dict, key: str, default: Optional[str] = None) -> Optional[str]:
+    """Return a string field of a request body."""
+    value = data.get(key, default)
+    if value is not None and not isinstance(value, str):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{key} must be a string")
+    return value
+
+
+class TodoApi:
+    """Routes HTTP requests to a TodoManager and an AuthManager."""
+
+    def __init__(self, data_dir: str = "data", session_ttl: float = 3600.0):
+        """Open the managers on data_dir."""
+        self.todo_manager = TodoManager(data_dir=data_dir, snapshot=True)
+        self.auth_manager = AuthManager(data_dir=data_dir, snapshot=True)
+        self.sessions = SessionStore(session_ttl)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="todo-io")
+        self.requests_served = 0
+
+    async def _run(self, func, *args):
+        """Run a blocking manager call on the I/O executor."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests from one connection, in order, until it closes."""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as exc:
+                    writer.write(render_response(exc.status, exc.body, keep_alive=False))
+                    break
+                except ValueError:
+                    # StreamReader's line limit; the stream can't be resynced.
+                    writer.write(render_response(
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "Line too long"}, False
+                    ))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                status, body = await self.respond(request)
+                writer.write(render_response(status, body, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, request: Request) -> Tuple[HTTPStatus, Optional[object]]:
+        """Return the status and JSON body answering request."""
+        self.requests_served += 1
+        try:
+            return await self._route(request)
+        except HttpError as exc:
+            return exc.status, exc.body
+        except ConflictError as exc:
+            if exc.actual_version is None:
+                return HTTPStatus.NOT_FOUND, {"error": "No such todo"}
+            return HTTPStatus.CONFLICT, {"error": str(exc), "version": exc.actual_version}
+        except ValueError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        except Exception as exc:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{exc.__class__.__name__}: {exc}"}
+
+    async def _route(self, request: Request) -> Tuple[HTTPStatus, Optional[object]]:
+        """Dispatch request by path and method."""
+        parts = request.path.strip("/").split("/")
+        if parts == ["login"]:
+            self._allow(request, "POST")
+            return await self._login(request)
+        user = self._user(request)
+        if parts == ["logout"]:
+            self._allow(request, "POST")
+            self.sessions.end(self._token(request))
+            return HTTPStatus.NO_CONTENT, None
+        if parts == ["todos"]:
+            self._allow(request, "GET", "POST")
+            if request.method == "GET":
+                return await self._list(request, user)
+            return await self._create(request, user)
+        if len(parts) == 2 and parts[0] == "todos":
+            self._allow(request, "GET", "PATCH", "DELETE")
+            todo = await self._owned(parts[1], user)
+            if request.method == "GET":
+                return HTTPStatus.OK, todo.to_dict()
+            if request.method == "PATCH":
+                return await self._update(request, todo)
+            await self._run(self.todo_manager.delete_todo, todo.id)
+            return HTTPStatus.NO_CONTENT, None
+        if len(parts) == 3 and parts[0] == "todos" and parts[2] == "complete":
+            self._allow(request, "POST")
+            if not await self._run(self.todo_manager.mark_as_completed, parts[1], user):
+                raise HttpError(HTTPStatus.NOT_FOUND, "No such todo")
+            todo = await self._run(self.todo_manager.get_todo_by_id, parts[1])
+            if todo is None:
+                # Deleted by someone else since it was completed.
+                raise HttpError(HTTPStatus.NOT_FOUND, "No such todo")
+            return HTTPStatus.OK, todo.to_dict()
+        raise HttpError(HTTPStatus.NOT_FOUND, "No such endpoint")
+
+    @staticmethod
+    def _allow(request: Request, *methods: str) -> None:
+        """Reject request unless it uses one of methods."""
+        if request.method not in methods:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {' or '.join(methods)}")
+
+    @staticmethod
+    def _token(request: Request) -> str:
+        """Return the bearer token of request, or an empty string."""
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        return token.strip() if scheme.lower() == "bearer" else ""
+
+    def _user(self, request: Request) -> str:
+        """Return the user whose session request belongs to."""
+        user = self.sessions.user_for(self._token(request))
+        if user is None:
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Log in and send Authorization: Bearer <token>")
+        return user
+
+    async def _owned(self, todo_id: str, user: str) -> TodoItem:
+        """Return user's todo with todo_id, or raise 404."""
+        todo = await self._run(self.todo_manager.get_todo_by_id, todo_id)
+        if todo is None or todo.owner != user:
+            raise HttpError(HTTPStatus.NOT_FOUND, "No such todo")
+        return todo
+
+    async def _login(self, request: Request) -> Tuple[HTTPStatus, dict]:
+        """Check credentials and start a session."""
+        data = request.json()
+        username = _text(data, "username", "")
+        password = _text(data, "password", "")
+        if not await self._run(self.auth_manager.login, username, password):
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid username or password")
+        return HTTPStatus.OK, {"token": self.sessions.create(username)}
+
+    async def _list(self, request: Request, user: str) -> Tuple[HTTPStatus, dict]:
+        """Return one page of user's todos."""
+        try:
+            limit = int(request.query.get("limit", 20))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "limit must be an integer") from None
+        page = await self._run(
+            self.todo_manager.list_todos,
+            user,
+            limit,
+            request.query.get("cursor"),
+            request.query.get("order_by", "created"),
+        )
+        return HTTPStatus.OK, {
+            "items": [todo.to_dict() for todo in page.items],
+            "next_cursor": page.next_cursor,
+        }
+
+    async def _create(self, request: Request, user: str) -> Tuple[HTTPStatus, dict]:
+        """Create a todo owned by user."""
+        data = request.json()
+        title = _text(data, "title", "")
+        if not title:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "title is required")
+        todo = await self._run(
+            self.todo_manager.create_todo,
+            title,
+            _text(data, "details", ""),
+            _priority(data.get("priority", "MID")),
+            user,
+        )
+        return HTTPStatus.CREATED, todo.to_dict()
+
+    async def _update(self, request: Request, todo: TodoItem) -> Tuple[HTTPStatus, dict]:
+        """Apply the fields in the body to todo unless it changed since read."""
+        data = request.json()
+        expected = data.get("version", todo.version)
+        if not isinstance(expected, int) or isinstance(expected, bool):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "version must be an integer")
+        if "title" in data:
+            todo.title = _text(data, "title")
+            if not todo.title:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "title cannot be empty")
+        if "details" in data:
+            todo.details = _text(data, "details")
+        if "priority" in data:
+            todo.priority = _priority(data["priority"])
+        await self._run(self.todo_manager.update_todo, todo, expected)
+        return HTTPStatus.OK, todo.to_dict()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Start listening and return the server."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self) -> None:
+        """Wait for in-flight calls, then close the managers."""
+        self._executor.shutdown(wait=True)
+        self.todo_manager.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the HTTP server."""
+    parser = argparse.ArgumentParser(description="Todo List HTTP/JSON API")
+    parser.add_argument(
+        "--data-dir", default="data", help="data directory (default: data)"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port, 0 for any free one (default: 8080)")
+    return parser
+
+
+async def _serve_until_stopped(api: TodoApi, host: str, port: int) -> None:
+    """Run the server until SIGTERM or SIGINT."""
+    loop = asyncio.get_running_loop()
+    stopped = loop.create_future()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopped.set_result, None)
+    server = await api.serve(host, port)
+    bound_host, bound_port = server.sockets[0].getsockname()[:2]
+    print(f"Serving on http://{bound_host}:{bound_port}", flush=True)
+    async with server:
+        await stopped
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """HTTP server entry point; serves until interrupted or terminated."""
+    args = build_parser().parse_args(argv)
+    api = TodoApi(data_dir=args.data_dir)
+    try:
+        asyncio.run(_serve_until_stopped(api, args.host, args.port))
+    finally:
+        api.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Persistent, block-based allocation of numeric todo IDs."""
+
+import fcntl
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+
+class IdAllocator:
+    """Hands out increasing numeric IDs backed by a small counter file.
+
+    The counter file holds the highest ID reserved so far by any process.
+    Each allocator reserves a block of ``block_size`` IDs at a time while
+    holding an exclusive lock, then hands them out from memory (hi/lo), so
+    processes sharing a data directory never collide and never scan the
+    stored todos. A process that exits early leaves a gap in the sequence,
+    which is harmless. An allocator may be shared by several threads.
+
+    The counter is written to a temporary file, fsynced and moved into
+    place, so a crash can never leave it below an ID already handed out.
+    If the counter file is missing it is seeded from the largest numeric
+    ID in ``existing_ids``; non-numeric IDs such as UUIDs are ignored.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        block_size: int = 16,
+        existing_ids: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        """Initialize the allocator.
+
+        Args:
+            path: Location of the counter file.
+            block_size: Number of IDs reserved per counter update.
+            existing_ids: Called once, under the lock, to seed a missing
+                counter file.
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.block_size = max(1, block_size)
+        self._existing_ids = existing_ids
+        self._next = 0
+        self._limit = 0
+        self._thread_lock = threading.Lock()
+
+    def next_id(self) -> str:
+        """Return the next unused ID as a string."""
+        with self._thread_lock:
+            if self._next >= self._limit:
+                block = self.reserve(self.block_size)
+                self._next, self._limit = block.start, block.stop
+            value = self._next
+            self._next += 1
+        return str(value)
+
+    def reserve(self, count: int) -> range:
+        """Reserve count consecutive IDs for the caller's exclusive use."""
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                high = self._read_counter()
+                self._write_counter(high + count)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return range(high + 1, high + count + 1)
+
+    def _read_counter(self) -> int:
+        """Return the stored counter, seeding it if the file is missing."""
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return self._scan_existing()
+
+    def _scan_existing(self) -> int:
+        """Return the largest numeric ID among the existing todos."""
+        if self._existing_ids is None:
+            return 0
+        max_id = 0
+        for todo_id in self._existing_ids():
+            if todo_id.isascii() and todo_id.isdigit():
+                max_id = max(max_id, int(todo_id))
+        return max_id
+
+    def _write_counter(self, value: int) -> None:
+        """Durably replace the counter file with value."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(f"{value}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,72 @@
+"""Secondary indexes maintained by the storage backends."""
+
+from typing import Dict, Iterable, List, Optional
+
+from models import TodoItem
+
+
+class OwnerIndex:
+    """Maps each owner to the IDs of their todos, in insertion order.
+
+    Looking up an owner costs time proportional to that owner's todos,
+    not to the total number of todos stored.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._ids: Dict[str, Dict[str, None]] = {}
+        self._owner_of: Dict[str, str] = {}
+
+    @classmethod
+    def build(cls, todos: Iterable[TodoItem]) -> "OwnerIndex":
+        """Build an index over todos."""
+        index = cls()
+        for todo in todos:
+            index.add(todo.id, todo.owner)
+        return index
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[str]]) -> "OwnerIndex":
+        """Rebuild an index from the output of to_dict."""
+        index = cls()
+        for owner, ids in data.items():
+            index._ids[owner] = dict.fromkeys(ids)
+            for todo_id in ids:
+                index._owner_of[todo_id] = owner
+        return index
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Return the index as a JSON-serializable owner -> IDs mapping."""
+        return {owner: list(ids) for owner, ids in self._ids.items()}
+
+    def __len__(self) -> int:
+        """Return the number of indexed todos."""
+        return len(self._owner_of)
+
+    def add(self, todo_id: str, owner: str) -> None:
+        """Index todo_id under owner, moving it if its owner changed."""
+        current = self._owner_of.get(todo_id)
+        if current == owner:
+            return
+        if current is not None:
+            self.remove(todo_id)
+        self._ids.setdefault(owner, {})[todo_id] = None
+        self._owner_of[todo_id] = owner
+
+    def remove(self, todo_id: str) -> None:
+        """Drop todo_id from the index if present."""
+        owner = self._owner_of.pop(todo_id, None)
+        if owner is None:
+            return
+        ids = self._ids[owner]
+        del ids[todo_id]
+        if not ids:
+            del self._ids[owner]
+
+    def ids_for(self, owner: str) -> List[str]:
+        """Return the IDs of owner's todos in insertion order."""
+        return list(self._ids.get(owner, ()))
+
+    def owner_of(self, todo_id: str) -> Optional[str]:
+        """Return the owner of todo_id, or None if it is not indexed."""
+        return self._owner_of.get(todo_id)
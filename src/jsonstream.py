@@ -0,0 +1,78 @@
+"""Incremental reader for large top-level JSON arrays."""
+
+import json
+from typing import Any, Iterator, TextIO
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_array(fp: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of the JSON array in fp one at a time.
+
+    The file is read in chunks of chunk_size characters, so memory use is
+    bounded by the chunk size plus the largest single element rather than
+    by the size of the whole document.
+
+    Args:
+        fp: Text file positioned at the start of a JSON array.
+        chunk_size: Number of characters to read per chunk.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Expected '['", buf, pos)
+    pos += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if fill():
+                continue
+            raise
+        if not eof and (end == len(buf) or buf[end] not in _DELIMITERS) and fill():
+            # The value may have been cut at the chunk boundary (e.g. a
+            # number); decode it again with more data.
+            continue
+        pos = end
+        yield value
+
+        sep = next_char()
+        if sep == ",":
+            pos += 1
+        elif sep == "]":
+            return
+        else:
+            raise json.JSONDecodeError("Expected ',' or ']'", buf, pos)
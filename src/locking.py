@@ -0,0 +1,183 @@
+"""Cross-process file locking and atomic file replacement."""
+
+import fcntl
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import metrics
+
+
+class FileLock:
+    """Shared/exclusive lock between processes, held on a lock file.
+
+    Uses ``flock`` on a dedicated file, so it never interferes with how
+    the data files themselves are opened or replaced. Readers take the
+    lock shared and writers exclusive. The lock is reentrant within one
+    object: nested ``shared`` or ``exclusive`` blocks inside an
+    exclusive one, and nested ``shared`` blocks inside a shared one, are
+    free. Asking for ``exclusive`` inside ``shared`` raises RuntimeError
+    instead of risking a deadlock on upgrade.
+
+    flock cannot tell the threads of one process apart, so the lock is
+    also a reentrant mutex between threads: one thread at a time holds it,
+    in either mode.
+
+    ``stats`` counts acquisitions and how long they waited, so contention
+    between processes can be measured.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the lock on the file at path (created on first use)."""
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+        self._mode: Optional[int] = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+        self.stats = {
+            "acquired": 0,
+            "contended": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock shared for the duration of the block."""
+        with self._hold(fcntl.LOCK_SH):
+            yield
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock exclusively for the duration of the block."""
+        with self._hold(fcntl.LOCK_EX):
+            yield
+
+    @contextmanager
+    def _hold(self, mode: int) -> Iterator[None]:
+        """Acquire the lock in mode unless an enclosing block covers it."""
+        with self._thread_lock:
+            if self._depth:
+                if mode == fcntl.LOCK_EX and self._mode == fcntl.LOCK_SH:
+                    raise RuntimeError("Cannot upgrade a shared lock to exclusive")
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            self._acquire(mode)
+            self._depth = 1
+            try:
+                yield
+            finally:
+                self._depth = 0
+                self._mode = None
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _acquire(self, mode: int) -> None:
+        """Take the flock, recording any time spent waiting for it."""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, mode | fcntl.LOCK_NB)
+        except BlockingIOError:
+            start = time.perf_counter()
+            fcntl.flock(self._fd, mode)
+            waited = time.perf_counter() - start
+            self.stats["contended"] += 1
+            self.stats["wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+        self.stats["acquired"] += 1
+        self._mode = mode
+
+    def close(self) -> None:
+        """Close the lock file; the lock must not be held."""
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+_COUNTER = struct.Struct("<Q")
+
+
+class ChangeCounter:
+    """A 64-bit counter in a small file shared by every process.
+
+    The file is memory-mapped, so reading ``value`` costs no system call
+    and takes no lock; all processes see the same page. Writers call
+    ``bump`` while holding the exclusive lock that guards the data, and
+    readers compare the value with the one their cached state was built
+    at to find out whether anything changed since.
+    """
+
+    def __init__(self, path: Path):
+        """Open (creating if needed) the counter file at path."""
+        self.path = Path(path)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < _COUNTER.size:
+                os.ftruncate(fd, _COUNTER.size)
+            self._map = mmap.mmap(fd, _COUNTER.size)
+        finally:
+            os.close(fd)
+
+    @property
+    def value(self) -> int:
+        """The current count."""
+        return _COUNTER.unpack_from(self._map)[0]
+
+    def bump(self) -> int:
+        """Increment the count and return the new value.
+
+        The caller must hold the exclusive lock that writers share.
+        """
+        value = self.value + 1
+        _COUNTER.pack_into(self._map, 0, value)
+        return value
+
+    def close(self) -> None:
+        """Unmap the counter file."""
+        self._map.close()
+
+
+def atomic_write(path: Path, data: Union[str, bytes], fsync: bool = True) -> None:
+    """Replace the file at path with data, all or nothing.
+
+    data is written to a uniquely named temporary file in the same
+    directory, flushed (and fsynced unless fsync is False) and then moved
+    over path with ``os.replace``. Readers see either the old file or the
+    new one, never a partial write. A reader that already has the old
+    file open keeps reading the old contents.
+    """
+    path = Path(path)
+    binary = isinstance(data, bytes)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            # mkstemp creates the file owner-only; keep the replaced file's mode.
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = 0o644
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            if metrics.active is not None:
+                metrics.active.record_io(
+                    written=(f if binary else f.buffer).tell(), files_written=1
+                )
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -1,18 +1,43 @@
 """Main entry point for the Todo List application."""
 
+import argparse
+import atexit
 import sys
+from typing import List, Optional
+
+import metrics
+from client import DaemonClient, RemoteAuthManager, RemoteTodoManager
 from managers import AuthManager, TodoManager
-from models import Priority, Status
+from models import ConflictError, Priority, Status, TodoItem
+
+
+# Menu actions measured when instrumentation is on (see metrics).
+APP_ACTIONS = (
+    "login", "sign_up", "create_todo", "view_todos", "edit_todo",
+    "mark_completed", "delete_todo", "logout", "mark_completed_by_id",
+    "view_todo_details", "view_all_todos", "search_todos",
+)
 
 
 class App:
     """Main application class for the Todo List CLI."""
 
-    def __init__(self):
-        """Initialize the application."""
+    page_size = 10
+
+    def __init__(self, socket_path: Optional[str] = None, data_dir: str = "data"):
+        """Initialize the application.
+
+        With socket_path the app is a thin client of the todo daemon
+        listening there, instead of reading data_dir itself.
+        """
         self.running = True
-        self.auth_manager = AuthManager()
-        self.todo_manager = TodoManager()
+        if socket_path:
+            client = DaemonClient(socket_path)
+            self.auth_manager = RemoteAuthManager(client)
+            self.todo_manager = RemoteTodoManager(client)
+        else:
+            self.auth_manager = AuthManager(data_dir, snapshot=True)
+            self.todo_manager = TodoManager(data_dir, snapshot=True)
         self.current_user: str | None = None
 
     def display_pre_login_menu(self) -> None:
@@ -30,10 +55,14 @@ class App:
 
             if choice == "1":
                 self.login()
+                if self.current_user:
+                    self.display_post_login_menu()
             elif choice == "2":
                 self.sign_up()
             elif choice == "3":
                 self.exit_app()
+            elif choice == "m":
+                self.show_metrics()
             else:
                 print("Invalid choice. Please enter 1, 2, or 3.")
 
@@ -46,7 +75,6 @@ class App:
         if self.auth_manager.login(username, password):
             self.current_user = username
             print(f"\nWelcome, {username}!")
-            self.display_post_login_menu()
         else:
             print("Invalid username or password.")
 
@@ -87,9 +115,10 @@ class App:
             print("[6] Logout")
             print("[7] Mark as Completed (by ID)")
             print("[8] View todo details (by ID)")
+            print("[9] Search my todos")
             print("=" * 40)
 
-            choice = input("\nEnter your choice (1-7): ").strip()
+            choice = input("\nEnter your choice (1-9): ").strip()
 
             if choice == "1":
                 self.create_todo()
@@ -107,8 +136,12 @@ class App:
                 self.mark_completed_by_id()
             elif choice == "8":
                 self.view_todo_details()
+            elif choice == "9":
+                self.search_todos()
+            elif choice == "m":
+                self.show_metrics()
             else:
-                print("Invalid choice. Please enter 1-7.")
+                print("Invalid choice. Please enter 1-9.")
 
     def create_todo(self) -> None:
         """Create a new todo item."""
@@ -138,20 +171,54 @@ class App:
         print(f"\nTodo created successfully! (ID: {todo.id})")
 
     def view_todos(self) -> None:
-        """View all todos for the current user."""
+        """View the current user's todos, one page at a time."""
         print("\n--- My Todos ---")
-        todos = self.todo_manager.get_todos_by_owner(self.current_user)
-
-        if not todos:
-            print("You have no todos.")
-            return
+        self._page_todos(self.current_user, "You have no todos.")
+
+    def _page_todos(self, owner: str | None, empty_message: str) -> None:
+        """Print todos a page at a time with next/previous navigation.
+
+        Earlier pages are revisited through the cursors that led to them.
+        """
+        cursors: list[str | None] = [None]
+        while True:
+            page = self.todo_manager.list_todos(
+                owner=owner, limit=self.page_size, cursor=cursors[-1]
+            )
+            if not page.items and len(cursors) == 1:
+                print(empty_message)
+                return
 
-        for idx, todo in enumerate(todos, 1):
-            print(f"\n{idx}. [{todo.status.value}] {todo.title} (Priority: {todo.priority.value})")
-            print(f"   ID: {todo.id}")
-            print(f"   Details: {todo.details}")
-            print(f"   Created: {todo.created_at}")
-            print(f"   Updated: {todo.updated_at}")
+            start = (len(cursors) - 1) * self.page_size
+            lines = []
+            for idx, todo in enumerate(page.items, start + 1):
+                lines.append(f"\n{idx}. [{todo.status.value}] {todo.title} (Priority: {todo.priority.value})")
+                lines.append(f"   ID: {todo.id}")
+                if owner is None:
+                    lines.append(f"   Owner: {todo.owner}")
+                lines.append(f"   Details: {todo.details}")
+                lines.append(f"   Created: {todo.created_at}")
+                lines.append(f"   Updated: {todo.updated_at}")
+            print("\n".join(lines))
+
+            options = []
+            if page.next_cursor:
+                options.append("[N] Next page")
+            if len(cursors) > 1:
+                options.append("[P] Previous page")
+            if not options:
+                return
+            print(f"\nPage {len(cursors)}  " + "  ".join(options + ["[Q] Back"]))
+
+            choice = input("Select option: ").strip().lower()
+            if choice == "n" and page.next_cursor:
+                cursors.append(page.next_cursor)
+            elif choice == "p" and len(cursors) > 1:
+                cursors.pop()
+            elif choice == "q":
+                return
+            else:
+                print("Invalid choice.")
 
     def edit_todo(self) -> None:
         """Edit an existing todo item."""
@@ -186,15 +253,12 @@ class App:
 
         if edit_choice == "1":
             new_title = input("New title: ").strip()
-            if new_title:
-                selected_todo.title = new_title
-                self.todo_manager.update_todo(selected_todo)
+            if new_title and self._save_edit(selected_todo, title=new_title):
                 print("Title updated!")
         elif edit_choice == "2":
             new_details = input("New details: ").strip()
-            selected_todo.details = new_details
-            self.todo_manager.update_todo(selected_todo)
-            print("Details updated!")
+            if self._save_edit(selected_todo, details=new_details):
+                print("Details updated!")
         elif edit_choice == "3":
             print("\nPriority levels:")
             print("[1] HIGH")
@@ -202,13 +266,41 @@ class App:
             print("[3] LOW")
             priority_choice = input("Select new priority (1-3): ").strip()
             priority_map = {"1": Priority.HIGH, "2": Priority.MID, "3": Priority.LOW}
-            if priority_choice in priority_map:
-                selected_todo.priority = priority_map[priority_choice]
-                self.todo_manager.update_todo(selected_todo)
+            if priority_choice in priority_map and self._save_edit(
+                selected_todo, priority=priority_map[priority_choice]
+            ):
                 print("Priority updated!")
         elif edit_choice == "4":
             print("Edit cancelled.")
 
+    def _save_edit(self, todo: TodoItem, **changes) -> bool:
+        """Apply changes to todo and save them only if nobody else edited it.
+
+        The update is checked against the version todo was read at. On a
+        conflict the user can re-fetch the latest version and apply the
+        same changes to it. Returns True once the changes are saved.
+        """
+        while True:
+            expected = todo.version
+            for name, value in changes.items():
+                setattr(todo, name, value)
+            try:
+                self.todo_manager.update_todo(todo, expected_version=expected)
+                return True
+            except ConflictError as conflict:
+                if conflict.actual_version is None:
+                    print("This todo was deleted by someone else.")
+                    return False
+                print("This todo was changed by someone else while you were editing.")
+                retry = input("Re-fetch the latest version and apply your change? (y/n): ")
+                if retry.strip().lower() != "y":
+                    print("Edit discarded.")
+                    return False
+                todo = self.todo_manager.get_todo_by_id(todo.id)
+                if todo is None:
+                    print("This todo was deleted by someone else.")
+                    return False
+
     def mark_completed(self) -> None:
         """Mark a todo as completed."""
         print("\n--- Mark Todo as Completed ---")
@@ -228,9 +320,8 @@ class App:
                 print("Invalid choice.")
                 return
             selected_todo = todos[choice - 1]
-            selected_todo.status = Status.COMPLETED
-            self.todo_manager.update_todo(selected_todo)
-            print(f"'{selected_todo.title}' marked as completed!")
+            if self._save_edit(selected_todo, status=Status.COMPLETED):
+                print(f"'{selected_todo.title}' marked as completed!")
         except ValueError:
             print("Invalid input.")
 
@@ -280,21 +371,9 @@ class App:
         self.current_user = None
 
     def view_all_todos(self) -> None:
-        """View all todos across all users."""
+        """View all todos across all users, one page at a time."""
         print("\n--- All Todos ---")
-        todos = self.todo_manager.get_all_todos()
-
-        if not todos:
-            print("No todos found.")
-            return
-
-        for idx, todo in enumerate(todos, 1):
-            print(f"\n{idx}. [{todo.status.value}] {todo.title} (Priority: {todo.priority.value})")
-            print(f"   ID: {todo.id}")
-            print(f"   Owner: {todo.owner}")
-            print(f"   Details: {todo.details}")
-            print(f"   Created: {todo.created_at}")
-            print(f"   Updated: {todo.updated_at}")
+        self._page_todos(None, "No todos found.")
 
     def view_todo_details(self) -> None:
         """View details for a specific todo by its ID."""
@@ -317,10 +396,38 @@ class App:
         print(f"Created: {todo.created_at}")
         print(f"Updated: {todo.updated_at}")
 
+    def search_todos(self) -> None:
+        """Search the current user's todos by title and details."""
+        print("\n--- Search Todos ---")
+        print("Separate words to match all of them; use OR for alternatives.")
+        query = input("Search: ").strip()
+        if not query:
+            print("Search cannot be empty.")
+            return
+
+        todos = self.todo_manager.search_todos(query, owner=self.current_user, limit=20)
+        if not todos:
+            print("No matching todos.")
+            return
+
+        for idx, todo in enumerate(todos, 1):
+            print(f"\n{idx}. [{todo.status.value}] {todo.title} (Priority: {todo.priority.value})")
+            print(f"   ID: {todo.id}")
+            print(f"   Details: {todo.details}")
+
+    def show_metrics(self) -> None:
+        """Print the instrumentation results so far (hidden menu entry "m")."""
+        if metrics.active is None:
+            print("Instrumentation is off; start with --metrics to turn it on.")
+            return
+        print("\n--- Metrics ---")
+        print(metrics.active.report())
+
     def exit_app(self) -> None:
         """Exit the application."""
         print("\nThank you for using Todo List Application. Goodbye!")
         self.running = False
+        self.todo_manager.close()
         sys.exit(0)
 
     def run(self) -> None:
@@ -328,9 +435,40 @@ class App:
         self.display_pre_login_menu()
 
 
-def main() -> None:
+def _dump_metrics(collected: metrics.Metrics, path: str, fmt: str) -> None:
+    """Write collected to path as JSON or Prometheus text."""
+    text = collected.to_prometheus() if fmt == "prometheus" else collected.to_json()
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Application entry point."""
-    app = App()
+    parser = argparse.ArgumentParser(description="Todo List Application")
+    parser.add_argument(
+        "--socket", help="connect to the todo daemon on this socket (see daemon.py)"
+    )
+    parser.add_argument(
+        "--metrics", action="store_true",
+        help="measure every action; enter m at a menu to see the results",
+    )
+    parser.add_argument(
+        "--metrics-dump", metavar="PATH", help="write the metrics here on exit (implies --metrics)"
+    )
+    parser.add_argument(
+        "--metrics-format", choices=["json", "prometheus"], default="json",
+        help="format of --metrics-dump (default: json)",
+    )
+    args = parser.parse_args(argv)
+    app = App(socket_path=args.socket)
+    if args.metrics or args.metrics_dump:
+        collected = metrics.enable([
+            (App, "app", APP_ACTIONS),
+            (type(app.todo_manager), "todo_manager", None),
+            (type(app.auth_manager), "auth_manager", None),
+        ])
+        if args.metrics_dump:
+            atexit.register(_dump_metrics, collected, args.metrics_dump, args.metrics_format)
     app.run()
 
 
@@ -1,22 +1,118 @@
 """Managers for handling application logic and data persistence."""
 
+import copy
+import itertools
 import json
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Iterable, Iterator, Optional, List
 from datetime import datetime
 
-from models import TodoItem, Priority, Status
+import metrics
+from idalloc import IdAllocator
+from locking import ChangeCounter, FileLock, atomic_write
+from models import BulkResult, ConflictError, Page, TodoItem, Priority, Status, NOT_FOUND, NOT_OWNER
+from paging import decode_cursor, encode_cursor, parse_order, sort_key
+from readview import ReadView
+from search import SearchIndex
+from snapshot import SnapshotCache
+from storage import detect_storage, open_store
 
 
 class TodoManager:
-    """Manages todo items and their persistence to JSON."""
+    """Manages todo items and their persistence.
 
-    def __init__(self, data_dir: str = "data"):
-        """Initialize TodoManager with a data directory."""
+    Todos are persisted through a storage backend (see ``storage``). By
+    default the backend already in use in ``data_dir`` is picked up, or a
+    plain ``todos.json`` file for a new directory.
+
+    Several processes may share one data directory. Every operation holds
+    a lock on ``todos.lock``, shared for reads and exclusive for writes,
+    so read-modify-write cycles never interleave and updates are not
+    lost. ``lock_stats`` reports how often and how long this process
+    waited for it.
+
+    One manager may also be shared by several threads. The lock admits
+    one thread at a time, so writers are serialized; readers normally do
+    not take it at all. With ``lock_free_reads`` on, reads are answered
+    from an immutable ReadView of every todo. Each write derives the next
+    view from the current one copy-on-write and publishes it by swapping
+    one reference, so a reader always sees the state either before or
+    after a write and never waits for one. Writes also bump a counter in
+    ``todos.gen`` that all processes map, so a view invalidated by
+    another process is noticed by reading shared memory and rebuilt
+    under the lock on the next read. The check also compares the
+    backend's ``data_token`` (for JSON, one stat of the file) to catch
+    edits made without a manager.
+    """
+
+    # Todos iter_todos reads from the store per hold of the lock.
+    iter_chunk = 500
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        storage: Optional[str] = None,
+        id_block_size: int = 16,
+        snapshot: bool = False,
+        lock_free_reads: Optional[bool] = None,
+        **store_options,
+    ):
+        """Initialize TodoManager with a data directory and storage backend.
+
+        Args:
+            data_dir: Directory holding the todo data.
+            storage: Storage backend name; detected from data_dir if None.
+            id_block_size: Number of IDs reserved at a time per process.
+            snapshot: Keep a binary snapshot of the decoded todos for fast
+                cold starts. Only the JSON backend uses it; the others
+                do not parse the whole file on start-up.
+            lock_free_reads: Answer reads from an in-memory ReadView
+                instead of the store. Defaults to on for backends that
+                keep every todo in memory anyway, and off for the others,
+                whose point is not to.
+            **store_options: Extra options for the storage backend.
+        """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.todos_file = self.data_dir / "todos.json"
+        self._lock = FileLock(self.data_dir / "todos.lock")
+        with self._lock.exclusive():
+            self.storage = storage or detect_storage(self.data_dir)
+            if snapshot and self.storage == "json":
+                store_options["snapshot"] = True
+            self._store = open_store(self.storage, self.data_dir, **store_options)
+        self._ids = IdAllocator(
+            self.data_dir / "todos.seq",
+            block_size=id_block_size,
+            existing_ids=lambda: (todo.id for todo in self._store.iter_all()),
+        )
+        self._search: Optional[SearchIndex] = None
+        self._search_stamp: Optional[tuple] = None
+        if lock_free_reads is None:
+            lock_free_reads = getattr(self._store, "resident", False)
+        self.lock_free_reads = lock_free_reads
+        self._changes = ChangeCounter(self.data_dir / "todos.gen")
+        self._view: Optional[ReadView] = None
+        self._view_hits = 0
+
+    @property
+    def cache_stats(self) -> dict:
+        """Hit/miss/reload counters of the backend's in-memory state.
+
+        Reads answered from the read view count as hits. They are counted
+        without a lock so as not to slow the lock-free path, so under
+        concurrent reads the count is approximate.
+        """
+        stats = dict(self._store.cache_stats)
+        stats["hits"] += self._view_hits
+        return stats
+
+    @property
+    def lock_stats(self) -> dict:
+        """Acquisition count and wait times of the data directory lock."""
+        return self._lock.stats
 
     def create_todo(
         self,
@@ -26,7 +122,7 @@ class TodoManager:
         owner: str,
     ) -> TodoItem:
         """Create a new todo item and save it."""
-        # Assign a sequential numeric ID (stored as string) starting from 1.
+        # Assign an increasing numeric ID (stored as string) starting from 1.
         todo_id = self._get_next_id()
 
         todo = TodoItem(
@@ -37,136 +133,513 @@ class TodoManager:
             status=Status.PENDING,
             owner=owner,
         )
-        self._save_todo(todo)
+        with self._writing() as publish:
+            self._store.add(todo)
+            publish([todo])
         return todo
 
     def _get_next_id(self) -> str:
         """Return the next numeric ID as a string.
 
-        This scans existing todos for numeric IDs and returns max+1.
-        Non-numeric IDs are ignored.
+        IDs come from the persistent allocator in ``todos.seq``; stored
+        todos are only scanned once, to seed a missing counter file.
         """
-        todos = self._load_all_todos()
-        max_id = 0
-        for todo in todos:
-            try:
-                val = int(todo.id)
-            except Exception:
-                continue
-            if val > max_id:
-                max_id = val
-        return str(max_id + 1)
+        return self._ids.next_id()
 
     def get_todos_by_owner(self, owner: str) -> List[TodoItem]:
         """Retrieve all todos for a specific owner."""
-        todos = self._load_all_todos()
-        return [todo for todo in todos if todo.owner == owner]
+        if self.lock_free_reads:
+            return self._read_view().by_owner(owner)
+        with self._lock.shared():
+            return self._store.by_owner(owner)
 
     def get_all_todos(self) -> List[TodoItem]:
         """Return all todos stored in the system."""
-        return self._load_all_todos()
+        if self.lock_free_reads:
+            return self._read_view().all()
+        with self._lock.shared():
+            return [copy.copy(todo) for todo in self._store.load_all()]
+
+    def iter_todos(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Yield stored todos one at a time, only owner's if given.
+
+        The full list is never built, so memory use stays flat however
+        large the data set is. The store is read ``iter_chunk`` todos at
+        a time, each chunk under the shared lock, so a write (or a
+        compaction) can run between chunks but never in the middle of
+        one. The backends replace their files atomically, so a stream
+        that is already open keeps reading the version it started on. A
+        current read view is streamed from instead, but none is built
+        for this.
+        """
+        view = self._view
+        if self.lock_free_reads and self._is_current(view):
+            self._view_hits += 1
+            return view.iter(owner)
+        return self._locked_chunks(self._store.iter_all(owner))
+
+    def _locked_chunks(self, todos: Iterator[TodoItem]) -> Iterator[TodoItem]:
+        """Yield from todos, advancing it only while holding the shared lock."""
+        while True:
+            with self._lock.shared():
+                chunk = list(itertools.islice(todos, self.iter_chunk))
+            if not chunk:
+                return
+            yield from chunk
+
+    def list_todos(
+        self,
+        owner: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        order_by: str = "created",
+    ) -> Page:
+        """Return one page of todos and a cursor for the next one.
+
+        Pages are located by the sort key of the last todo shown (keyset
+        pagination), so a page costs the same however deep it is and is
+        not thrown off by todos added or removed in between. Only one page
+        of todos is ever held in memory.
+
+        Args:
+            owner: Only list this owner's todos if given.
+            limit: Maximum number of todos per page.
+            cursor: ``next_cursor`` of the previous page; None for the first.
+            order_by: created, updated, priority or title; prefix with
+                ``-`` for descending order.
+
+        Raises:
+            ValueError: If order_by is unknown, limit is not positive, or
+                cursor is invalid or belongs to another ordering.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        field, descending = parse_order(order_by)
+        after = decode_cursor(cursor, order_by)
+        if self.lock_free_reads:
+            todos = self._read_view().page(owner, limit + 1, field, descending, after)
+        else:
+            with self._lock.shared():
+                todos = self._store.page(owner, limit + 1, field, descending, after)
+        next_cursor = None
+        if len(todos) > limit:
+            todos = todos[:limit]
+            next_cursor = encode_cursor(order_by, sort_key(field)(todos[-1]))
+        return Page(todos, next_cursor)
 
     def get_todo_by_id(self, todo_id: str) -> Optional[TodoItem]:
         """Retrieve a specific todo by ID."""
-        todos = self._load_all_todos()
-        for todo in todos:
-            if todo.id == todo_id:
-                return todo
-        return None
+        if self.lock_free_reads:
+            return self._read_view().get(todo_id)
+        with self._lock.shared():
+            return self._store.get(todo_id)
 
-    def update_todo(self, todo: TodoItem) -> None:
-        """Update an existing todo item."""
-        todo.updated_at = datetime.now().isoformat()
-        todos = self._load_all_todos()
-        # Replace the todo with the same ID
-        updated_todos = [t for t in todos if t.id != todo.id]
-        updated_todos.append(todo)
-        self._save_all_todos(updated_todos)
+    def update_todo(self, todo: TodoItem, expected_version: Optional[int] = None) -> None:
+        """Update an existing todo item.
+
+        Every update increments the stored version and todo.version is set
+        to the new value. If expected_version is given the update is a
+        compare-and-swap: it is only applied if the stored todo is still
+        at that version, and ConflictError is raised otherwise. Passing the
+        version read before editing catches changes made by others in the
+        meantime without holding the lock while the user is typing.
+        """
+        with self._writing() as publish:
+            # Try the owner's todos first: for the sharded backend that is
+            # a single shard, and only a changed owner needs a full search.
+            current = self._store.get_owned(todo.id, todo.owner) or self._store.get(todo.id)
+            if expected_version is not None:
+                actual = current.version if current is not None else None
+                if actual != expected_version:
+                    raise ConflictError(todo.id, expected_version, actual)
+            if current is not None:
+                todo.version = current.version + 1
+            todo.updated_at = datetime.now().isoformat()
+            self._store.replace(todo)
+            publish([todo])
 
     def delete_todo(self, todo_id: str) -> bool:
         """Delete a todo item by ID."""
-        todos = self._load_all_todos()
-        original_len = len(todos)
-        todos = [todo for todo in todos if todo.id != todo_id]
-        if len(todos) < original_len:
-            self._save_all_todos(todos)
-            return True
-        return False
+        with self._writing() as publish:
+            removed = self._store.remove(todo_id)
+            if removed:
+                publish(deletes=[todo_id])
+            return removed
 
     def mark_as_completed(self, todo_id: str, owner: str) -> bool:
         """Mark a todo as completed if it exists and belongs to the owner.
 
         Returns True if updated, False otherwise.
         """
-        todos = self._load_all_todos()
-        for todo in todos:
-            if todo.id == todo_id:
-                if todo.owner != owner:
-                    return False
-                todo.status = Status.COMPLETED
-                todo.updated_at = datetime.now().isoformat()
-                self._save_all_todos(todos)
-                return True
-        return False
-
-    def _load_all_todos(self) -> List[TodoItem]:
-        """Load all todos from the JSON file."""
-        if not self.todos_file.exists():
+        with self._writing() as publish:
+            todo = self._store.get_owned(todo_id, owner)
+            if todo is None:
+                return False
+            todo.status = Status.COMPLETED
+            todo.updated_at = datetime.now().isoformat()
+            todo.version += 1
+            self._store.replace(todo)
+            publish([todo])
+        return True
+
+    def create_many(self, items: Iterable[dict]) -> List[TodoItem]:
+        """Create several todos with one ID reservation and one write.
+
+        Args:
+            items: Mappings with the create_todo arguments ``title``,
+                ``details``, ``priority`` and ``owner``, and optionally
+                ``status``, ``created_at`` and ``updated_at`` for todos
+                brought over from elsewhere.
+
+        Returns:
+            The created todos, in input order.
+        """
+        items = list(items)
+        if not items:
             return []
-        with open(self.todos_file, "r") as f:
-            data = json.load(f)
-        return [TodoItem.from_dict(item) for item in data]
+        ids = self._ids.reserve(len(items))
+        now = datetime.now().isoformat()
+        todos = [
+            TodoItem(
+                id=str(todo_id),
+                title=item["title"],
+                details=item.get("details", ""),
+                priority=item.get("priority", Priority.MID),
+                status=item.get("status", Status.PENDING),
+                owner=item["owner"],
+                created_at=item.get("created_at", now),
+                updated_at=item.get("updated_at", now),
+            )
+            for todo_id, item in zip(ids, items)
+        ]
+        with self._writing() as publish:
+            self._store.apply(todos)
+            publish(todos)
+        return todos
 
-    def _save_todo(self, todo: TodoItem) -> None:
-        """Save a todo item to the JSON file."""
-        todos = self._load_all_todos()
-        todos.append(todo)
-        self._save_all_todos(todos)
+    def update_many(
+        self, todos: Iterable[TodoItem], owner: Optional[str] = None
+    ) -> List[BulkResult]:
+        """Update several existing todos with one load and one write.
 
-    def _save_all_todos(self, todos: List[TodoItem]) -> None:
-        """Save all todos to the JSON file."""
-        with open(self.todos_file, "w") as f:
-            json.dump([todo.to_dict() for todo in todos], f, indent=2)
+        If owner is given, todos that belong to someone else are skipped.
+        """
+        todos = list(todos)
+        with self._writing() as publish:
+            current = self._store.get_many(todo.id for todo in todos)
+            now = datetime.now().isoformat()
+            results = []
+            upserts = {}
+            for todo in todos:
+                error = self._check(current.get(todo.id), owner)
+                if error:
+                    results.append(BulkResult(todo.id, False, error))
+                    continue
+                todo.updated_at = now
+                todo.version = current[todo.id].version + 1
+                upserts[todo.id] = todo
+                results.append(BulkResult(todo.id, True))
+            if upserts:
+                self._store.apply(list(upserts.values()))
+                publish(upserts.values())
+            return results
+
+    def delete_many(
+        self, todo_ids: Iterable[str], owner: Optional[str] = None
+    ) -> List[BulkResult]:
+        """Delete several todos with one load and one write.
+
+        If owner is given, todos that belong to someone else are skipped.
+        """
+        todo_ids = list(todo_ids)
+        with self._writing() as publish:
+            current = self._store.get_many(todo_ids)
+            results = []
+            deletes = {}
+            for todo_id in todo_ids:
+                error = self._check(current.get(todo_id), owner)
+                if error or todo_id in deletes:
+                    results.append(BulkResult(todo_id, False, error or NOT_FOUND))
+                    continue
+                deletes[todo_id] = None
+                results.append(BulkResult(todo_id, True))
+            if deletes:
+                self._store.apply([], list(deletes))
+                publish(deletes=deletes)
+            return results
+
+    def complete_many(self, todo_ids: Iterable[str], owner: str) -> List[BulkResult]:
+        """Mark several of owner's todos as completed with one write.
+
+        Applies the same existence and ownership checks as
+        mark_as_completed to every ID.
+        """
+        todo_ids = list(todo_ids)
+        with self._writing() as publish:
+            current = self._store.get_many(todo_ids)
+            now = datetime.now().isoformat()
+            results = []
+            upserts = {}
+            for todo_id in todo_ids:
+                todo = current.get(todo_id)
+                error = self._check(todo, owner)
+                if error:
+                    results.append(BulkResult(todo_id, False, error))
+                    continue
+                todo.status = Status.COMPLETED
+                todo.updated_at = now
+                todo.version += 1
+                upserts[todo_id] = todo
+                results.append(BulkResult(todo_id, True))
+            if upserts:
+                self._store.apply(list(upserts.values()))
+                publish(upserts.values())
+            return results
+
+    @staticmethod
+    def _check(todo: Optional[TodoItem], owner: Optional[str]) -> Optional[str]:
+        """Return why a bulk change to todo must be skipped, or None."""
+        if todo is None:
+            return NOT_FOUND
+        if owner is not None and todo.owner != owner:
+            return NOT_OWNER
+        return None
+
+    def search_todos(
+        self,
+        query: str,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[TodoItem]:
+        """Return the todos matching a full-text query, best match first.
+
+        Words must all appear in the title or details; ``OR`` separates
+        alternatives (see search.parse_query). The index is built from
+        storage on the first search and kept up to date by this manager's
+        writes. It is rebuilt when anyone else changed the data since,
+        detected the same way as for the read view, and after clear_cache.
+
+        Args:
+            query: Search words, optionally separated by ``OR``.
+            owner: Only return this owner's todos if given.
+            limit: Maximum number of todos to return.
+        """
+        with self._lock.shared():
+            stamp = self._stamp()
+            if self._search is None or self._search_stamp != stamp:
+                # A resident store keeps what it loads here for get_many
+                # below instead of streaming the file a second time.
+                if getattr(self._store, "resident", False):
+                    todos: Iterable[TodoItem] = self._store.load_all()
+                else:
+                    todos = self._store.iter_all()
+                self._search = SearchIndex.build(todos)
+                self._search_stamp = stamp
+            ids = [todo_id for todo_id, _ in self._search.search(query, owner, limit)]
+            found = self._store.get_many(ids)
+        return [found[todo_id] for todo_id in ids if todo_id in found]
+
+    def _stamp(self) -> tuple:
+        """Return the change counter and store token data is stamped with."""
+        return (self._changes.value, self._store.data_token())
+
+    def _is_current(self, view: Optional[ReadView]) -> bool:
+        """Whether view still reflects what is stored."""
+        return (
+            view is not None
+            and view.generation == self._changes.value
+            and view.token == self._store.data_token()
+        )
+
+    def _read_view(self) -> ReadView:
+        """Return a current read view, rebuilding it if it is stale.
+
+        The common case reads one shared counter and the backend's
+        data token, and takes no lock.
+        """
+        view = self._view
+        if self._is_current(view):
+            self._view_hits += 1
+            return view
+        with self._lock.shared():
+            view = self._view
+            if not self._is_current(view):
+                # Take the token first: a change racing with the load
+                # then makes the view look stale, never fresh.
+                token = self._store.data_token()
+                view = ReadView.build(self._store.load_all(), self._changes.value, token)
+                self._view = view
+            return view
+
+    @contextmanager
+    def _writing(self) -> Iterator[Callable[..., None]]:
+        """Hold the exclusive lock for a write and publish its changes.
+
+        Yields ``publish(upserts=(), deletes=())``, which the write calls
+        with what it stored. On exit the change counter is bumped and the
+        next read view is derived from the current one, or dropped if the
+        current one was already stale when the write began.
+        """
+        with self._lock.exclusive():
+            base = self._view if self._is_current(self._view) else None
+            if self._search_stamp != self._stamp():
+                # Missed someone else's writes; rebuild on the next search.
+                self._search = None
+            stored: List[TodoItem] = []
+            removed: List[str] = []
+
+            def publish(upserts: Iterable[TodoItem] = (), deletes: Iterable[str] = ()) -> None:
+                stored.extend(upserts)
+                removed.extend(deletes)
+
+            try:
+                yield publish
+            except BaseException:
+                base = None
+                raise
+            finally:
+                if stored or removed:
+                    self._index(stored)
+                    self._unindex(removed)
+                    generation = self._changes.bump()
+                    token = self._store.data_token()
+                    self._search_stamp = (generation, token)
+                    if base is not None:
+                        base = base.updated(stored, removed, generation, token)
+                    self._view = base
+                elif base is None:
+                    self._view = None
+
+    def _index(self, todos: Iterable[TodoItem]) -> None:
+        """Add or refresh todos in the search index, if it is built."""
+        if self._search is not None:
+            for todo in todos:
+                self._search.add(todo)
+
+    def _unindex(self, todo_ids: Iterable[str]) -> None:
+        """Drop todo_ids from the search index, if it is built."""
+        if self._search is not None:
+            for todo_id in todo_ids:
+                self._search.remove(todo_id)
+
+    def compact(self) -> int:
+        """Compact the backing store. Returns the number of records reclaimed."""
+        with self._lock.exclusive():
+            return self._store.compact()
+
+    def clear_cache(self) -> None:
+        """Drop cached state so the next access re-reads storage."""
+        self._store.clear_cache()
+        self._search = None
+        self._view = None
+
+    def close(self) -> None:
+        """Release resources held by the storage backend."""
+        with self._lock.exclusive():
+            self._store.close()
+            self._view = None
+            self._changes.close()
+        self._lock.close()
 
 
 class AuthManager:
-    """Manages user authentication and persistence."""
+    """Manages user authentication and persistence.
 
-    def __init__(self, data_dir: str = "data"):
-        """Initialize AuthManager with a data directory."""
+    Reads hold ``users.lock`` shared and sign-ups hold it exclusively
+    across the whole check-and-add, so concurrent processes cannot lose
+    or duplicate a registration. users.json is replaced atomically.
+    The decoded users stay in memory while the file's signature is
+    unchanged, so repeated logins do not re-read it.
+    """
+
+    def __init__(self, data_dir: str = "data", snapshot: bool = False):
+        """Initialize AuthManager with a data directory.
+
+        Args:
+            data_dir: Directory holding users.json.
+            snapshot: Keep a binary snapshot of the decoded users next to
+                users.json and load it instead while it is valid.
+        """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.users_file = self.data_dir / "users.json"
+        self._snapshot = SnapshotCache(self.users_file) if snapshot else None
+        self._lock = FileLock(self.data_dir / "users.lock")
+        self._users: Optional[dict] = None
+        self._users_key: Optional[tuple] = None
+
+    @property
+    def lock_stats(self) -> dict:
+        """Acquisition count and wait times of the users lock."""
+        return self._lock.stats
 
     def sign_up(self, username: str, password: str) -> bool:
         """Register a new user."""
         if not username or not password:
             return False
-        if self.user_exists(username):
-            return False
-        users = self._load_users()
-        users[username] = password
-        self._save_users(users)
+        with self._lock.exclusive():
+            users = dict(self._load_users())
+            if username in users:
+                return False
+            users[username] = password
+            self._save_users(users)
         return True
 
     def login(self, username: str, password: str) -> bool:
         """Authenticate a user."""
-        users = self._load_users()
+        with self._lock.shared():
+            users = self._load_users()
         return users.get(username) == password
 
     def user_exists(self, username: str) -> bool:
         """Check if a user exists."""
-        users = self._load_users()
+        with self._lock.shared():
+            users = self._load_users()
         return username in users
 
+    def _signature(self) -> Optional[tuple]:
+        """Return (inode, size, mtime_ns) of users.json, or None if missing."""
+        try:
+            st = os.stat(self.users_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
     def _load_users(self) -> dict:
-        """Load all users from the JSON file."""
-        if not self.users_file.exists():
+        """Load all users, from memory while users.json is unchanged.
+
+        The returned dict is shared; copy it before changing it.
+        """
+        key = self._signature()
+        if key is None:
             return {}
-        with open(self.users_file, "r") as f:
-            return json.load(f)
+        if key == self._users_key:
+            return self._users
+        users = self._read_users()
+        self._users, self._users_key = users, key
+        return users
+
+    def _read_users(self) -> dict:
+        """Decode users.json, through the snapshot when it is valid."""
+        if self._snapshot is not None:
+            users = self._snapshot.load()
+            if users is not None:
+                if metrics.active is not None:
+                    metrics.active.record_io(decoded=len(users))
+                return users
+        with open(self.users_file, "rb") as f:
+            content = f.read()
+        users = json.loads(content)
+        if metrics.active is not None:
+            metrics.active.record_io(read=len(content), decoded=len(users), files_read=1)
+        if self._snapshot is not None:
+            self._snapshot.save(users, content)
+        return users
 
     def _save_users(self, users: dict) -> None:
         """Save all users to the JSON file."""
-        with open(self.users_file, "w") as f:
-            json.dump(users, f, indent=2)
+        content = json.dumps(users, indent=2)
+        atomic_write(self.users_file, content)
+        self._users, self._users_key = users, self._signature()
+        if self._snapshot is not None:
+            self._snapshot.save(users, content.encode("utf-8"))
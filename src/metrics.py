@@ -0,0 +1,350 @@
+"""Opt-in per-operation instrumentation: call counts, I/O and latency.
+
+Nothing is measured until ``enable`` is called. It wraps the public
+methods of the given classes so that every call records its latency in a
+log-linear histogram, and it makes ``active`` point at the Metrics that
+collect the results. Storage code reports file I/O with::
+
+    if metrics.active is not None:
+        metrics.active.record_io(read=len(content), decoded=len(todos))
+
+so with instrumentation off the whole cost is that one attribute check
+at each file read or write. I/O is attributed to every operation in
+progress on the calling thread, so ``app.edit_todo`` includes the bytes
+read by the ``todo_manager`` calls it makes.
+
+Besides bytes, reads and writes of whole data files (todos.json,
+users.json, snapshots) are counted, which is what makes redundant
+reloads visible: ``collecting`` measures a block of code, and the I/O
+budget tests use it to cap what each App action may do.
+"""
+
+import functools
+import inspect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Sub-buckets per power of two; values are kept to within 1/16 (6.25%).
+_SUB_BITS = 5
+_SUB_COUNT = 1 << _SUB_BITS
+
+# Upper bounds, in seconds, of the buckets written in Prometheus format.
+PROMETHEUS_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Log-linear histogram of nanosecond durations, HDR style.
+
+    Values below 32 get a bucket each; above that every power of two is
+    split into 16 buckets, so any value is known to within 6.25% however
+    large it is, with a few hundred buckets at most. Buckets are only
+    allocated once used.
+    """
+
+    def __init__(self):
+        """Create an empty histogram."""
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        """Return the bucket index of value."""
+        if value < _SUB_COUNT:
+            return value
+        shift = value.bit_length() - _SUB_BITS
+        return (shift << _SUB_BITS) + (value >> shift)
+
+    @staticmethod
+    def _bounds(index: int) -> Tuple[int, int]:
+        """Return the lowest and highest value in bucket index."""
+        if index < _SUB_COUNT:
+            return index, index
+        shift, mantissa = index >> _SUB_BITS, index & (_SUB_COUNT - 1)
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        """Add one value, in nanoseconds."""
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> int:
+        """Return the value below which p percent of the values fall."""
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Iterable[float]) -> List[int]:
+        """Return how many values are at most each bound, given in seconds.
+
+        A bucket counts towards a bound if its lowest value does.
+        """
+        indexes = sorted(self.counts)
+        result = []
+        seen = 0
+        i = 0
+        for bound in bounds:
+            limit = bound * 1e9
+            while i < len(indexes) and self._bounds(indexes[i])[0] <= limit:
+                seen += self.counts[indexes[i]]
+                i += 1
+            result.append(seen)
+        return result
+
+
+@dataclass
+class OpStats:
+    """What was measured for one operation.
+
+    Attributes:
+        calls: Completed calls, including ones that raised.
+        errors: Calls that raised an exception.
+        bytes_read: Bytes read from data files during the calls.
+        bytes_written: Bytes written to data files during the calls.
+        items_decoded: Todos or users decoded from data files.
+        files_read: Whole data files read during the calls.
+        files_written: Data files written (replaced) during the calls.
+        latency: Histogram of call durations in nanoseconds.
+    """
+    calls: int = 0
+    errors: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    items_decoded: int = 0
+    files_read: int = 0
+    files_written: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+    def to_dict(self) -> dict:
+        """Summarize as JSON-serializable data; latencies in microseconds."""
+        h = self.latency
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "items_decoded": self.items_decoded,
+            "files_read": self.files_read,
+            "files_written": self.files_written,
+            "latency_us": {
+                "mean": h.total / h.count / 1000 if h.count else 0.0,
+                "min": h.min / 1000,
+                "p50": h.percentile(50) / 1000,
+                "p90": h.percentile(90) / 1000,
+                "p99": h.percentile(99) / 1000,
+                "max": h.max / 1000,
+            },
+        }
+
+
+# Name under which I/O outside any instrumented operation is recorded.
+UNATTRIBUTED = "(other)"
+
+
+class Metrics:
+    """Per-operation statistics, safe to update from several threads."""
+
+    def __init__(self):
+        """Start with no operations recorded."""
+        self.ops: Dict[str, OpStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stats(self, name: str) -> OpStats:
+        """Return the stats of operation name, creating them if needed."""
+        stats = self.ops.get(name)
+        if stats is None:
+            stats = self.ops.setdefault(name, OpStats())
+        return stats
+
+    def _stack(self) -> List[str]:
+        """Return the operations in progress on this thread, outermost first."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record_call(self, name: str, nanoseconds: int, failed: bool = False) -> None:
+        """Record one finished call of operation name."""
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.errors += failed
+            stats.latency.record(nanoseconds)
+
+    def record_io(
+        self,
+        read: int = 0,
+        written: int = 0,
+        decoded: int = 0,
+        files_read: int = 0,
+        files_written: int = 0,
+    ) -> None:
+        """Add file I/O to every operation in progress on this thread."""
+        names = self._stack() or [UNATTRIBUTED]
+        with self._lock:
+            for name in set(names):
+                stats = self._stats(name)
+                stats.bytes_read += read
+                stats.bytes_written += written
+                stats.items_decoded += decoded
+                stats.files_read += files_read
+                stats.files_written += files_written
+
+    def wrap(self, name: str, func):
+        """Return func instrumented as operation name."""
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            stack.append(name)
+            failed = True
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self.record_call(name, clock() - start, failed)
+                stack.pop()
+
+        return wrapper
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return every operation's summary, by name."""
+        with self._lock:
+            return {name: self.ops[name].to_dict() for name in sorted(self.ops)}
+
+    def to_json(self) -> str:
+        """Render the summaries as a JSON document."""
+        return json.dumps({"operations": self.snapshot()}, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render the statistics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            ops = sorted(self.ops.items())
+            for metric, attr, help_text in (
+                ("todo_op_calls_total", "calls", "Calls per operation."),
+                ("todo_op_errors_total", "errors", "Calls that raised an exception."),
+                ("todo_op_read_bytes_total", "bytes_read", "Bytes read from data files."),
+                ("todo_op_written_bytes_total", "bytes_written", "Bytes written to data files."),
+                ("todo_op_decoded_items_total", "items_decoded", "Records decoded from data files."),
+                ("todo_op_file_reads_total", "files_read", "Whole data files read."),
+                ("todo_op_file_writes_total", "files_written", "Data files written."),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, stats in ops:
+                    lines.append(f'{metric}{{op="{name}"}} {getattr(stats, attr)}')
+            metric = "todo_op_latency_seconds"
+            lines.append(f"# HELP {metric} Call duration.")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in ops:
+                h = stats.latency
+                if not h.count:
+                    continue
+                for bound, count in zip(PROMETHEUS_BUCKETS, h.cumulative(PROMETHEUS_BUCKETS)):
+                    lines.append(f'{metric}_bucket{{op="{name}",le="{bound:g}"}} {count}')
+                lines.append(f'{metric}_bucket{{op="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{metric}_sum{{op="{name}"}} {h.total / 1e9:.9f}')
+                lines.append(f'{metric}_count{{op="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> str:
+        """Render a table of the summaries for the terminal."""
+        rows = [f"{'operation':<32}{'calls':>7}{'p50 us':>10}{'p99 us':>10}"
+                f"{'reads':>7}{'writes':>7}{'read KiB':>10}{'written KiB':>12}{'decoded':>9}"]
+        for name, s in self.snapshot().items():
+            latency = s["latency_us"]
+            rows.append(
+                f"{name:<32}{s['calls']:>7}{latency['p50']:>10.1f}{latency['p99']:>10.1f}"
+                f"{s['files_read']:>7}{s['files_written']:>7}"
+                f"{s['bytes_read'] / 1024:>10.1f}{s['bytes_written'] / 1024:>12.1f}"
+                f"{s['items_decoded']:>9}"
+            )
+        return "\n".join(rows)
+
+
+# The Metrics being collected, or None while instrumentation is off.
+active: Optional[Metrics] = None
+_patched: List[Tuple[type, str, object]] = []
+
+
+def public_methods(cls: type) -> List[str]:
+    """Return the names of the public plain methods cls defines or inherits."""
+    return [
+        name for name in dir(cls)
+        if not name.startswith("_") and inspect.isfunction(inspect.getattr_static(cls, name))
+    ]
+
+
+def enable(targets: Iterable[Tuple[type, str, Optional[Iterable[str]]]]) -> Metrics:
+    """Start collecting and instrument the given classes.
+
+    Args:
+        targets: (class, prefix, method names) triples; operations are
+            named ``prefix.method``. None instruments every public method.
+
+    Returns:
+        The Metrics now in ``active``. Calling enable again keeps them
+        and only adds classes not yet instrumented.
+    """
+    global active
+    if active is None:
+        active = Metrics()
+    done = {(cls, name) for cls, name, _ in _patched}
+    for cls, prefix, names in targets:
+        for name in names if names is not None else public_methods(cls):
+            if (cls, name) in done:
+                continue
+            original = cls.__dict__.get(name)
+            setattr(cls, name, active.wrap(f"{prefix}.{name}", getattr(cls, name)))
+            _patched.append((cls, name, original))
+    return active
+
+
+def disable() -> Optional[Metrics]:
+    """Stop collecting, restore the instrumented classes and return the results."""
+    global active
+    while _patched:
+        cls, name, original = _patched.pop()
+        if original is None:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, original)
+    metrics, active = active, None
+    return metrics
+
+
+@contextmanager
+def collecting(targets: Iterable[Tuple[type, str, Optional[Iterable[str]]]]) -> Iterator[Metrics]:
+    """Instrument targets (see enable) for the duration of a with block."""
+    collected = enable(targets)
+    try:
+        yield collected
+    finally:
+        disable()
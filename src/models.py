@@ -1,8 +1,10 @@
 """Data models for the Todo List application."""
 
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
 from uuid import uuid4
 
 
@@ -19,6 +21,11 @@ class Status(Enum):
     COMPLETED = "COMPLETED"
 
 
+# Value -> member tables; faster than calling the Enum class.
+PRIORITY_BY_VALUE = {priority.value: priority for priority in Priority}
+STATUS_BY_VALUE = {status.value: status for status in Status}
+
+
 @dataclass
 class TodoItem:
     """Represents a todo item in the application.
@@ -32,6 +39,7 @@ class TodoItem:
         owner: Username of the todo owner.
         created_at: ISO-8601 timestamp of creation.
         updated_at: ISO-8601 timestamp of last update.
+        version: Incremented on every change, for optimistic concurrency.
     """
     id: str = field(default_factory=lambda: str(uuid4()))
     title: str = ""
@@ -41,6 +49,7 @@ class TodoItem:
     owner: str = ""
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    version: int = 1
 
     def to_dict(self) -> dict:
         """Convert TodoItem to dictionary format for JSON serialization."""
@@ -53,18 +62,263 @@ class TodoItem:
             "owner": self.owner,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
+            "version": self.version,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "TodoItem":
-        """Create a TodoItem from dictionary format."""
+        """Create a TodoItem from dictionary format.
+
+        Complete records take a fast path with plain lookups; defaults are
+        only computed for records that are missing fields. Records written
+        before versioning existed read as version 1.
+        """
+        try:
+            return cls(
+                data["id"],
+                data["title"],
+                data["details"],
+                PRIORITY_BY_VALUE[data["priority"]],
+                STATUS_BY_VALUE[data["status"]],
+                data["owner"],
+                data["created_at"],
+                data["updated_at"],
+                data.get("version", 1),
+            )
+        except KeyError:
+            pass
+        now = None
+        if "created_at" not in data or "updated_at" not in data:
+            now = datetime.now().isoformat()
+        return cls(
+            id=data["id"] if "id" in data else str(uuid4()),
+            title=data.get("title", ""),
+            details=data.get("details", ""),
+            priority=Priority(data.get("priority", "MID")),
+            status=Status(data.get("status", "PENDING")),
+            owner=data.get("owner", ""),
+            created_at=data.get("created_at", now),
+            updated_at=data.get("updated_at", now),
+            version=data.get("version", 1),
+        )
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _pack_timestamp(value: str) -> Union[int, str]:
+    """Return an ISO-8601 timestamp as microseconds since the epoch.
+
+    The string is kept as-is if it would not survive the round trip
+    exactly (time zone offsets, unusual precision, invalid input).
+    """
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if dt.tzinfo is not None:
+        return value
+    packed = (dt - _EPOCH) // _MICROSECOND
+    return packed if _unpack_timestamp(packed) == value else value
+
+
+def _unpack_timestamp(value: Union[int, str]) -> str:
+    """Inverse of _pack_timestamp."""
+    if isinstance(value, str):
+        return value
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+class CompactTodoItem:
+    """Memory-lean counterpart of TodoItem for large resident collections.
+
+    Uses ``__slots__`` instead of a per-instance ``__dict__``, interns the
+    owner so all of an owner's todos share one string, and keeps the
+    timestamps as integer microseconds since the epoch instead of ISO
+    strings. ``created_at``/``updated_at`` still read and write ISO
+    strings, and ``to_dict``/``from_dict`` use the same format as TodoItem.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "details",
+        "priority",
+        "status",
+        "_owner",
+        "_created",
+        "_updated",
+        "version",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str = "",
+        details: str = "",
+        priority: Priority = Priority.MID,
+        status: Status = Status.PENDING,
+        owner: str = "",
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        version: int = 1,
+    ):
+        """Initialize the item; missing timestamps default to now."""
+        self.id = id
+        self.title = title
+        self.details = details
+        self.priority = priority
+        self.status = status
+        self.owner = owner
+        self.created_at = created_at or datetime.now().isoformat()
+        self.updated_at = updated_at or datetime.now().isoformat()
+        self.version = version
+
+    @property
+    def owner(self) -> str:
+        """Username of the todo owner."""
+        return self._owner
+
+    @owner.setter
+    def owner(self, value: str) -> None:
+        self._owner = sys.intern(value)
+
+    @property
+    def created_at(self) -> str:
+        """ISO-8601 timestamp of creation."""
+        return _unpack_timestamp(self._created)
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self._created = _pack_timestamp(value)
+
+    @property
+    def updated_at(self) -> str:
+        """ISO-8601 timestamp of last update."""
+        return _unpack_timestamp(self._updated)
+
+    @updated_at.setter
+    def updated_at(self, value: str) -> None:
+        self._updated = _pack_timestamp(value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactTodoItem):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"CompactTodoItem(id={self.id!r}, title={self.title!r}, owner={self.owner!r})"
+
+    def to_dict(self) -> dict:
+        """Convert to the same dictionary format as TodoItem.to_dict."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "details": self.details,
+            "priority": self.priority.value,
+            "status": self.status.value,
+            "owner": self.owner,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompactTodoItem":
+        """Create an item from the TodoItem dictionary format."""
         return cls(
-            id=data.get("id", str(uuid4())),
+            id=data["id"] if "id" in data else str(uuid4()),
             title=data.get("title", ""),
             details=data.get("details", ""),
             priority=Priority(data.get("priority", "MID")),
             status=Status(data.get("status", "PENDING")),
             owner=data.get("owner", ""),
-            created_at=data.get("created_at", datetime.now().isoformat()),
-            updated_at=data.get("updated_at", datetime.now().isoformat()),
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+            version=data.get("version", 1),
+        )
+
+    @classmethod
+    def from_item(cls, todo: TodoItem) -> "CompactTodoItem":
+        """Create a compact copy of a TodoItem."""
+        return cls(
+            todo.id,
+            todo.title,
+            todo.details,
+            todo.priority,
+            todo.status,
+            todo.owner,
+            todo.created_at,
+            todo.updated_at,
+            todo.version,
         )
+
+    def to_item(self) -> TodoItem:
+        """Return the equivalent TodoItem."""
+        return TodoItem(
+            id=self.id,
+            title=self.title,
+            details=self.details,
+            priority=self.priority,
+            status=self.status,
+            owner=self.owner,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            version=self.version,
+        )
+
+
+# Reasons a bulk operation can skip an item.
+NOT_FOUND = "not_found"
+NOT_OWNER = "not_owner"
+
+
+class ConflictError(Exception):
+    """Raised when a todo changed since the version an update was based on.
+
+    Attributes:
+        todo_id: ID of the todo that was not updated.
+        expected_version: Version the caller read before editing.
+        actual_version: Version now stored, or None if it was deleted.
+    """
+
+    def __init__(self, todo_id: str, expected_version: int, actual_version: Optional[int]):
+        self.todo_id = todo_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        if actual_version is None:
+            message = f"Todo {todo_id} was deleted"
+        else:
+            message = (
+                f"Todo {todo_id} is at version {actual_version}, "
+                f"expected {expected_version}"
+            )
+        super().__init__(message)
+
+
+@dataclass
+class BulkResult:
+    """Outcome for one item of a bulk TodoManager operation.
+
+    Attributes:
+        id: ID of the todo the result refers to.
+        ok: True if the change was applied.
+        error: NOT_FOUND or NOT_OWNER when the change was skipped.
+    """
+    id: str
+    ok: bool
+    error: Optional[str] = None
+
+
+@dataclass
+class Page:
+    """One page of a TodoManager.list_todos listing.
+
+    Attributes:
+        items: The todos on this page, in listing order.
+        next_cursor: Opaque cursor for the following page, or None if this
+            is the last one.
+    """
+    items: List[TodoItem]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,94 @@
+"""Keyset pagination helpers shared by TodoManager and the storage backends."""
+
+import base64
+import heapq
+import json
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from models import Priority, TodoItem
+
+# Orderings accepted by list_todos; prefix with "-" for descending.
+ORDERINGS = ("created", "updated", "priority", "title")
+
+PRIORITY_RANK = {Priority.HIGH: 0, Priority.MID: 1, Priority.LOW: 2}
+
+SortKey = Tuple
+
+
+def parse_order(order_by: str) -> Tuple[str, bool]:
+    """Split order_by into (field, descending), validating the field."""
+    descending = order_by.startswith("-")
+    field = order_by.lstrip("-")
+    if field not in ORDERINGS:
+        raise ValueError(
+            f"Cannot order by {order_by!r}; use one of {', '.join(ORDERINGS)}"
+        )
+    return field, descending
+
+
+def sort_key(field: str) -> Callable[[TodoItem], SortKey]:
+    """Return the key function for field.
+
+    Every key ends with the todo's ID, compared by length and then text,
+    which puts numeric IDs in numeric order and makes each key unique.
+    """
+    if field == "created":
+        return lambda t: (t.created_at, len(t.id), t.id)
+    if field == "updated":
+        return lambda t: (t.updated_at, len(t.id), t.id)
+    if field == "priority":
+        return lambda t: (PRIORITY_RANK[t.priority], len(t.id), t.id)
+    return lambda t: (t.title, len(t.id), t.id)
+
+
+def select_page(
+    todos: Iterable[TodoItem],
+    limit: int,
+    field: str = "created",
+    descending: bool = False,
+    after: Optional[SortKey] = None,
+) -> List[TodoItem]:
+    """Return up to limit of todos ordered by field, starting after key after.
+
+    Streams todos through a heap of size limit, so only one page is held
+    at a time.
+    """
+    key = sort_key(field)
+    if after is not None:
+        if descending:
+            todos = (t for t in todos if key(t) < after)
+        else:
+            todos = (t for t in todos if key(t) > after)
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(limit, todos, key=key)
+
+
+def encode_cursor(order_by: str, key: SortKey) -> str:
+    """Return an opaque cursor resuming after the row with key."""
+    payload = json.dumps([order_by, list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str], order_by: str) -> Optional[SortKey]:
+    """Return the key stored in cursor, or None for the first page.
+
+    Raises:
+        ValueError: If cursor is malformed or was made for another ordering.
+    """
+    if cursor is None:
+        return None
+    try:
+        stored_order, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if stored_order != order_by:
+        raise ValueError(f"Cursor was made for order_by={stored_order!r}")
+    # Keys are (field value, ID length, ID); only priority's value is an int.
+    first = int if order_by.lstrip("-") == "priority" else str
+    if not (
+        isinstance(key, list)
+        and len(key) == 3
+        and all(type(value) is kind for value, kind in zip(key, (first, int, str)))
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
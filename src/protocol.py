@@ -0,0 +1,73 @@
+"""Wire format shared by the todo daemon and its clients.
+
+Every message is a JSON object sent as one frame: a 4-byte big-endian
+length followed by that many bytes of compact UTF-8 JSON.
+
+Requests look like ``{"op": "create_todo", "args": {...}}``. Responses
+are ``{"ok": true, "result": ...}`` or ``{"ok": false, "error": kind,
+"message": ...}``, where kind is one of the ERROR_* constants. Conflict
+errors also carry ``todo_id``, ``expected_version`` and
+``actual_version``.
+"""
+
+import json
+import socket
+import struct
+from typing import Optional
+
+import codec
+
+_LENGTH = struct.Struct("!I")
+# Refuse frames larger than this instead of allocating whatever a peer asks for.
+MAX_MESSAGE = 64 * 1024 * 1024
+
+ERROR_CONFLICT = "conflict"
+ERROR_INVALID = "invalid"
+ERROR_INTERNAL = "internal"
+
+
+class ProtocolError(Exception):
+    """Raised for a malformed, oversized or truncated frame."""
+
+
+def send_message(sock: socket.socket, message: dict) -> None:
+    """Send message as one frame."""
+    body = json.dumps(message, separators=codec.COMPACT_SEPARATORS).encode("utf-8")
+    if len(body) > MAX_MESSAGE:
+        raise ProtocolError(f"Message of {len(body)} bytes exceeds {MAX_MESSAGE}")
+    sock.sendall(_LENGTH.pack(len(body)) + body)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes, or return None if the peer closed first."""
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(min(size - len(buf), 1 << 20))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_message(sock: socket.socket) -> Optional[dict]:
+    """Receive one frame. Returns None if the peer closed the connection.
+
+    Raises ProtocolError if the connection closes mid-frame or the frame
+    is not a JSON object.
+    """
+    header = _recv_exactly(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ProtocolError(f"Frame of {size} bytes exceeds {MAX_MESSAGE}")
+    body = _recv_exactly(sock, size)
+    if body is None:
+        raise ProtocolError("Connection closed in the middle of a frame")
+    try:
+        message = json.loads(body)
+    except ValueError as exc:
+        raise ProtocolError("Frame is not valid JSON") from exc
+    if not isinstance(message, dict):
+        raise ProtocolError("Frame is not a JSON object")
+    return message
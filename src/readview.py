@@ -0,0 +1,139 @@
+"""Immutable in-memory views of the todo set, for lock-free reads."""
+
+import copy
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from models import TodoItem
+from paging import SortKey, select_page
+
+
+class ReadView:
+    """Point-in-time, read-only view of every stored todo.
+
+    A view is never changed once built. Writers derive the next one with
+    ``updated``, which copies the ID map and only the owner lists the
+    write touched (copy-on-write), and publish it by replacing a single
+    reference. A reader that picked up the previous view keeps a
+    consistent picture of it for as long as it likes, without locks.
+
+    ``generation`` is the ChangeCounter value the view reflects and
+    ``token`` the store's data_token at the time, if it has one. The
+    todos inside are shared between views and must never be mutated;
+    every accessor hands out copies.
+    """
+
+    __slots__ = ("generation", "token", "_by_id", "_owners")
+
+    def __init__(
+        self,
+        generation: int,
+        token: Hashable,
+        by_id: Dict[str, TodoItem],
+        owners: Dict[str, Tuple[str, ...]],
+    ):
+        """Initialize from prebuilt maps; use build or updated instead."""
+        self.generation = generation
+        self.token = token
+        self._by_id = by_id
+        self._owners = owners
+
+    @classmethod
+    def build(cls, todos: Iterable[TodoItem], generation: int, token: Hashable = None) -> "ReadView":
+        """Build a view of todos, given in storage order.
+
+        The todos are used as they are, so they must not be mutated
+        afterwards; TodoStore.load_all results qualify.
+        """
+        by_id = {todo.id: todo for todo in todos}
+        owners: Dict[str, List[str]] = {}
+        for todo in by_id.values():
+            owners.setdefault(todo.owner, []).append(todo.id)
+        return cls(generation, token, by_id, {owner: tuple(ids) for owner, ids in owners.items()})
+
+    def updated(
+        self,
+        upserts: Iterable[TodoItem],
+        deletes: Iterable[str],
+        generation: int,
+        token: Hashable = None,
+    ) -> "ReadView":
+        """Return a new view with deletes, then upserts, applied.
+
+        Mirrors TodoStore.apply: upserted todos keep their position, new
+        ones go to the end. The upserts are copied, so callers may keep
+        using them.
+        """
+        by_id = dict(self._by_id)
+        owners = dict(self._owners)
+        touched: Dict[str, Dict[str, None]] = {}
+
+        def ids_of(owner: str) -> Dict[str, None]:
+            if owner not in touched:
+                touched[owner] = dict.fromkeys(owners.get(owner, ()))
+            return touched[owner]
+
+        for todo_id in deletes:
+            old = by_id.pop(todo_id, None)
+            if old is not None:
+                del ids_of(old.owner)[todo_id]
+        for todo in upserts:
+            old = by_id.get(todo.id)
+            if old is None or old.owner != todo.owner:
+                if old is not None:
+                    del ids_of(old.owner)[todo.id]
+                ids_of(todo.owner)[todo.id] = None
+            by_id[todo.id] = copy.copy(todo)
+        for owner, ids in touched.items():
+            if ids:
+                owners[owner] = tuple(ids)
+            else:
+                owners.pop(owner, None)
+        return ReadView(generation, token, by_id, owners)
+
+    def __len__(self) -> int:
+        """Return the number of todos in the view."""
+        return len(self._by_id)
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Return a copy of the todo with the given ID, or None."""
+        todo = self._by_id.get(todo_id)
+        return copy.copy(todo) if todo is not None else None
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Return copies of the todos with the given IDs, keyed by ID."""
+        by_id = self._by_id
+        return {i: copy.copy(by_id[i]) for i in todo_ids if i in by_id}
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Return copies of owner's todos in storage order."""
+        by_id = self._by_id
+        return [copy.copy(by_id[i]) for i in self._owners.get(owner, ())]
+
+    def all(self) -> List[TodoItem]:
+        """Return copies of every todo in storage order."""
+        return [copy.copy(todo) for todo in self._by_id.values()]
+
+    def iter(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Yield copies of every todo, or only owner's, one at a time."""
+        if owner is None:
+            for todo in self._by_id.values():
+                yield copy.copy(todo)
+        else:
+            by_id = self._by_id
+            for todo_id in self._owners.get(owner, ()):
+                yield copy.copy(by_id[todo_id])
+
+    def page(
+        self,
+        owner: Optional[str],
+        limit: int,
+        field: str = "created",
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+    ) -> List[TodoItem]:
+        """Return one page of todos; see TodoStore.page."""
+        if owner is None:
+            todos: Iterable[TodoItem] = self._by_id.values()
+        else:
+            todos = (self._by_id[i] for i in self._owners.get(owner, ()))
+        return [copy.copy(t) for t in select_page(todos, limit, field, descending, after)]
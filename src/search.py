@@ -0,0 +1,158 @@
+"""Inverted full-text index over todo titles and details."""
+
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models import TodoItem
+
+_TOKEN = re.compile(r"\w+")
+
+# Title words count this many times as much as words in the details.
+TITLE_WEIGHT = 2
+
+# BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """Parse query into OR-ed clauses of AND-ed terms.
+
+    Words are AND-ed together; the keyword ``OR`` (or ``|``) separates
+    alternatives, so ``milk bread OR eggs`` matches todos containing both
+    milk and bread, or eggs. Empty clauses are dropped.
+    """
+    clauses: List[List[str]] = [[]]
+    for word in query.split():
+        if word in ("OR", "|"):
+            clauses.append([])
+        else:
+            clauses[-1].extend(tokenize(word))
+    return [clause for clause in clauses if clause]
+
+
+class SearchIndex:
+    """Maps each token to the todos containing it, with term counts.
+
+    Every todo is indexed by the tokens of its title and details (title
+    tokens weighted by TITLE_WEIGHT). A query only touches the postings
+    of its own terms. AND clauses start from the rarest term. When an
+    owner is given and they have fewer todos than that term, the search
+    starts from the owner's todos instead. Results are ranked with BM25.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._docs: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._by_owner: Dict[str, Set[str]] = {}
+        self._total_length = 0
+
+    @classmethod
+    def build(cls, todos: Iterable[TodoItem]) -> "SearchIndex":
+        """Build an index over todos."""
+        index = cls()
+        for todo in todos:
+            index.add(todo)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of indexed todos."""
+        return len(self._docs)
+
+    def add(self, todo: TodoItem) -> None:
+        """Index todo, replacing any earlier version of it."""
+        self.remove(todo.id)
+        counts: Dict[str, int] = {}
+        for token in tokenize(todo.title):
+            counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(todo.details):
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            self._postings.setdefault(token, {})[todo.id] = count
+        length = sum(counts.values())
+        self._docs[todo.id] = (todo.owner, tuple(counts))
+        self._lengths[todo.id] = length
+        self._by_owner.setdefault(todo.owner, set()).add(todo.id)
+        self._total_length += length
+
+    def remove(self, todo_id: str) -> None:
+        """Drop todo_id from the index if present."""
+        doc = self._docs.pop(todo_id, None)
+        if doc is None:
+            return
+        owner, tokens = doc
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[todo_id]
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._lengths.pop(todo_id)
+        ids = self._by_owner[owner]
+        ids.discard(todo_id)
+        if not ids:
+            del self._by_owner[owner]
+
+    def _match(self, terms: List[str], owner: Optional[str]) -> Set[str]:
+        """Return the IDs containing every term (and owned by owner)."""
+        postings = []
+        for term in set(terms):
+            term_postings = self._postings.get(term)
+            if term_postings is None:
+                return set()
+            postings.append(term_postings)
+        postings.sort(key=len)
+        if owner is not None:
+            owned = self._by_owner.get(owner, set())
+            if len(owned) < len(postings[0]):
+                return {i for i in owned if all(i in p for p in postings)}
+        rest = postings[1:]
+        return {
+            i for i in postings[0]
+            if all(i in p for p in rest)
+            and (owner is None or self._docs[i][0] == owner)
+        }
+
+    def _score(self, todo_id: str, terms: Set[str]) -> float:
+        """Return the BM25 score of todo_id for terms."""
+        count = len(self._docs)
+        average = self._total_length / count if count else 0.0
+        norm = _K1 * (1 - _B + _B * self._lengths[todo_id] / (average or 1.0))
+        score = 0.0
+        for term in terms:
+            postings = self._postings.get(term)
+            tf = postings.get(todo_id) if postings else None
+            if tf:
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                score += idf * tf * (_K1 + 1) / (tf + norm)
+        return score
+
+    def search(
+        self,
+        query: str,
+        owner: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return (todo ID, score) pairs matching query, best first.
+
+        See parse_query for the query syntax. Ties are broken by ID.
+        """
+        clauses = parse_query(query)
+        matched: Set[str] = set()
+        for clause in clauses:
+            matched |= self._match(clause, owner)
+        terms = {term for clause in clauses for term in clause}
+        scored = ((self._score(i, terms), i) for i in matched)
+        if limit is None:
+            ranked = sorted(scored, key=lambda s: (-s[0], s[1]))
+        else:
+            ranked = heapq.nsmallest(limit, scored, key=lambda s: (-s[0], s[1]))
+        return [(todo_id, score) for score, todo_id in ranked]
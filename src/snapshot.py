@@ -0,0 +1,93 @@
+"""Binary snapshots of data decoded from a JSON file, for fast cold starts."""
+
+import hashlib
+import marshal
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import metrics
+from locking import atomic_write
+
+# Changed whenever the shape of stored data changes, so old snapshots are
+# rejected rather than misread (2: todo rows gained a version).
+MAGIC = b"TODOSNP2"
+# Marshal output is only guaranteed to load on the same interpreter.
+_TAG = sys.implementation.cache_tag.encode("ascii")[:16].ljust(16, b"\0")
+# magic, interpreter tag, source size, source mtime_ns, source digest
+_HEADER = struct.Struct("<8s16sQQ32s")
+
+
+def digest(content: bytes) -> bytes:
+    """Return the content hash stored in snapshot headers."""
+    return hashlib.sha256(content).digest()
+
+
+class SnapshotCache:
+    """Marshal snapshot of the data decoded from one source file.
+
+    The snapshot sits next to the source (``<source>.snap``) and records
+    the size, mtime and SHA-256 hash of the source content it was built
+    from. ``load`` only returns the data if all three still match the
+    file on disk. Size and mtime give a cheap early reject. The hash,
+    which is checked every time, catches rewrites that keep both. Hashing
+    is several times cheaper than parsing JSON.
+
+    Snapshots are written with locking.atomic_write, so a reader never
+    sees a partial one, even with several processes saving at once.
+    They hold no state of their own: a missing, stale or corrupt
+    snapshot just makes ``load`` return None, and the file can be
+    deleted at any time.
+    """
+
+    def __init__(self, source: Path, path: Optional[Path] = None):
+        """Initialize the cache for source, stored at path if given."""
+        self.source = Path(source)
+        self.path = Path(path) if path else self.source.with_name(self.source.name + ".snap")
+
+    def load(self) -> Optional[Any]:
+        """Return the snapshot data if it matches the source, else None."""
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(_HEADER.size)
+                magic, tag, size, mtime_ns, stored = _HEADER.unpack(header)
+                if magic != MAGIC or tag != _TAG:
+                    return None
+                st = os.stat(self.source)
+                if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                    return None
+                with open(self.source, "rb") as src:
+                    content = src.read()
+                if digest(content) != stored:
+                    return None
+                payload = f.read()
+                if metrics.active is not None:
+                    # The source is read in full too, to check the digest.
+                    metrics.active.record_io(
+                        read=len(content) + len(header) + len(payload), files_read=2
+                    )
+                return marshal.loads(payload)
+        except (OSError, struct.error, EOFError, ValueError, TypeError):
+            return None
+
+    def save(self, data: Any, content: bytes) -> None:
+        """Store data as the decoded form of source content content.
+
+        content must be the bytes data was decoded from (or just written
+        as). If the file has changed since, the snapshot is stored under
+        the current size and mtime, but load will still reject it because
+        the hash does not match.
+        """
+        try:
+            st = os.stat(self.source)
+        except FileNotFoundError:
+            return
+        header = _HEADER.pack(MAGIC, _TAG, st.st_size, st.st_mtime_ns, digest(content))
+        # A cache needs no fsync: a snapshot lost in a crash is just rebuilt.
+        atomic_write(self.path, header + marshal.dumps(data), fsync=False)
+
+    def clear(self) -> None:
+        """Delete the snapshot."""
+        self.path.unlink(missing_ok=True)
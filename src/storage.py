@@ -0,0 +1,1380 @@
+"""Storage backends used by TodoManager to persist todo items."""
+
+import copy
+import json
+import os
+import shutil
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import codec
+import metrics
+from binstore import RecordFile
+from indexes import OwnerIndex
+from jsonstream import iter_array
+from locking import FileLock, atomic_write
+from models import TodoItem, Priority, Status
+from paging import SortKey, select_page
+from snapshot import SnapshotCache
+
+
+class TodoStore:
+    """Base class for todo persistence backends.
+
+    Backends must implement ``load_all`` and ``save_all``. The remaining
+    operations fall back to a full load and rewrite; backends with a
+    better access path override them.
+    """
+
+    filename = ""
+    # True for backends that keep every todo in memory anyway.
+    resident = False
+
+    def __init__(self, data_dir: Path, filename: Optional[str] = None):
+        """Initialize the store for the given data directory.
+
+        Args:
+            data_dir: Directory holding the store's files.
+            filename: Overrides the backend's default file name.
+        """
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / (filename or self.filename)
+        self.cache_stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+    def load_all(self) -> List[TodoItem]:
+        """Return every stored todo.
+
+        The returned list and items may be shared with an internal cache
+        and must not be mutated.
+        """
+        raise NotImplementedError
+
+    def save_all(self, todos: List[TodoItem]) -> None:
+        """Replace the stored todos with the given list."""
+        raise NotImplementedError
+
+    def data_token(self) -> Hashable:
+        """Return a cheap value that changes whenever the stored data does.
+
+        Used to notice changes made behind TodoManager's back, such as a
+        hand-edited file. None means the backend has no cheap way to tell.
+        """
+        return None
+
+    def iter_all(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Yield a copy of every stored todo, or only owner's if given."""
+        for todo in self.load_all():
+            if owner is None or todo.owner == owner:
+                yield copy.copy(todo)
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Return a copy of the todo with the given ID, or None."""
+        for todo in self.load_all():
+            if todo.id == todo_id:
+                return copy.copy(todo)
+        return None
+
+    def get_owned(self, todo_id: str, owner: str) -> Optional[TodoItem]:
+        """Return the todo with the given ID only if it belongs to owner."""
+        todo = self.get(todo_id)
+        if todo is None or todo.owner != owner:
+            return None
+        return todo
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Return copies of all todos belonging to owner."""
+        return [copy.copy(todo) for todo in self.load_all() if todo.owner == owner]
+
+    def add(self, todo: TodoItem) -> None:
+        """Persist a new todo."""
+        self.save_all(self.load_all() + [copy.copy(todo)])
+
+    def replace(self, todo: TodoItem) -> None:
+        """Persist todo in place of the stored one with the same ID.
+
+        The todo keeps its position; it is appended if no todo with that
+        ID exists yet.
+        """
+        todos = list(self.load_all())
+        for idx, existing in enumerate(todos):
+            if existing.id == todo.id:
+                todos[idx] = copy.copy(todo)
+                break
+        else:
+            todos.append(copy.copy(todo))
+        self.save_all(todos)
+
+    def remove(self, todo_id: str) -> bool:
+        """Delete the todo with the given ID. Returns True if it existed."""
+        todos = self.load_all()
+        remaining = [todo for todo in todos if todo.id != todo_id]
+        if len(remaining) == len(todos):
+            return False
+        self.save_all(remaining)
+        return True
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Return copies of the todos with the given IDs, keyed by ID."""
+        wanted = set(todo_ids)
+        return {
+            todo.id: copy.copy(todo)
+            for todo in self.load_all()
+            if todo.id in wanted
+        }
+
+    def apply(self, upserts: List[TodoItem], deletes: Iterable[str] = ()) -> None:
+        """Apply a batch of deletes, then upserts, with one load and one write.
+
+        Upserted todos replace stored ones in place or are appended.
+        """
+        deleted = set(deletes)
+        todos = [todo for todo in self.load_all() if todo.id not in deleted]
+        positions = {todo.id: idx for idx, todo in enumerate(todos)}
+        for todo in upserts:
+            stored = copy.copy(todo)
+            if todo.id in positions:
+                todos[positions[todo.id]] = stored
+            else:
+                positions[todo.id] = len(todos)
+                todos.append(stored)
+        self.save_all(todos)
+
+    def page(
+        self,
+        owner: Optional[str],
+        limit: int,
+        field: str = "created",
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+    ) -> List[TodoItem]:
+        """Return up to limit todos ordered by field, starting after key after.
+
+        Streams iter_all through paging.select_page, so only one page of
+        todos is held at a time.
+
+        Args:
+            owner: Only list this owner's todos if given.
+            limit: Maximum number of todos to return.
+            field: One of paging.ORDERINGS.
+            descending: Order from the largest key down.
+            after: Sort key of the last todo of the previous page.
+        """
+        return select_page(self.iter_all(owner), limit, field, descending, after)
+
+    def compact(self) -> int:
+        """Reclaim space held by dead records. Returns the number reclaimed."""
+        return 0
+
+    def clear_cache(self) -> None:
+        """Drop any in-memory state so the next access re-reads storage."""
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class JsonTodoStore(TodoStore):
+    """Stores all todos as a single JSON array in ``todos.json``.
+
+    Parsed todos stay resident between calls and are only reloaded when
+    the file's inode, size or mtime shows that another process wrote it.
+    Alongside the list, an id -> todo map and an OwnerIndex are kept up to
+    date incrementally, so point and owner lookups on a warm cache do not
+    scan every todo. Both are built in the same pass as the parse, which
+    a cold start has to pay for anyway with this format.
+
+    ``iter_all`` never fills the cache: unless the cache is already warm
+    it parses the file incrementally and yields one todo at a time. With
+    ``resident=False`` the point and owner lookups stream the same way
+    (stopping early where they can), so reads run in constant memory;
+    writes still load the whole file, but drop it again afterwards.
+
+    The file is written compactly; pass ``pretty=True`` to indent it for
+    reading by hand. With ``snapshot=True`` the decoded todos and owner
+    index are also kept in a marshal snapshot (see snapshot), which a
+    cold start loads instead of parsing the JSON while it still matches
+    the file; writes leave it to be refreshed by ``close``.
+    """
+
+    filename = "todos.json"
+
+    def __init__(
+        self,
+        data_dir: Path,
+        filename: Optional[str] = None,
+        resident: bool = True,
+        pretty: bool = False,
+        snapshot: bool = False,
+    ):
+        """Initialize the store with an empty resident cache."""
+        super().__init__(data_dir, filename)
+        self.resident = resident
+        self.pretty = pretty
+        self._snapshot = SnapshotCache(self.path) if snapshot else None
+        self._snapshot_key: Optional[Tuple[int, int, int]] = None
+        self._cache: Optional[List[TodoItem]] = None
+        self._cache_key: Optional[Tuple[int, int, int]] = None
+        self._by_id: Dict[str, TodoItem] = {}
+        self._owners = OwnerIndex()
+
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        """Return (inode, size, mtime_ns) of the todos file, or None if missing."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def data_token(self) -> Hashable:
+        """The file signature; one stat call."""
+        return self._signature()
+
+    def load_all(self) -> List[TodoItem]:
+        """Load all todos, reusing the resident cache when the file is unchanged."""
+        key = self._signature()
+        if self._cache is not None and key == self._cache_key:
+            self.cache_stats["hits"] += 1
+            return self._cache
+        if self._cache is None:
+            self.cache_stats["misses"] += 1
+        else:
+            self.cache_stats["reloads"] += 1
+        todos = []
+        owners = OwnerIndex()
+        if key is not None:
+            todos, owners = self._read(key)
+        self._cache = todos
+        self._cache_key = key
+        self._by_id = {todo.id: todo for todo in todos}
+        self._owners = owners
+        return todos
+
+    def _read(self, key: Tuple[int, int, int]) -> Tuple[List[TodoItem], OwnerIndex]:
+        """Decode the file, through the snapshot when it is enabled and valid."""
+        if self._snapshot is not None:
+            with codec.gc_paused():
+                data = self._snapshot.load()
+                if data is not None:
+                    self._snapshot_key = key
+                    if metrics.active is not None:
+                        metrics.active.record_io(decoded=len(data["rows"]))
+                    return codec.from_rows(data["rows"]), OwnerIndex.from_dict(data["owners"])
+        with open(self.path, "rb") as f:
+            content = f.read()
+        todos = codec.loads(content)
+        if metrics.active is not None:
+            metrics.active.record_io(read=len(content), decoded=len(todos), files_read=1)
+        owners = OwnerIndex.build(todos)
+        if self._snapshot is not None:
+            self._save_snapshot(todos, owners, content)
+            self._snapshot_key = key
+        return todos, owners
+
+    def _save_snapshot(self, todos: List[TodoItem], owners: OwnerIndex, content: bytes) -> None:
+        """Store todos and owners as the decoded form of content."""
+        self._snapshot.save(
+            {"rows": codec.to_rows(todos), "owners": owners.to_dict()}, content
+        )
+
+    def _write(self, todos: List[TodoItem]) -> None:
+        """Atomically replace the JSON file with todos and make them resident."""
+        atomic_write(self.path, codec.dumps(todos, self.pretty))
+        self._cache = todos
+        self._cache_key = self._signature()
+
+    def _written(self) -> None:
+        """Finish a write; a non-resident store lets go of the todos again."""
+        if not self.resident:
+            self.clear_cache()
+
+    def save_all(self, todos: List[TodoItem]) -> None:
+        """Save all todos to the JSON file and rebuild the resident cache."""
+        self._write(todos)
+        self._by_id = {todo.id: todo for todo in todos}
+        self._owners = OwnerIndex.build(todos)
+        self._written()
+
+    def _stream(self) -> Iterator[TodoItem]:
+        """Parse todos from the file one at a time."""
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        decoded = 0
+        with f:
+            try:
+                for item in iter_array(f):
+                    yield TodoItem.from_dict(item)
+                    decoded += 1
+            finally:
+                if metrics.active is not None:
+                    metrics.active.record_io(read=f.buffer.tell(), decoded=decoded, files_read=1)
+
+    def _use_cache(self) -> bool:
+        """Return True if lookups should go through the resident cache."""
+        return self.resident
+
+    def iter_all(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Yield todos from the warm cache, or stream them from the file."""
+        if self.is_cached():
+            if owner is None:
+                todos = self._cache
+            else:
+                todos = [self._by_id[i] for i in self._owners.ids_for(owner)]
+            for todo in todos:
+                yield copy.copy(todo)
+            return
+        for todo in self._stream():
+            if owner is None or todo.owner == owner:
+                yield todo
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Return a copy of the todo with the given ID, or None."""
+        if not self._use_cache():
+            return next((t for t in self._stream() if t.id == todo_id), None)
+        self.load_all()
+        todo = self._by_id.get(todo_id)
+        return copy.copy(todo) if todo is not None else None
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Return copies of owner's todos via the owner index."""
+        if not self._use_cache():
+            return list(self.iter_all(owner))
+        self.load_all()
+        return [copy.copy(self._by_id[i]) for i in self._owners.ids_for(owner)]
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Return copies of the todos with the given IDs via the id map."""
+        if not self._use_cache():
+            wanted = set(todo_ids)
+            return {t.id: t for t in self._stream() if t.id in wanted}
+        self.load_all()
+        found = {}
+        for todo_id in todo_ids:
+            todo = self._by_id.get(todo_id)
+            if todo is not None:
+                found[todo_id] = copy.copy(todo)
+        return found
+
+    def add(self, todo: TodoItem) -> None:
+        """Append a new todo and index it."""
+        stored = copy.copy(todo)
+        self._write(self.load_all() + [stored])
+        self._by_id[stored.id] = stored
+        self._owners.add(stored.id, stored.owner)
+        self._written()
+
+    def replace(self, todo: TodoItem) -> None:
+        """Replace the stored todo in place and re-index it."""
+        todos = list(self.load_all())
+        stored = copy.copy(todo)
+        old = self._by_id.get(todo.id)
+        if old is None:
+            todos.append(stored)
+        else:
+            todos[next(i for i, t in enumerate(todos) if t is old)] = stored
+        self._write(todos)
+        self._by_id[stored.id] = stored
+        self._owners.add(stored.id, stored.owner)
+        self._written()
+
+    def remove(self, todo_id: str) -> bool:
+        """Delete the todo with the given ID and drop it from the indexes."""
+        todos = self.load_all()
+        old = self._by_id.get(todo_id)
+        if old is None:
+            return False
+        self._write([t for t in todos if t is not old])
+        del self._by_id[todo_id]
+        self._owners.remove(todo_id)
+        self._written()
+        return True
+
+    def is_cached(self) -> bool:
+        """Return True if the resident cache matches the file on disk."""
+        return self._cache is not None and self._signature() == self._cache_key
+
+    def clear_cache(self) -> None:
+        """Drop the resident todo cache."""
+        self._cache = None
+        self._cache_key = None
+        self._by_id = {}
+        self._owners = OwnerIndex()
+
+    def close(self) -> None:
+        """Refresh the snapshot if writes since it was made left it stale."""
+        if (
+            self._snapshot is None
+            or self._cache is None
+            or self._cache_key == self._snapshot_key
+        ):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+        if metrics.active is not None:
+            metrics.active.record_io(read=len(content), files_read=1)
+        # Only snapshot the resident todos if they are what the file holds.
+        if self._signature() == self._cache_key:
+            self._save_snapshot(self._cache, self._owners, content)
+            self._snapshot_key = self._cache_key
+
+
+class JsonlTodoStore(TodoStore):
+    """Append-only JSON-Lines store in ``todos.jsonl``.
+
+    Creates and updates append the full record and deletes append a
+    ``{"id": ..., "deleted": true}`` tombstone; a later line supersedes
+    earlier ones with the same ID. An in-memory id -> byte offset index
+    lets point lookups seek straight to the live record, and an
+    OwnerIndex does the same for owner lookups. The indexes are caught up
+    incrementally when the file grows, so appends made by other processes
+    are picked up without a full rescan.
+
+    The indexes are checkpointed to ``todos.jsonl.idx`` every
+    ``checkpoint_lines`` appended lines and on close. A cold start loads
+    the checkpoint and only scans the lines appended after it; the
+    checkpoint is ignored once the log has been rewritten.
+
+    Once at least ``compact_min_lines`` lines exist and the share of dead
+    lines exceeds ``compact_ratio``, the file is rewritten with only the
+    live records.
+    """
+
+    filename = "todos.jsonl"
+
+    def __init__(
+        self,
+        data_dir: Path,
+        compact_ratio: float = 0.5,
+        compact_min_lines: int = 1000,
+        checkpoint_lines: int = 1000,
+    ):
+        """Initialize the store; the indexes are loaded on first access."""
+        super().__init__(data_dir)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.compact_ratio = compact_ratio
+        self.compact_min_lines = compact_min_lines
+        self.checkpoint_lines = checkpoint_lines
+        self._offsets: Dict[str, int] = {}
+        self._owners = OwnerIndex()
+        self._lines = 0
+        self._indexed_size = 0
+        self._inode: Optional[int] = None
+        self._checkpointed_lines = 0
+
+    def _reset_index(self, inode: Optional[int]) -> None:
+        """Forget the offset and owner indexes."""
+        self._offsets = {}
+        self._owners = OwnerIndex()
+        self._lines = 0
+        self._indexed_size = 0
+        self._inode = inode
+        self._checkpointed_lines = 0
+
+    def _load_checkpoint(self, st: os.stat_result) -> bool:
+        """Adopt the index checkpoint if it describes a prefix of the log."""
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        if data.get("inode") != st.st_ino or data.get("size", 0) > st.st_size:
+            return False
+        self._offsets = data["offsets"]
+        self._owners = OwnerIndex.from_dict(data["owners"])
+        self._lines = data["lines"]
+        self._indexed_size = data["size"]
+        self._inode = st.st_ino
+        self._checkpointed_lines = self._lines
+        return True
+
+    def _save_checkpoint(self) -> None:
+        """Persist the indexes next to the log."""
+        if self._inode is None:
+            return
+        data = {
+            "inode": self._inode,
+            "size": self._indexed_size,
+            "lines": self._lines,
+            "offsets": self._offsets,
+            "owners": self._owners.to_dict(),
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=codec.COMPACT_SEPARATORS)
+        os.replace(tmp_path, self.index_path)
+        self._checkpointed_lines = self._lines
+
+    def _refresh(self) -> None:
+        """Bring the offset index up to date with the file on disk."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset_index(None)
+            return
+        if st.st_ino != self._inode or st.st_size < self._indexed_size:
+            # Missing index, or the file was rewritten (e.g. compacted).
+            if self._inode is None:
+                self.cache_stats["misses"] += 1
+            else:
+                self.cache_stats["reloads"] += 1
+            self._reset_index(None)
+            if not self._load_checkpoint(st):
+                self._inode = st.st_ino
+            if st.st_size == self._indexed_size:
+                return
+        elif st.st_size == self._indexed_size:
+            self.cache_stats["hits"] += 1
+            return
+        self._scan_from(self._indexed_size)
+
+    def _scan_from(self, start: int) -> None:
+        """Index every complete line from byte offset start onwards."""
+        offset = start
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A writer is still appending this line.
+                    break
+                record = json.loads(line)
+                todo_id = record["id"]
+                if record.get("deleted"):
+                    self._offsets.pop(todo_id, None)
+                    self._owners.remove(todo_id)
+                else:
+                    self._offsets[todo_id] = offset
+                    self._owners.add(todo_id, record.get("owner", ""))
+                self._lines += 1
+                offset += len(line)
+        self._indexed_size = offset
+        if metrics.active is not None:
+            metrics.active.record_io(read=offset - start, files_read=int(start == 0))
+
+    @staticmethod
+    def _read_at(f, offset: int) -> TodoItem:
+        """Decode the record stored at offset in the open file f."""
+        f.seek(offset)
+        line = f.readline()
+        if metrics.active is not None:
+            metrics.active.record_io(read=len(line), decoded=1)
+        return TodoItem.from_dict(json.loads(line))
+
+    def load_all(self) -> List[TodoItem]:
+        """Return all live todos in creation order."""
+        self._refresh()
+        if not self._offsets:
+            return []
+        with open(self.path, "rb") as f:
+            return [self._read_at(f, offset) for offset in self._offsets.values()]
+
+    def iter_all(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Decode live records one at a time, only owner's if given."""
+        self._refresh()
+        if owner is None:
+            offsets = list(self._offsets.values())
+        else:
+            offsets = [self._offsets[i] for i in self._owners.ids_for(owner)]
+        if not offsets:
+            return
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                yield self._read_at(f, offset)
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Seek to and decode the live record for todo_id."""
+        self._refresh()
+        offset = self._offsets.get(todo_id)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            return self._read_at(f, offset)
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Seek to and decode the records listed for owner in the owner index."""
+        self._refresh()
+        ids = self._owners.ids_for(owner)
+        if not ids:
+            return []
+        with open(self.path, "rb") as f:
+            return [self._read_at(f, self._offsets[todo_id]) for todo_id in ids]
+
+    def _append(self, records: List[dict]) -> None:
+        """Append records to the log and index them."""
+        data = "".join(
+            json.dumps(record, separators=codec.COMPACT_SEPARATORS) + "\n" for record in records
+        )
+        with open(self.path, "ab") as f:
+            f.write(data.encode("utf-8"))
+        self._refresh()
+        if (
+            self._lines >= self.compact_min_lines
+            and self.garbage_ratio() > self.compact_ratio
+        ):
+            self.compact()
+        elif self._lines - self._checkpointed_lines >= self.checkpoint_lines:
+            self._save_checkpoint()
+
+    def add(self, todo: TodoItem) -> None:
+        """Append a new todo record."""
+        self._append([todo.to_dict()])
+
+    def replace(self, todo: TodoItem) -> None:
+        """Append a record superseding the stored todo."""
+        self._append([todo.to_dict()])
+
+    def remove(self, todo_id: str) -> bool:
+        """Append a tombstone for todo_id if it is live."""
+        self._refresh()
+        if todo_id not in self._offsets:
+            return False
+        self._append([{"id": todo_id, "deleted": True}])
+        return True
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Seek to and decode the live record of each requested ID."""
+        self._refresh()
+        offsets = {i: self._offsets[i] for i in todo_ids if i in self._offsets}
+        if not offsets:
+            return {}
+        with open(self.path, "rb") as f:
+            return {i: self._read_at(f, offset) for i, offset in offsets.items()}
+
+    def apply(self, upserts: List[TodoItem], deletes: Iterable[str] = ()) -> None:
+        """Append tombstones and superseding records in a single write."""
+        self._refresh()
+        records = [
+            {"id": todo_id, "deleted": True}
+            for todo_id in dict.fromkeys(deletes)
+            if todo_id in self._offsets
+        ]
+        records.extend(todo.to_dict() for todo in upserts)
+        if records:
+            self._append(records)
+
+    def save_all(self, todos: List[TodoItem]) -> None:
+        """Atomically rewrite the log with exactly the given todos."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        offsets: Dict[str, int] = {}
+        offset = 0
+        with open(tmp_path, "wb") as f:
+            for todo in todos:
+                line = (
+                    json.dumps(todo.to_dict(), separators=codec.COMPACT_SEPARATORS) + "\n"
+                ).encode("utf-8")
+                f.write(line)
+                offsets[todo.id] = offset
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._reset_index(os.stat(self.path).st_ino)
+        self._offsets = offsets
+        self._owners = OwnerIndex.build(todos)
+        self._lines = len(todos)
+        self._indexed_size = offset
+        self._save_checkpoint()
+
+    def garbage_ratio(self) -> float:
+        """Return the share of lines that are superseded or tombstones."""
+        self._refresh()
+        if not self._lines:
+            return 0.0
+        return (self._lines - len(self._offsets)) / self._lines
+
+    def compact(self) -> int:
+        """Rewrite the log with only live records. Returns lines reclaimed."""
+        live = self.load_all()
+        reclaimed = self._lines - len(live)
+        if reclaimed:
+            self.save_all(live)
+        return reclaimed
+
+    def clear_cache(self) -> None:
+        """Drop the in-memory indexes; they are reloaded on next access."""
+        self._reset_index(None)
+
+    def close(self) -> None:
+        """Checkpoint the indexes if lines were indexed since the last one."""
+        if self._lines != self._checkpointed_lines:
+            self._save_checkpoint()
+
+
+class SqliteTodoStore(TodoStore):
+    """Stores todos in an SQLite database, ``todos.db``.
+
+    The database runs in WAL mode so readers never block the writer.
+    Owner lookups use the ``(owner, seq)`` index, which also returns rows
+    in creation order, and ID lookups use the unique index on ``id``.
+    All statements are fixed, parameterized SQL so sqlite3 reuses its
+    prepared statements across calls. The connection may be used from
+    any thread; TodoManager serializes access to it.
+    """
+
+    filename = "todos.db"
+
+    _COLUMNS = (
+        "id, title, details, priority, status, owner, created_at, updated_at, version"
+    )
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS todos (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            details TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_todos_owner ON todos (owner, seq);
+        CREATE INDEX IF NOT EXISTS idx_todos_owner_status ON todos (owner, status);
+        CREATE INDEX IF NOT EXISTS idx_todos_priority ON todos (priority);
+    """
+    _SELECT = f"SELECT {_COLUMNS} FROM todos"
+    _INSERT = f"INSERT INTO todos ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    _UPSERT = (
+        _INSERT
+        + " ON CONFLICT (id) DO UPDATE SET title = excluded.title,"
+        " details = excluded.details, priority = excluded.priority,"
+        " status = excluded.status, owner = excluded.owner,"
+        " created_at = excluded.created_at, updated_at = excluded.updated_at,"
+        " version = excluded.version"
+    )
+
+    def __init__(self, data_dir: Path):
+        """Open (creating if needed) the database in data_dir."""
+        super().__init__(data_dir)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(todos)")}
+        if "version" not in columns:
+            # Databases created before versioning; existing rows become version 1.
+            with self._conn:
+                self._conn.execute(
+                    "ALTER TABLE todos ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+                )
+
+    @staticmethod
+    def _row(todo: TodoItem) -> tuple:
+        """Convert a todo into a row tuple in column order."""
+        return (
+            todo.id,
+            todo.title,
+            todo.details,
+            todo.priority.value,
+            todo.status.value,
+            todo.owner,
+            todo.created_at,
+            todo.updated_at,
+            todo.version,
+        )
+
+    @staticmethod
+    def _todo(row: tuple) -> TodoItem:
+        """Convert a row tuple into a TodoItem."""
+        return TodoItem(
+            id=row[0],
+            title=row[1],
+            details=row[2],
+            priority=Priority(row[3]),
+            status=Status(row[4]),
+            owner=row[5],
+            created_at=row[6],
+            updated_at=row[7],
+            version=row[8],
+        )
+
+    def load_all(self) -> List[TodoItem]:
+        """Return all todos in creation order."""
+        rows = self._conn.execute(self._SELECT + " ORDER BY seq")
+        return [self._todo(row) for row in rows]
+
+    def iter_all(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Stream rows from a cursor, using the owner index if owner is given."""
+        if owner is None:
+            rows = self._conn.execute(self._SELECT + " ORDER BY seq")
+        else:
+            rows = self._conn.execute(
+                self._SELECT + " WHERE owner = ? ORDER BY seq", (owner,)
+            )
+        for row in rows:
+            yield self._todo(row)
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Look up a todo through the unique ID index."""
+        row = self._conn.execute(self._SELECT + " WHERE id = ?", (todo_id,)).fetchone()
+        return self._todo(row) if row else None
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Look up an owner's todos through the owner index."""
+        rows = self._conn.execute(
+            self._SELECT + " WHERE owner = ? ORDER BY seq", (owner,)
+        )
+        return [self._todo(row) for row in rows]
+
+    def add(self, todo: TodoItem) -> None:
+        """Insert a new todo."""
+        with self._conn:
+            self._conn.execute(self._INSERT, self._row(todo))
+
+    def replace(self, todo: TodoItem) -> None:
+        """Update the todo in place, inserting it if it does not exist."""
+        with self._conn:
+            self._conn.execute(self._UPSERT, self._row(todo))
+
+    def remove(self, todo_id: str) -> bool:
+        """Delete the todo with the given ID."""
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
+        return cursor.rowcount > 0
+
+    def save_all(self, todos: List[TodoItem]) -> None:
+        """Replace the table contents with todos in one transaction."""
+        with self._conn:
+            self._conn.execute("DELETE FROM todos")
+            self._conn.executemany(self._INSERT, (self._row(t) for t in todos))
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Look the IDs up through the ID index, a few hundred at a time."""
+        ids = list(dict.fromkeys(todo_ids))
+        found = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._conn.execute(
+                self._SELECT + f" WHERE id IN ({placeholders})", chunk
+            )
+            for row in rows:
+                found[row[0]] = self._todo(row)
+        return found
+
+    def apply(self, upserts: List[TodoItem], deletes: Iterable[str] = ()) -> None:
+        """Apply deletes and upserts in one transaction."""
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM todos WHERE id = ?", ((i,) for i in deletes)
+            )
+            self._conn.executemany(self._UPSERT, (self._row(t) for t in upserts))
+
+    _ORDER_COLUMNS = {
+        "created": "created_at",
+        "updated": "updated_at",
+        "priority": "CASE priority WHEN 'HIGH' THEN 0 WHEN 'MID' THEN 1 ELSE 2 END",
+        "title": "title",
+    }
+
+    def page(
+        self,
+        owner: Optional[str],
+        limit: int,
+        field: str = "created",
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+    ) -> List[TodoItem]:
+        """Fetch the page with an ORDER BY ... LIMIT query seeking past after."""
+        column = self._ORDER_COLUMNS[field]
+        direction = "DESC" if descending else "ASC"
+        clauses = []
+        params: list = []
+        if owner is not None:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if after is not None:
+            clauses.append(f"({column}, length(id), id) {'<' if descending else '>'} (?, ?, ?)")
+            params.extend(after)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            self._SELECT + where
+            + f" ORDER BY {column} {direction}, length(id) {direction}, id {direction}"
+            + " LIMIT ?",
+            params + [limit],
+        )
+        return [self._todo(row) for row in rows]
+
+    def insert_rows(self, todos: Iterable[TodoItem]) -> int:
+        """Insert todos in one transaction. Returns the number inserted."""
+        with self._conn:
+            cursor = self._conn.executemany(
+                self._INSERT, (self._row(t) for t in todos)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+class ShardedTodoStore(TodoStore):
+    """Spreads todos over JSON shard files under ``shards/``.
+
+    Each owner is hashed (CRC-32) into one of ``buckets`` shards, and every
+    shard is a regular ``todos.json``-style file managed by its own
+    JsonTodoStore. A write only rewrites the shard holding that owner, so
+    its cost scales with the owner's bucket rather than the whole install.
+    The bucket count is fixed when the directory is created and recorded
+    in ``shards/meta.json``.
+
+    Lookups by ID alone go to the shard the ID was last seen in through
+    this store, and only search the shards one by one for IDs it has not
+    seen yet (or that another process moved or deleted).
+    """
+
+    filename = "shards"
+
+    def __init__(self, data_dir: Path, buckets: int = 64, resident: bool = True):
+        """Open the shard directory, creating it with the given bucket count."""
+        super().__init__(data_dir)
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            with open(meta_path, "r") as f:
+                buckets = json.load(f)["buckets"]
+        else:
+            self.path.mkdir(exist_ok=True)
+            with open(meta_path, "w") as f:
+                json.dump({"buckets": buckets}, f)
+        self.buckets = buckets
+        # Shards may each stay resident, but only the ones touched are
+        # loaded, so the store as a whole is not: it keeps resident False.
+        self._shards = [
+            JsonTodoStore(self.path, shard_filename(n), resident=resident)
+            for n in range(buckets)
+        ]
+        # All shards share one set of counters.
+        for shard in self._shards:
+            shard.cache_stats = self.cache_stats
+        # Last shard each ID was seen in; checked before it is relied on.
+        self._located: Dict[str, int] = {}
+
+    def shard_for(self, owner: str) -> JsonTodoStore:
+        """Return the shard holding owner's todos."""
+        return self._shards[shard_index(owner, self.buckets)]
+
+    def _find_index(self, todo_id: str) -> Optional[int]:
+        """Return the number of the shard holding todo_id, or None."""
+        hint = self._located.get(todo_id)
+        if hint is not None and self._shards[hint].get(todo_id) is not None:
+            return hint
+        for n, shard in enumerate(self._shards):
+            if n != hint and shard.path.exists() and shard.get(todo_id) is not None:
+                self._located[todo_id] = n
+                return n
+        self._located.pop(todo_id, None)
+        return None
+
+    def _find(self, todo_id: str) -> Optional[JsonTodoStore]:
+        """Return the shard holding todo_id, or None."""
+        n = self._find_index(todo_id)
+        return self._shards[n] if n is not None else None
+
+    def load_all(self) -> List[TodoItem]:
+        """Return the todos of every shard, shard by shard."""
+        todos: List[TodoItem] = []
+        for shard in self._shards:
+            if shard.path.exists():
+                todos.extend(shard.load_all())
+        return todos
+
+    def iter_all(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Stream todos shard by shard, or only from owner's shard."""
+        if owner is not None:
+            yield from self.shard_for(owner).iter_all(owner)
+            return
+        for shard in self._shards:
+            yield from shard.iter_all()
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Look todo_id up in each shard in turn."""
+        shard = self._find(todo_id)
+        return shard.get(todo_id) if shard is not None else None
+
+    def get_owned(self, todo_id: str, owner: str) -> Optional[TodoItem]:
+        """Look todo_id up in owner's shard only."""
+        n = shard_index(owner, self.buckets)
+        todo = self._shards[n].get(todo_id)
+        if todo is None or todo.owner != owner:
+            return None
+        self._located[todo_id] = n
+        return todo
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Return owner's todos from their shard."""
+        n = shard_index(owner, self.buckets)
+        todos = self._shards[n].by_owner(owner)
+        for todo in todos:
+            self._located[todo.id] = n
+        return todos
+
+    def add(self, todo: TodoItem) -> None:
+        """Add todo to its owner's shard."""
+        n = shard_index(todo.owner, self.buckets)
+        self._shards[n].add(todo)
+        self._located[todo.id] = n
+
+    def replace(self, todo: TodoItem) -> None:
+        """Replace todo, moving it between shards if its owner changed."""
+        n = shard_index(todo.owner, self.buckets)
+        target = self._shards[n]
+        if target.get(todo.id) is None:
+            source = self._find(todo.id)
+            if source is not None:
+                source.remove(todo.id)
+        target.replace(todo)
+        self._located[todo.id] = n
+
+    def remove(self, todo_id: str) -> bool:
+        """Delete todo_id from whichever shard holds it."""
+        shard = self._find(todo_id)
+        self._located.pop(todo_id, None)
+        return shard.remove(todo_id) if shard is not None else False
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Look each ID up across the shards."""
+        found = {}
+        for todo_id in todo_ids:
+            todo = self.get(todo_id)
+            if todo is not None:
+                found[todo_id] = todo
+        return found
+
+    def apply(self, upserts: List[TodoItem], deletes: Iterable[str] = ()) -> None:
+        """Apply the batch with one write per touched shard."""
+        deletes = list(deletes)
+        shard_upserts: Dict[int, List[TodoItem]] = {}
+        shard_deletes: Dict[int, List[str]] = {}
+        for todo_id in deletes:
+            n = self._find_index(todo_id)
+            if n is not None:
+                shard_deletes.setdefault(n, []).append(todo_id)
+        for todo in upserts:
+            n = shard_index(todo.owner, self.buckets)
+            if self._shards[n].get(todo.id) is None:
+                # New todo, or its owner moved it to another shard.
+                source = self._find_index(todo.id)
+                if source is not None:
+                    shard_deletes.setdefault(source, []).append(todo.id)
+            shard_upserts.setdefault(n, []).append(todo)
+        for n in sorted(set(shard_upserts) | set(shard_deletes)):
+            self._shards[n].apply(shard_upserts.get(n, []), shard_deletes.get(n, []))
+        for todo_id in deletes:
+            self._located.pop(todo_id, None)
+        for n, todos in shard_upserts.items():
+            for todo in todos:
+                self._located[todo.id] = n
+
+    def save_all(self, todos: List[TodoItem]) -> None:
+        """Rewrite every shard with its share of todos."""
+        grouped: List[List[TodoItem]] = [[] for _ in range(self.buckets)]
+        for todo in todos:
+            grouped[shard_index(todo.owner, self.buckets)].append(todo)
+        for shard, shard_todos in zip(self._shards, grouped):
+            if shard_todos or shard.path.exists():
+                shard.save_all(shard_todos)
+
+    def clear_cache(self) -> None:
+        """Drop every shard's resident cache."""
+        for shard in self._shards:
+            shard.clear_cache()
+        self._located = {}
+
+
+class BinaryTodoStore(TodoStore):
+    """Stores todos as binary records in a memory-mapped ``todos.bin``.
+
+    The file carries its own open-addressing hash table from ID to record
+    offset (see binstore), so looking a todo up by ID probes a few slots
+    and decodes a single record, whatever the number stored. Updates
+    append a new record and repoint the slot; ``compact`` drops the dead
+    ones. Owner lookups go through an OwnerIndex built from the record
+    headers on first use and rebuilt whenever another handle writes.
+    """
+
+    filename = "todos.bin"
+
+    def __init__(self, data_dir: Path, slot_count: int = 1024):
+        """Open (creating if needed) the record file in data_dir."""
+        super().__init__(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._file = RecordFile(self.path, slot_count)
+        self._owners: Optional[OwnerIndex] = None
+        self._owners_generation = -1
+
+    @staticmethod
+    def _encode(todo: TodoItem) -> bytes:
+        """Serialize todo into a record value."""
+        return json.dumps(todo.to_dict(), separators=codec.COMPACT_SEPARATORS).encode("utf-8")
+
+    @staticmethod
+    def _decode(value: bytes) -> TodoItem:
+        """Deserialize a record value."""
+        return TodoItem.from_dict(json.loads(value))
+
+    def _owner_index(self) -> OwnerIndex:
+        """Return the owner index, rebuilding it if the file changed."""
+        generation = self._file.generation
+        if self._owners is None or generation != self._owners_generation:
+            index = OwnerIndex()
+            for entry in self._file.scan():
+                index.add(entry.key, entry.group)
+            self.cache_stats["misses" if self._owners is None else "reloads"] += 1
+            self._owners = index
+            self._owners_generation = generation
+        else:
+            self.cache_stats["hits"] += 1
+        return self._owners
+
+    def _put(self, todo: TodoItem) -> None:
+        """Write todo and keep a current owner index current."""
+        current = self._owners is not None and self._file.generation == self._owners_generation
+        self._file.put(todo.id, todo.owner, self._encode(todo))
+        if current:
+            self._owners.add(todo.id, todo.owner)
+            self._owners_generation = self._file.generation
+
+    def load_all(self) -> List[TodoItem]:
+        """Decode every record in insertion order."""
+        return list(self.iter_all())
+
+    def iter_all(self, owner: Optional[str] = None) -> Iterator[TodoItem]:
+        """Decode records one at a time, only owner's if given."""
+        if owner is not None:
+            for todo_id in self._owner_index().ids_for(owner):
+                todo = self.get(todo_id)
+                if todo is not None:
+                    yield todo
+            return
+        for value in self._file.iter_values(self._file.scan()):
+            yield self._decode(value)
+
+    def get(self, todo_id: str) -> Optional[TodoItem]:
+        """Look todo_id up through the on-disk hash table."""
+        value = self._file.get(todo_id)
+        return self._decode(value) if value is not None else None
+
+    def by_owner(self, owner: str) -> List[TodoItem]:
+        """Return owner's todos through the owner index."""
+        return list(self.iter_all(owner))
+
+    def add(self, todo: TodoItem) -> None:
+        """Append a record for a new todo."""
+        self._put(todo)
+
+    def replace(self, todo: TodoItem) -> None:
+        """Append a new version of todo; it keeps its original position."""
+        self._put(todo)
+
+    def remove(self, todo_id: str) -> bool:
+        """Tombstone todo_id's slot."""
+        current = self._owners is not None and self._file.generation == self._owners_generation
+        removed = self._file.delete(todo_id)
+        if removed and current:
+            self._owners.remove(todo_id)
+            self._owners_generation = self._file.generation
+        return removed
+
+    def get_many(self, todo_ids: Iterable[str]) -> Dict[str, TodoItem]:
+        """Look each ID up through the hash table."""
+        found = {}
+        for todo_id in todo_ids:
+            todo = self.get(todo_id)
+            if todo is not None:
+                found[todo_id] = todo
+        return found
+
+    def apply(self, upserts: List[TodoItem], deletes: Iterable[str] = ()) -> None:
+        """Tombstone the deletes, then append the upserts."""
+        for todo_id in deletes:
+            self.remove(todo_id)
+        for todo in upserts:
+            self._put(todo)
+
+    def save_all(self, todos: List[TodoItem]) -> None:
+        """Rewrite the file with exactly todos."""
+        self._file.rewrite((t.id, t.owner, self._encode(t)) for t in todos)
+        self._owners = None
+
+    def garbage_ratio(self) -> float:
+        """Return the fraction of records that are dead."""
+        header = self._file.header()
+        total = header.live + header.garbage
+        return header.garbage / total if total else 0.0
+
+    def compact(self) -> int:
+        """Rewrite the file without dead records."""
+        reclaimed = self._file.compact()
+        self._owners = None
+        return reclaimed
+
+    def clear_cache(self) -> None:
+        """Drop the owner index."""
+        self._owners = None
+
+    def close(self) -> None:
+        """Unmap and close the record file."""
+        self._file.close()
+
+
+STORAGE_BACKENDS = {
+    "json": JsonTodoStore,
+    "jsonl": JsonlTodoStore,
+    "sqlite": SqliteTodoStore,
+    "sharded": ShardedTodoStore,
+    "binary": BinaryTodoStore,
+}
+
+
+def shard_index(owner: str, buckets: int) -> int:
+    """Return the bucket owner hashes into; stable across processes."""
+    return zlib.crc32(owner.encode("utf-8")) % buckets
+
+
+def shard_filename(index: int) -> str:
+    """Return the file name of shard number index."""
+    return f"todos-{index:03d}.json"
+
+
+def detect_storage(data_dir: Path) -> str:
+    """Return the storage kind already in use in data_dir.
+
+    Falls back to ``json`` for an empty directory.
+    """
+    for kind, backend in STORAGE_BACKENDS.items():
+        if kind != "json" and (Path(data_dir) / backend.filename).exists():
+            return kind
+    return "json"
+
+
+def open_store(kind: str, data_dir: Path, **options) -> TodoStore:
+    """Create the storage backend named kind for data_dir."""
+    try:
+        backend = STORAGE_BACKENDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend: {kind}") from None
+    return backend(data_dir, **options)
+
+
+@contextmanager
+def _exclusive(data_dir: Path) -> Iterator[None]:
+    """Hold data_dir's todos.lock exclusively, as TodoManager's writes do."""
+    lock = FileLock(data_dir / "todos.lock")
+    try:
+        with lock.exclusive():
+            yield
+    finally:
+        lock.close()
+
+
+def migrate_json_to_sqlite(data_dir: Path, batch_size: int = 1000) -> int:
+    """Import todos.json in data_dir into a new SQLite store.
+
+    The JSON array is streamed and inserted in batches, so the whole file
+    is never held in memory. On success todos.json is renamed to
+    ``todos.json.migrated`` and the directory is served by the SQLite
+    backend from then on. todos.lock is held exclusively throughout, so
+    no TodoManager write can land in todos.json while it is copied.
+
+    Args:
+        data_dir: Data directory holding todos.json.
+        batch_size: Number of todos inserted per transaction.
+
+    Returns:
+        The number of todos imported.
+
+    Raises:
+        FileNotFoundError: If data_dir has no todos.json.
+        FileExistsError: If data_dir already has a todos.db.
+    """
+    data_dir = Path(data_dir)
+    with _exclusive(data_dir):
+        source = data_dir / JsonTodoStore.filename
+        target = data_dir / SqliteTodoStore.filename
+        if not source.exists():
+            raise FileNotFoundError(source)
+        if target.exists():
+            raise FileExistsError(target)
+
+        store = SqliteTodoStore(data_dir)
+        imported = 0
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                batch: List[TodoItem] = []
+                for item in iter_array(f):
+                    batch.append(TodoItem.from_dict(item))
+                    if len(batch) >= batch_size:
+                        imported += store.insert_rows(batch)
+                        batch = []
+                if batch:
+                    imported += store.insert_rows(batch)
+        except BaseException:
+            store.close()
+            for suffix in ("", "-wal", "-shm"):
+                Path(str(target) + suffix).unlink(missing_ok=True)
+            raise
+        store.close()
+        os.replace(source, source.with_name(source.name + ".migrated"))
+        return imported
+
+
+def migrate_json_to_sharded(data_dir: Path, buckets: int = 64) -> int:
+    """Split todos.json in data_dir into a new sharded store.
+
+    Todos are streamed from the source and written straight into their
+    shard files, so memory use does not grow with the dataset. The shards
+    are built in a temporary directory and moved into place at the end;
+    todos.json is then renamed to ``todos.json.migrated``. Like
+    migrate_json_to_sqlite it holds todos.lock exclusively throughout.
+
+    Returns:
+        The number of todos migrated.
+
+    Raises:
+        FileNotFoundError: If data_dir has no todos.json.
+        FileExistsError: If data_dir already has a shards directory.
+    """
+    data_dir = Path(data_dir)
+    with _exclusive(data_dir):
+        source = data_dir / JsonTodoStore.filename
+        target = data_dir / ShardedTodoStore.filename
+        if not source.exists():
+            raise FileNotFoundError(source)
+        if target.exists():
+            raise FileExistsError(target)
+
+        tmp_dir = data_dir / (ShardedTodoStore.filename + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+        files = [open(tmp_dir / shard_filename(n), "w") for n in range(buckets)]
+        counts = [0] * buckets
+        try:
+            for f in files:
+                f.write("[")
+            with open(source, "r", encoding="utf-8") as src:
+                for item in iter_array(src):
+                    todo = TodoItem.from_dict(item)
+                    n = shard_index(todo.owner, buckets)
+                    files[n].write(",\n" if counts[n] else "\n")
+                    files[n].write(json.dumps(todo.to_dict(), separators=codec.COMPACT_SEPARATORS))
+                    counts[n] += 1
+            for f in files:
+                f.write("\n]\n")
+        except BaseException:
+            for f in files:
+                f.close()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        for f in files:
+            f.close()
+        with open(tmp_dir / "meta.json", "w") as f:
+            json.dump({"buckets": buckets}, f)
+        os.replace(tmp_dir, target)
+        os.replace(source, source.with_name(source.name + ".migrated"))
+        return sum(counts)
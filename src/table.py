@@ -0,0 +1,280 @@
+"""Columnar, NumPy-backed view of todo data for reporting."""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from models import Priority, Status, TodoItem
+
+PRIORITIES: Tuple[Priority, ...] = tuple(Priority)
+STATUSES: Tuple[Status, ...] = tuple(Status)
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(PRIORITIES)}
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Timestamps that cannot be parsed sort before every real one.
+MISSING_TIMESTAMP = -(2 ** 63)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+TimeBound = Union[str, datetime, None]
+
+
+def epoch_us(value: Union[str, datetime]) -> int:
+    """Return an ISO-8601 string or datetime as microseconds since the epoch.
+
+    Naive values are taken as-is; aware values are converted to UTC first.
+    Unparseable strings map to MISSING_TIMESTAMP.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return MISSING_TIMESTAMP
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _bound_us(value: Union[str, datetime]) -> int:
+    """Return a date filter bound as epoch microseconds.
+
+    Raises:
+        ValueError: If value is a string that is not ISO-8601.
+    """
+    micros = epoch_us(value)
+    if micros == MISSING_TIMESTAMP:
+        raise ValueError(f"Invalid date {value!r}; expected ISO-8601")
+    return micros
+
+
+def _iso(micros: int) -> str:
+    """Inverse of epoch_us for values produced by it."""
+    if micros == MISSING_TIMESTAMP:
+        return ""
+    return (_EPOCH + timedelta(microseconds=int(micros))).isoformat()
+
+
+def _as_list(value) -> list:
+    """Wrap a single filter value in a list."""
+    if isinstance(value, (str, Priority, Status)):
+        return [value]
+    return list(value)
+
+
+class TodoTable:
+    """Struct-of-arrays snapshot of todos for vectorized filtering.
+
+    Every field is held in its own NumPy column: owners are dictionary
+    encoded into int32 codes, priority and status are int8 codes into
+    PRIORITIES and STATUSES, timestamps are int64 microseconds since
+    the epoch and versions are int64. Filters and counts run over whole
+    columns at once; rows are turned back into TodoItems only when
+    asked for.
+
+    Build one with ``TodoTable.from_todos(...)`` or
+    ``TodoTable.from_manager(manager)``.
+    """
+
+    def __init__(
+        self,
+        ids,
+        titles,
+        details,
+        owner_codes,
+        owners: List[str],
+        priority,
+        status,
+        created,
+        updated,
+        version,
+    ):
+        """Initialize from prebuilt columns; use the from_* constructors."""
+        if np is None:
+            raise ImportError("TodoTable requires numpy (pip install numpy)")
+        self.ids = ids
+        self.titles = titles
+        self.details = details
+        self.owner = owner_codes
+        self.owners = owners
+        self.priority = priority
+        self.status = status
+        self.created = created
+        self.updated = updated
+        self.version = version
+        self._owner_codes = {owner: code for code, owner in enumerate(owners)}
+
+    @classmethod
+    def from_todos(cls, todos: Iterable[TodoItem]) -> "TodoTable":
+        """Build a table from any iterable of todos in a single pass."""
+        if np is None:
+            raise ImportError("TodoTable requires numpy (pip install numpy)")
+        owner_codes: Dict[str, int] = {}
+        ids: List[str] = []
+        titles: List[str] = []
+        details: List[str] = []
+        owner = array("l")
+        priority = array("b")
+        status = array("b")
+        created = array("q")
+        updated = array("q")
+        version = array("q")
+        for todo in todos:
+            ids.append(todo.id)
+            titles.append(todo.title)
+            details.append(todo.details)
+            code = owner_codes.get(todo.owner)
+            if code is None:
+                code = owner_codes[todo.owner] = len(owner_codes)
+            owner.append(code)
+            priority.append(_PRIORITY_CODES[todo.priority])
+            status.append(_STATUS_CODES[todo.status])
+            created.append(epoch_us(todo.created_at))
+            updated.append(epoch_us(todo.updated_at))
+            version.append(todo.version)
+        return cls(
+            np.array(ids, dtype=object),
+            np.array(titles, dtype=object),
+            np.array(details, dtype=object),
+            np.array(owner, dtype=np.int32),
+            list(owner_codes),
+            np.array(priority, dtype=np.int8),
+            np.array(status, dtype=np.int8),
+            np.array(created, dtype=np.int64),
+            np.array(updated, dtype=np.int64),
+            np.array(version, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_manager(cls, manager) -> "TodoTable":
+        """Build a table by streaming every todo out of a TodoManager."""
+        return cls.from_todos(manager.iter_todos())
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.ids)
+
+    def mask(
+        self,
+        owner: Union[str, Iterable[str], None] = None,
+        status: Union[Status, Iterable[Status], None] = None,
+        priority: Union[Priority, Iterable[Priority], None] = None,
+        created_from: TimeBound = None,
+        created_to: TimeBound = None,
+        updated_from: TimeBound = None,
+        updated_to: TimeBound = None,
+    ):
+        """Return a boolean row mask for the given criteria.
+
+        Each criterion is optional and they are combined with AND. owner,
+        status and priority accept one value or several (matching any of
+        them). Date ranges are half-open: ``from`` is inclusive and ``to``
+        is exclusive; they accept ISO-8601 strings or datetimes, and a
+        string that does not parse raises ValueError.
+        """
+        selected = np.ones(len(self), dtype=bool)
+        if owner is not None:
+            codes = [
+                self._owner_codes[o] for o in _as_list(owner) if o in self._owner_codes
+            ]
+            selected &= np.isin(self.owner, codes)
+        if status is not None:
+            selected &= np.isin(
+                self.status, [_STATUS_CODES[s] for s in _as_list(status)]
+            )
+        if priority is not None:
+            selected &= np.isin(
+                self.priority, [_PRIORITY_CODES[p] for p in _as_list(priority)]
+            )
+        for column, low, high in (
+            (self.created, created_from, created_to),
+            (self.updated, updated_from, updated_to),
+        ):
+            if low is not None:
+                selected &= column >= _bound_us(low)
+            if high is not None:
+                selected &= column < _bound_us(high)
+        return selected
+
+    def take(self, indices) -> "TodoTable":
+        """Return a new table with the rows at indices (or a boolean mask)."""
+        return TodoTable(
+            self.ids[indices],
+            self.titles[indices],
+            self.details[indices],
+            self.owner[indices],
+            self.owners,
+            self.priority[indices],
+            self.status[indices],
+            self.created[indices],
+            self.updated[indices],
+            self.version[indices],
+        )
+
+    def filter(self, **criteria) -> "TodoTable":
+        """Return the rows matching criteria; see mask for the options."""
+        return self.take(self.mask(**criteria))
+
+    def count(self, **criteria) -> int:
+        """Return the number of rows matching criteria."""
+        return int(np.count_nonzero(self.mask(**criteria)))
+
+    def _grouping(self, column: str) -> Tuple["np.ndarray", Sequence]:
+        """Return the code column and code labels for a count_by column."""
+        if column == "owner":
+            return self.owner, self.owners
+        if column == "priority":
+            return self.priority, PRIORITIES
+        if column == "status":
+            return self.status, STATUSES
+        raise ValueError(f"Cannot group by {column!r}; use owner, priority or status")
+
+    def count_by(self, *columns: str) -> dict:
+        """Count rows per value of one or more of owner, priority and status.
+
+        With one column the keys are its values (owner names or enum
+        members); with several they are tuples in the given column order.
+        Combinations with no rows are left out.
+        """
+        if not columns:
+            raise ValueError("count_by needs at least one column")
+        groupings = [self._grouping(column) for column in columns]
+        shape = tuple(max(len(labels), 1) for _, labels in groupings)
+        flat = np.zeros(len(self), dtype=np.int64)
+        for (codes, _), size in zip(groupings, shape):
+            flat = flat * size + codes
+        counts = np.bincount(flat, minlength=int(np.prod(shape)))
+        result = {}
+        for key in np.flatnonzero(counts):
+            parts = np.unravel_index(key, shape)
+            labels = tuple(g[1][int(p)] for g, p in zip(groupings, parts))
+            result[labels if len(columns) > 1 else labels[0]] = int(counts[key])
+        return result
+
+    def row(self, index: int) -> TodoItem:
+        """Materialize the row at index as a TodoItem.
+
+        Timestamps are rendered from the stored microseconds, so values
+        that carried a time zone come back as naive UTC.
+        """
+        return TodoItem(
+            id=self.ids[index],
+            title=self.titles[index],
+            details=self.details[index],
+            priority=PRIORITIES[self.priority[index]],
+            status=STATUSES[self.status[index]],
+            owner=self.owners[self.owner[index]],
+            created_at=_iso(self.created[index]),
+            updated_at=_iso(self.updated[index]),
+            version=int(self.version[index]),
+        )
+
+    def rows(self) -> Iterator[TodoItem]:
+        """Materialize every row, one at a time."""
+        for index in range(len(self)):
+            yield self.row(index)
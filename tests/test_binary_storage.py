@@ -0,0 +1,94 @@
+"""Tests for the memory-mapped binary storage backend."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from binstore import RecordFile
+from managers import TodoManager
+from models import Priority, Status
+
+
+def test_crud_round_trip(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="binary")
+    first = manager.create_todo("A", "one", Priority.HIGH, owner="alice")
+    second = manager.create_todo("B", "two", Priority.LOW, owner="bob")
+
+    assert manager.get_todo_by_id(first.id) == first
+    assert manager.get_todo_by_id("missing") is None
+    assert [t.id for t in manager.get_todos_by_owner("bob")] == [second.id]
+
+    assert manager.mark_as_completed(first.id, "alice") is True
+    assert manager.get_todo_by_id(first.id).status == Status.COMPLETED
+    # Updates append a new record but keep the original position.
+    assert [t.id for t in manager.get_all_todos()] == [first.id, second.id]
+
+    assert manager.delete_todo(first.id) is True
+    assert manager.delete_todo(first.id) is False
+    assert [t.id for t in manager.iter_todos()] == [second.id]
+    manager.close()
+
+
+def test_storage_is_detected_on_reopen(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="binary")
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+    manager.close()
+
+    reopened = TodoManager(data_dir=temp_data_dir)
+    assert reopened.storage == "binary"
+    assert reopened.get_todo_by_id(todo.id).title == "A"
+    reopened.close()
+
+
+def test_table_grows_past_initial_slots(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="binary", slot_count=8)
+    created = manager.create_many(
+        {"title": f"T{i}", "owner": f"user{i % 3}"} for i in range(100)
+    )
+
+    assert manager._store._file.header().slot_count >= 128
+    for todo in created[::7]:
+        assert manager.get_todo_by_id(todo.id).title == todo.title
+    assert len(manager.get_todos_by_owner("user1")) == 33
+    manager.close()
+
+
+def test_writes_from_other_handle_are_seen(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="binary", slot_count=8)
+    other = TodoManager(data_dir=temp_data_dir, storage="binary")
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+    assert len(other.get_todos_by_owner("alice")) == 1
+
+    # Enough inserts to force a rebuild, which replaces the file.
+    for i in range(20):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner="alice")
+    assert len(other.get_todos_by_owner("alice")) == 21
+    manager.close()
+    other.close()
+
+
+def test_compact_drops_dead_records(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="binary")
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+    for i in range(5):
+        todo.title = f"A{i}"
+        manager.update_todo(todo)
+    manager.delete_todo(manager.create_todo("B", "", Priority.MID, owner="bob").id)
+
+    size = Path(manager._store.path).stat().st_size
+    assert manager.compact() == 6
+    assert Path(manager._store.path).stat().st_size < size
+    assert manager.get_todo_by_id(todo.id).title == "A4"
+    assert manager.compact() == 0
+    manager.close()
+
+
+def test_record_file_reuses_tombstoned_slots(tmp_path):
+    records = RecordFile(tmp_path / "r.bin", slot_count=8)
+    for round_ in range(50):
+        records.put("k", "g", str(round_).encode())
+        assert records.delete("k") is True
+    assert records.get("k") is None
+    assert records.header().slot_count == 8
+    records.close()
@@ -0,0 +1,97 @@
+"""Tests for the batched bulk-mutation API on TodoManager."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import TodoManager
+from models import BulkResult, Priority, Status, NOT_FOUND, NOT_OWNER
+from storage import JsonTodoStore
+
+STORAGES = ["json", "jsonl", "sqlite", "sharded"]
+
+
+@pytest.fixture(params=STORAGES)
+def manager(request, temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage=request.param)
+    yield manager
+    manager.close()
+
+
+def _items(count, owner="alice"):
+    return [
+        {"title": f"T{i}", "details": "", "priority": Priority.LOW, "owner": owner}
+        for i in range(count)
+    ]
+
+
+def test_create_many_assigns_unique_ids(manager):
+    created = manager.create_many(_items(5) + _items(2, owner="bob"))
+
+    assert len({todo.id for todo in created}) == 7
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [
+        t.id for t in created[:5]
+    ]
+    single = manager.create_todo("Later", "", Priority.MID, owner="alice")
+    assert single.id not in {todo.id for todo in created}
+
+
+def test_complete_many_reports_per_item(manager):
+    mine = manager.create_many(_items(2))
+    theirs = manager.create_many(_items(1, owner="bob"))
+
+    results = manager.complete_many(
+        [mine[0].id, theirs[0].id, "missing", mine[1].id], owner="alice"
+    )
+
+    assert results == [
+        BulkResult(mine[0].id, True),
+        BulkResult(theirs[0].id, False, NOT_OWNER),
+        BulkResult("missing", False, NOT_FOUND),
+        BulkResult(mine[1].id, True),
+    ]
+    assert all(
+        t.status == Status.COMPLETED for t in manager.get_todos_by_owner("alice")
+    )
+    assert manager.get_todo_by_id(theirs[0].id).status == Status.PENDING
+
+
+def test_update_many_and_delete_many(manager):
+    todos = manager.create_many(_items(3))
+    for todo in todos:
+        todo.title = todo.title + "!"
+    ghost = manager.create_many(_items(1))[0]
+    manager.delete_todo(ghost.id)
+
+    results = manager.update_many(todos + [ghost])
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert results[-1].error == NOT_FOUND
+    assert [t.title for t in manager.get_todos_by_owner("alice")] == ["T0!", "T1!", "T2!"]
+
+    results = manager.delete_many([todos[0].id, todos[0].id, todos[1].id], owner="bob")
+    assert [r.error for r in results] == [NOT_OWNER, NOT_OWNER, NOT_OWNER]
+
+    results = manager.delete_many([todos[0].id, todos[0].id, todos[1].id])
+    assert [r.ok for r in results] == [True, False, True]
+    assert [t.id for t in manager.get_all_todos()] == [todos[2].id]
+
+
+def test_bulk_calls_write_json_once(temp_data_dir, monkeypatch):
+    manager = TodoManager(data_dir=temp_data_dir)
+    writes = []
+    original = JsonTodoStore._write
+
+    def counting_write(self, todos):
+        writes.append(len(todos))
+        original(self, todos)
+
+    monkeypatch.setattr(JsonTodoStore, "_write", counting_write)
+
+    created = manager.create_many(_items(50))
+    manager.complete_many([t.id for t in created], owner="alice")
+    manager.delete_many([t.id for t in created[:10]])
+
+    assert writes == [50, 50, 40]
@@ -0,0 +1,139 @@
+"""Tests for bulk CSV/JSONL import and export."""
+
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from admin import main as admin_main
+from bulkio import export_todos, import_todos
+from managers import TodoManager
+from models import Priority, Status
+
+TRICKY = [
+    {"title": "Plain", "details": "", "priority": "HIGH", "status": "PENDING", "owner": "alice"},
+    {"title": 'Quote "this", please', "details": "line one\nline two", "priority": "LOW",
+     "status": "COMPLETED", "owner": "bob"},
+    {"title": "Ünïcode   sep", "details": "a,b,c", "priority": "MID", "status": "PENDING",
+     "owner": "alice", "created_at": "2024-01-02T03:04:05"},
+]
+
+
+def _write_csv(path, rows, fields=("title", "details", "priority", "status", "owner", "created_at")):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_import_splits_only_between_records(temp_data_dir, workers):
+    source = Path(temp_data_dir) / "in.csv"
+    _write_csv(source, TRICKY * 40)
+    manager = TodoManager(data_dir=temp_data_dir)
+    seen = []
+
+    result = import_todos(manager, source, workers=workers, chunk_bytes=64,
+                          progress=lambda rows, seconds: seen.append(rows))
+
+    assert (result.imported, result.rejected) == (120, 0)
+    assert seen[-1] == 120 and len(seen) > 1
+    todos = manager.get_all_todos()
+    assert [t.title for t in todos[:3]] == [row["title"] for row in TRICKY]
+    assert todos[1].details == "line one\nline two"
+    assert todos[1].status is Status.COMPLETED and todos[1].priority is Priority.LOW
+    assert todos[2].created_at == "2024-01-02T03:04:05"
+    assert len({t.id for t in todos}) == 120
+
+
+def test_jsonl_import_rejects_bad_records(temp_data_dir):
+    source = Path(temp_data_dir) / "in.jsonl"
+    lines = [json.dumps(TRICKY[0]), "{not json", json.dumps({"title": "No owner"}), "",
+             json.dumps(dict(TRICKY[2], priority="URGENT")), json.dumps(TRICKY[1])]
+    source.write_text("\n".join(lines), encoding="utf-8")
+    manager = TodoManager(data_dir=temp_data_dir)
+
+    result = import_todos(manager, source, workers=1)
+
+    assert (result.imported, result.rejected) == (2, 3)
+    assert result.errors[1] == "record 3: missing owner"
+    assert result.errors[2] == "record 4: unknown priority 'URGENT'"
+    assert [t.title for t in manager.get_all_todos()] == ["Plain", TRICKY[1]["title"]]
+
+
+def test_csv_import_rejects_undecodable_and_malformed_records(temp_data_dir):
+    source = Path(temp_data_dir) / "in.csv"
+    source.write_bytes(
+        b"title,owner\n"
+        b"Good,alice\n"
+        b"Bad \xff byte,alice\n"
+        b'"' + b"x" * 200_000 + b'",alice\n'
+        b"Also good,bob\n"
+    )
+    manager = TodoManager(data_dir=temp_data_dir)
+
+    result = import_todos(manager, source, workers=1)
+
+    assert (result.imported, result.rejected) == (2, 2)
+    assert result.errors[0] == "record 2: title is not valid UTF-8"
+    assert result.errors[1].startswith("record 3: malformed CSV: field larger")
+    assert [t.title for t in manager.get_all_todos()] == ["Good", "Also good"]
+
+
+def test_admin_import_reports_malformed_csv_header(temp_data_dir, capsys):
+    source = Path(temp_data_dir) / "in.csv"
+    source.write_text("title,owner," + "x" * 200_000 + "\n", encoding="utf-8")
+    assert admin_main(["--data-dir", temp_data_dir, "import", str(source), "--workers", "1"]) == 1
+    assert "Import failed" in capsys.readouterr().err
+
+
+def test_csv_header_must_name_required_columns(temp_data_dir):
+    source = Path(temp_data_dir) / "in.csv"
+    _write_csv(source, TRICKY, fields=("title", "details"))
+    with pytest.raises(ValueError, match="owner"):
+        import_todos(TodoManager(data_dir=temp_data_dir), source, workers=1)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_round_trips_and_filters(temp_data_dir, fmt):
+    manager = TodoManager(data_dir=temp_data_dir)
+    source = Path(temp_data_dir) / "in.csv"
+    _write_csv(source, TRICKY)
+    import_todos(manager, source, workers=1)
+
+    out = io.StringIO(newline="")
+    assert export_todos(manager, out, fmt) == 3
+    exported = Path(temp_data_dir) / f"out.{fmt}"
+    exported.write_text(out.getvalue(), encoding="utf-8")
+
+    copy_dir = Path(temp_data_dir) / "copy"
+    copy = TodoManager(data_dir=str(copy_dir))
+    assert import_todos(copy, exported, workers=1).imported == 3
+
+    def strip(todos):
+        return [(t.title, t.details, t.priority, t.status, t.owner, t.created_at) for t in todos]
+
+    assert strip(copy.get_all_todos()) == strip(manager.get_all_todos())
+
+    out = io.StringIO(newline="")
+    assert export_todos(manager, out, fmt, owner="alice", status=Status.PENDING) == 2
+    assert export_todos(manager, io.StringIO(), fmt, status=Status.COMPLETED) == 1
+
+
+def test_admin_import_and_export(temp_data_dir, capsys):
+    source = Path(temp_data_dir) / "in.jsonl"
+    source.write_text("\n".join(json.dumps(row) for row in TRICKY) + "\n", encoding="utf-8")
+    assert admin_main(["--data-dir", temp_data_dir, "import", str(source), "--workers", "1"]) == 0
+    assert "Imported 3 todos" in capsys.readouterr().out
+
+    target = Path(temp_data_dir) / "bob.csv"
+    assert admin_main(["--data-dir", temp_data_dir, "export", str(target), "--owner", "bob"]) == 0
+    with open(target, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["title"] for row in rows] == [TRICKY[1]["title"]]
+    assert rows[0]["id"] and rows[0]["version"] == "1"
@@ -0,0 +1,51 @@
+"""Tests for the todo JSON codec and the TodoItem.from_dict fast path."""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import codec
+from managers import TodoManager
+from models import Priority, Status, TodoItem
+
+
+def test_from_dict_round_trip_and_defaults():
+    todo = TodoItem(id="7", title="T", details="D", priority=Priority.HIGH,
+                    status=Status.COMPLETED, owner="alice")
+    assert TodoItem.from_dict(todo.to_dict()) == todo
+
+    partial = TodoItem.from_dict({"title": "only a title"})
+    assert partial.title == "only a title"
+    assert partial.priority == Priority.MID and partial.status == Status.PENDING
+    assert partial.id and partial.created_at == partial.updated_at
+
+
+def test_from_dict_rejects_unknown_enum_values():
+    data = TodoItem(id="1").to_dict()
+    data["priority"] = "URGENT"
+    with pytest.raises(ValueError):
+        TodoItem.from_dict(data)
+
+
+def test_dump_is_compact_unless_pretty():
+    todos = [TodoItem(id=str(i), owner="alice") for i in range(3)]
+    compact = codec.dumps(todos)
+    pretty = codec.dumps(todos, pretty=True)
+
+    assert "\n" not in compact and ", " not in compact
+    assert pretty.startswith("[\n  {")
+    assert codec.load(io.StringIO(compact)) == codec.loads(pretty) == todos
+
+
+def test_manager_pretty_option(temp_data_dir):
+    TodoManager(data_dir=temp_data_dir).create_todo("A", "", Priority.MID, "alice")
+    assert "\n" not in (Path(temp_data_dir) / "todos.json").read_text()
+
+    manager = TodoManager(data_dir=temp_data_dir, pretty=True)
+    manager.create_todo("B", "", Priority.MID, "alice")
+    assert (Path(temp_data_dir) / "todos.json").read_text().startswith("[\n  {")
+    assert [t.title for t in manager.iter_todos()] == ["A", "B"]
@@ -0,0 +1,64 @@
+"""Tests for the memory-lean CompactTodoItem representation."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import CompactTodoItem, Priority, Status, TodoItem
+
+
+def _record(**overrides):
+    record = {
+        "id": "42",
+        "title": "Title",
+        "details": "Details",
+        "priority": "HIGH",
+        "status": "COMPLETED",
+        "owner": "alice",
+        "created_at": "2024-03-01T09:15:30.123456",
+        "updated_at": "2024-03-02T10:00:00",
+        "version": 3,
+    }
+    record.update(overrides)
+    return record
+
+
+def test_dict_round_trip_matches_todo_item():
+    record = _record()
+    compact = CompactTodoItem.from_dict(record)
+
+    assert compact.to_dict() == record
+    assert compact.to_dict() == TodoItem.from_dict(record).to_dict()
+    assert compact.priority == Priority.HIGH
+    assert compact.status == Status.COMPLETED
+    assert isinstance(compact._created, int)
+
+
+def test_item_conversion_round_trip():
+    todo = TodoItem.from_dict(_record())
+    compact = CompactTodoItem.from_item(todo)
+
+    assert compact.to_item() == todo
+    assert not hasattr(compact, "__dict__")
+
+
+def test_owner_is_interned():
+    a = CompactTodoItem.from_dict(_record(owner="".join(["bo", "b"])))
+    b = CompactTodoItem.from_dict(_record(owner="".join(["b", "ob"])))
+
+    assert a.owner is b.owner
+
+
+def test_unusual_timestamps_are_kept_verbatim():
+    for value in ("2024-03-01T09:15:30+07:00", "2024-03-01T09:15:30.000000", "soon"):
+        compact = CompactTodoItem.from_dict(_record(created_at=value))
+        assert compact.created_at == value
+
+
+def test_timestamp_setters_accept_iso_strings():
+    compact = CompactTodoItem.from_dict(_record())
+    compact.updated_at = "2025-01-01T00:00:00.000001"
+
+    assert compact.updated_at == "2025-01-01T00:00:00.000001"
+    assert isinstance(compact._updated, int)
@@ -0,0 +1,112 @@
+"""Multi-process stress tests for shared data directories."""
+
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from locking import FileLock
+from managers import AuthManager, TodoManager
+from models import Priority, Status
+
+WORKERS = 4
+TODOS_PER_WORKER = 25
+
+
+def _create_and_complete(data_dir, storage, worker, results):
+    manager = TodoManager(data_dir=data_dir, storage=storage)
+    owner = f"worker{worker}"
+    for i in range(TODOS_PER_WORKER):
+        todo = manager.create_todo(f"{owner}-{i}", "", Priority.MID, owner)
+        assert manager.mark_as_completed(todo.id, owner)
+    manager.close()
+    results.put(manager.lock_stats)
+
+
+def _sign_up(data_dir, worker, results):
+    auth = AuthManager(data_dir=data_dir)
+    for i in range(10):
+        assert auth.sign_up(f"user{worker}-{i}", "pw")
+    results.put(auth.lock_stats)
+
+
+def _run(target, *args):
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=target, args=args + (worker, results))
+        for worker in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    stats = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    return stats
+
+
+@pytest.mark.parametrize("storage", ["json", "jsonl", "sqlite", "binary", "sharded"])
+def test_concurrent_writers_lose_nothing(temp_data_dir, storage):
+    TodoManager(data_dir=temp_data_dir, storage=storage).close()
+    stats = _run(_create_and_complete, temp_data_dir, storage)
+
+    todos = TodoManager(data_dir=temp_data_dir).get_all_todos()
+    assert len(todos) == WORKERS * TODOS_PER_WORKER
+    assert len({t.id for t in todos}) == len(todos)
+    assert all(t.status == Status.COMPLETED for t in todos)
+    for worker in range(WORKERS):
+        assert sum(t.owner == f"worker{worker}" for t in todos) == TODOS_PER_WORKER
+
+    assert all(s["acquired"] >= 2 * TODOS_PER_WORKER for s in stats)
+    total_wait = sum(s["wait_seconds"] for s in stats)
+    print(f"\n{storage}: {sum(s['contended'] for s in stats)} contended "
+          f"acquisitions, {total_wait * 1000:.1f} ms total lock wait")
+
+
+def test_concurrent_sign_ups(temp_data_dir):
+    _run(_sign_up, temp_data_dir)
+
+    auth = AuthManager(data_dir=temp_data_dir)
+    for worker in range(WORKERS):
+        for i in range(10):
+            assert auth.login(f"user{worker}-{i}", "pw")
+
+
+def test_lock_is_reentrant_and_refuses_upgrade(tmp_path):
+    lock = FileLock(tmp_path / "x.lock")
+    with lock.exclusive():
+        with lock.shared():
+            with lock.exclusive():
+                pass
+    with lock.shared():
+        with lock.shared():
+            pass
+        with pytest.raises(RuntimeError):
+            with lock.exclusive():
+                pass
+    assert lock.stats["acquired"] == 2
+    lock.close()
+
+
+def _wait_for_lock(path):
+    lock = FileLock(path)
+    with lock.exclusive():
+        pass
+    assert lock.stats["contended"] == 1
+    assert lock.stats["wait_seconds"] >= 0.1
+
+
+def test_wait_time_is_recorded(tmp_path):
+    path = tmp_path / "x.lock"
+    holder = FileLock(path)
+    process = multiprocessing.get_context("fork").Process(target=_wait_for_lock, args=(path,))
+    with holder.exclusive():
+        process.start()
+        time.sleep(0.3)
+    process.join(timeout=10)
+    assert process.exitcode == 0
@@ -0,0 +1,194 @@
+"""Tests for the Unix socket daemon and its thin clients."""
+
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from client import DaemonClient, RemoteAuthManager, RemoteTodoManager
+from daemon import TodoDaemon
+from main import App
+from models import ConflictError, Priority, Status
+from protocol import MAX_MESSAGE, recv_message
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+@pytest.fixture
+def daemon(temp_data_dir):
+    server = TodoDaemon(Path(temp_data_dir) / "todo.sock", data_dir=temp_data_dir)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def _connect(server):
+    client = DaemonClient(server.socket_path)
+    return client, RemoteAuthManager(client), RemoteTodoManager(client)
+
+
+def test_remote_managers_round_trip(daemon):
+    client, auth, todos = _connect(daemon)
+    assert auth.sign_up("alice", "pw")
+    assert auth.user_exists("alice")
+    assert auth.login("alice", "pw")
+    assert not auth.login("alice", "wrong")
+
+    todo = todos.create_todo("Buy milk", "2 litres", Priority.HIGH, "alice")
+    todos.create_todo("Walk dog", "", Priority.LOW, "bob")
+    assert todos.get_todo_by_id(todo.id) == todo
+    assert [t.title for t in todos.get_todos_by_owner("alice")] == ["Buy milk"]
+    assert len(todos.get_all_todos()) == 2
+
+    page = todos.list_todos(limit=1)
+    assert len(page.items) == 1 and page.next_cursor is not None
+    assert todos.list_todos(limit=1, cursor=page.next_cursor).next_cursor is None
+
+    todo.title = "Buy oat milk"
+    todos.update_todo(todo, expected_version=1)
+    assert todo.version == 2
+    assert [t.id for t in todos.search_todos("oat", owner="alice")] == [todo.id]
+    assert todos.mark_as_completed(todo.id, "alice")
+    assert todos.get_todo_by_id(todo.id).status == Status.COMPLETED
+    assert todos.delete_todo(todo.id)
+    assert todos.get_todo_by_id(todo.id) is None
+    todos.close()
+
+    # The daemon's state is what every client sees.
+    assert daemon.todo_manager.get_all_todos()[0].title == "Walk dog"
+
+
+def test_errors_cross_the_wire(daemon):
+    client, _, todos = _connect(daemon)
+    todo = todos.create_todo("A", "", Priority.MID, "alice")
+    todos.update_todo(todo)
+
+    stale = todos.get_todo_by_id(todo.id)
+    stale.version = 1
+    with pytest.raises(ConflictError) as excinfo:
+        todos.update_todo(stale, expected_version=1)
+    assert excinfo.value.actual_version == 2
+
+    with pytest.raises(ValueError):
+        todos.list_todos(limit=0)
+    with pytest.raises(ValueError):
+        client.call("no_such_op")
+    with pytest.raises(ValueError):
+        client.call("login", username="alice")
+    # The connection is still usable after errors.
+    assert client.call("ping") == "pong"
+
+
+def test_oversized_frame_is_rejected(daemon):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(str(daemon.socket_path))
+    sock.sendall(struct.pack("!I", MAX_MESSAGE + 1))
+    response = recv_message(sock)
+    assert response["ok"] is False and response["error"] == "invalid"
+    sock.close()
+
+
+def test_socket_is_private_to_its_owner(daemon):
+    assert daemon.socket_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_slow_request_does_not_block_others(daemon, monkeypatch):
+    release = threading.Event()
+
+    def slow_search(query, owner=None, limit=None):
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(daemon.todo_manager, "search_todos", slow_search)
+    _, _, slow = _connect(daemon)
+    waiting = threading.Thread(target=slow.search_todos, args=("x",))
+    waiting.start()
+    try:
+        _, _, todos = _connect(daemon)
+        todo = todos.create_todo("A", "", Priority.MID, "alice")
+        assert todos.get_todo_by_id(todo.id) == todo
+        assert waiting.is_alive()
+    finally:
+        release.set()
+        waiting.join()
+
+
+def test_many_concurrent_clients(daemon):
+    def session(worker):
+        _, _, todos = _connect(daemon)
+        for i in range(10):
+            todos.create_todo(f"{worker}-{i}", "", Priority.MID, f"user{worker}")
+        todos.close()
+
+    threads = [threading.Thread(target=session, args=(w,)) for w in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_todos = daemon.todo_manager.get_all_todos()
+    assert len(all_todos) == 500
+    assert len({t.id for t in all_todos}) == 500
+    assert daemon.requests_served == 500
+
+
+def test_app_thin_client_mode(daemon, monkeypatch, capsys):
+    _, _, todos = _connect(daemon)
+    todos.create_todo("From elsewhere", "", Priority.MID, "alice")
+
+    app = App(socket_path=str(daemon.socket_path))
+    assert isinstance(app.todo_manager, RemoteTodoManager)
+    app.current_user = "alice"
+    answers = iter(["Added remotely", "", "1"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    app.create_todo()
+    app.view_todos()
+    out = capsys.readouterr().out
+
+    assert "From elsewhere" in out and "Added remotely" in out
+    assert len(daemon.todo_manager.get_todos_by_owner("alice")) == 2
+
+
+def test_refuses_second_daemon_and_replaces_stale_socket(daemon, temp_data_dir):
+    with pytest.raises(FileExistsError):
+        TodoDaemon(daemon.socket_path, data_dir=temp_data_dir)
+
+    stale = Path(temp_data_dir) / "stale.sock"
+    leftover = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    leftover.bind(str(stale))
+    leftover.close()
+    server = TodoDaemon(stale, data_dir=temp_data_dir)
+    server.server_close()
+    assert not stale.exists()
+
+
+def test_entry_point_serves_until_terminated(temp_data_dir):
+    socket_path = Path(temp_data_dir) / "todo.sock"
+    process = subprocess.Popen(
+        [sys.executable, str(SRC / "daemon.py"), "--data-dir", temp_data_dir],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists():
+            assert time.monotonic() < deadline, "daemon did not start"
+            time.sleep(0.05)
+        client = DaemonClient(socket_path)
+        assert RemoteAuthManager(client).sign_up("alice", "pw")
+        client.close()
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+    assert not socket_path.exists()
+    assert "alice" in (Path(temp_data_dir) / "users.json").read_text()
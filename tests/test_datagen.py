@@ -0,0 +1,72 @@
+"""Tests for the synthetic data set generator."""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from admin import main as admin_main
+from datagen import DatasetSpec, generate_todos, parse_mix, username, write_dataset
+from managers import AuthManager, TodoManager
+from models import Priority
+
+
+def test_same_seed_same_data(temp_data_dir):
+    first, second = Path(temp_data_dir) / "a", Path(temp_data_dir) / "b"
+    write_dataset(first, DatasetSpec(todos=500, users=50, seed=7))
+    write_dataset(second, DatasetSpec(todos=500, users=50, seed=7))
+    for name in ("todos.json", "users.json"):
+        assert (first / name).read_bytes() == (second / name).read_bytes()
+    other = list(generate_todos(DatasetSpec(todos=500, users=50, seed=8)))
+    assert other != list(generate_todos(DatasetSpec(todos=500, users=50, seed=7)))
+
+
+def test_managers_read_generated_data(temp_data_dir):
+    spec = DatasetSpec(todos=25_000, users=200, seed=1)
+    write_dataset(Path(temp_data_dir), spec)
+
+    manager = TodoManager(data_dir=temp_data_dir)
+    todos = manager.get_all_todos()
+    assert [t.id for t in todos] == [str(n) for n in range(1, 25_001)]
+    assert all(t.created_at <= t.updated_at for t in todos)
+    assert manager.create_todo("Next", "", Priority.LOW, username(0)).id == "25001"
+    assert AuthManager(data_dir=temp_data_dir).login(username(199), spec.password)
+
+    owners = Counter(t.owner for t in todos).most_common()
+    assert owners[0][0] == username(0)
+    assert owners[0][1] > 10 * owners[len(owners) // 2][1]  # Zipf: a few heavy users
+
+    priorities = Counter(t.priority for t in todos)
+    assert priorities[Priority.MID] > priorities[Priority.LOW] > priorities[Priority.HIGH]
+
+
+def test_priority_mix_and_completed_fraction():
+    spec = DatasetSpec(todos=5_000, users=10, priority_mix=parse_mix("high=1,LOW=3"), completed=0.8)
+    todos = list(generate_todos(spec))
+    priorities = Counter(t["priority"] for t in todos)
+    assert set(priorities) == {"HIGH", "LOW"}
+    assert 2.5 < priorities["LOW"] / priorities["HIGH"] < 3.5
+    assert 0.75 < sum(t["status"] == "COMPLETED" for t in todos) / len(todos) < 0.85
+
+
+def test_parse_mix_and_spec_reject_bad_input():
+    for text in ("URGENT=1", "HIGH", "HIGH=-1", "HIGH=0,LOW=0"):
+        with pytest.raises(ValueError):
+            parse_mix(text)
+    for sizes in ({"todos": 10, "users": 0}, {"todos": -1, "users": 5}):
+        with pytest.raises(ValueError):
+            DatasetSpec(**sizes)
+
+
+def test_admin_generate_refuses_existing_data(temp_data_dir, capsys):
+    args = ["--data-dir", temp_data_dir, "generate", "--todos", "100", "--users", "5"]
+    assert admin_main(args) == 0
+    assert "Wrote 100 todos and 5 users" in capsys.readouterr().out
+    assert admin_main(args) == 1
+    assert admin_main(args + ["--force", "--seed", "3"]) == 0
+    assert admin_main(args + ["--force", "--users", "0"]) == 1
+    assert "at least one user" in capsys.readouterr().err
+    assert len(TodoManager(data_dir=temp_data_dir).get_all_todos()) == 100
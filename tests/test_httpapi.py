@@ -0,0 +1,226 @@
+"""Tests for the asyncio HTTP/JSON API."""
+
+import asyncio
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from httpapi import SessionStore, TodoApi
+
+
+def _request(method, path, token=None, body=None, close=False):
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = [f"{method} {path} HTTP/1.1", f"Content-Length: {len(payload)}"]
+    if token:
+        head.append(f"Authorization: Bearer {token}")
+    if close:
+        head.append("Connection: close")
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + payload
+
+
+async def _response(reader):
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return status, json.loads(body) if body else None
+
+
+class _Client:
+    """One keep-alive connection to the API under test."""
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer, self.token = reader, writer, None
+
+    async def call(self, method, path, body=None):
+        self.writer.write(_request(method, path, self.token, body))
+        return await _response(self.reader)
+
+    async def login(self, username, password="pw"):
+        status, body = await self.call("POST", "/login", {"username": username, "password": password})
+        assert status == 200
+        self.token = body["token"]
+
+
+def _serve(temp_data_dir, scenario):
+    """Run scenario(api, connect) against a server on a free port."""
+    api = TodoApi(data_dir=temp_data_dir)
+    for user in ("alice", "bob"):
+        api.auth_manager.sign_up(user, "pw")
+
+    async def main():
+        server = await api.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def connect():
+            return _Client(*await asyncio.open_connection("127.0.0.1", port))
+
+        async with server:
+            await scenario(api, connect)
+
+    try:
+        asyncio.run(main())
+    finally:
+        api.close()
+
+
+def test_login_and_todo_lifecycle(temp_data_dir):
+    async def scenario(api, connect):
+        client = await connect()
+        assert (await client.call("GET", "/todos"))[0] == 401
+        assert (await client.call("POST", "/login", {"username": "alice", "password": "no"}))[0] == 401
+        await client.login("alice")
+
+        status, todo = await client.call("POST", "/todos", {"title": "Milk", "priority": "HIGH"})
+        assert status == 201 and todo["owner"] == "alice" and todo["version"] == 1
+        path = f"/todos/{todo['id']}"
+        assert (await client.call("GET", path)) == (200, todo)
+        status, page = await client.call("GET", "/todos?limit=5")
+        assert [t["id"] for t in page["items"]] == [todo["id"]] and page["next_cursor"] is None
+
+        status, updated = await client.call("PATCH", path, {"details": "Oat", "version": 1})
+        assert status == 200 and (updated["details"], updated["version"]) == ("Oat", 2)
+        status, body = await client.call("PATCH", path, {"details": "Stale", "version": 1})
+        assert status == 409 and body["version"] == 2
+
+        status, done = await client.call("POST", path + "/complete")
+        assert status == 200 and done["status"] == "COMPLETED"
+        assert (await client.call("DELETE", path)) == (204, None)
+        assert (await client.call("GET", path))[0] == 404
+
+        assert (await client.call("POST", "/logout")) == (204, None)
+        assert (await client.call("GET", "/todos"))[0] == 401
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_other_users_todos_are_invisible(temp_data_dir):
+    async def scenario(api, connect):
+        alice, bob = await connect(), await connect()
+        await alice.login("alice")
+        await bob.login("bob")
+        _, todo = await alice.call("POST", "/todos", {"title": "Private"})
+        path = f"/todos/{todo['id']}"
+
+        assert (await bob.call("GET", path))[0] == 404
+        assert (await bob.call("PATCH", path, {"title": "Mine now"}))[0] == 404
+        assert (await bob.call("POST", path + "/complete"))[0] == 404
+        assert (await bob.call("DELETE", path))[0] == 404
+        assert (await bob.call("GET", "/todos"))[1]["items"] == []
+        assert api.todo_manager.get_todo_by_id(todo["id"]).title == "Private"
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_bad_requests(temp_data_dir):
+    async def scenario(api, connect):
+        client = await connect()
+        await client.login("alice")
+        assert (await client.call("GET", "/nowhere"))[0] == 404
+        assert (await client.call("PUT", "/todos"))[0] == 405
+        assert (await client.call("POST", "/todos", {"title": ""}))[0] == 400
+        assert (await client.call("POST", "/todos", {"title": "x", "priority": "URGENT"}))[0] == 400
+        assert (await client.call("GET", "/todos?order_by=owner"))[0] == 400
+        bad_cursor = base64.urlsafe_b64encode(b'["created",5]').decode()
+        assert (await client.call("GET", f"/todos?cursor={bad_cursor}"))[0] == 400
+        client.writer.write(b"POST /todos HTTP/1.1\r\nContent-Length: 3\r\n"
+                            b"Authorization: Bearer " + client.token.encode() + b"\r\n\r\n{{{")
+        assert (await _response(client.reader))[0] == 400
+        # Errors do not end the connection.
+        assert (await client.call("GET", "/todos"))[0] == 200
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_pipelined_requests_answer_in_order(temp_data_dir):
+    async def scenario(api, connect):
+        client = await connect()
+        await client.login("alice")
+        client.writer.write(b"".join(
+            _request("POST", "/todos", client.token, {"title": f"T{i}"}) for i in range(5)
+        ) + _request("GET", "/todos", client.token, close=True))
+
+        titles = [(await _response(client.reader))[1]["title"] for _ in range(5)]
+        assert titles == [f"T{i}" for i in range(5)]
+        status, page = await _response(client.reader)
+        assert [t["title"] for t in page["items"]] == titles
+        assert await client.reader.read() == b""  # closed after Connection: close
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_complete_of_concurrently_deleted_todo_is_404(temp_data_dir):
+    async def scenario(api, connect):
+        client = await connect()
+        await client.login("alice")
+        _, todo = await client.call("POST", "/todos", {"title": "Gone soon"})
+        real_complete = api.todo_manager.mark_as_completed
+
+        def complete_then_lose(todo_id, owner):
+            done = real_complete(todo_id, owner)
+            api.todo_manager.delete_todo(todo_id)  # someone else deletes it
+            return done
+
+        api.todo_manager.mark_as_completed = complete_then_lose
+        assert (await client.call("POST", f"/todos/{todo['id']}/complete"))[0] == 404
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_patch_of_concurrently_deleted_todo_is_404(temp_data_dir):
+    async def scenario(api, connect):
+        client = await connect()
+        await client.login("alice")
+        _, todo = await client.call("POST", "/todos", {"title": "Gone soon"})
+        real_update = api.todo_manager.update_todo
+
+        def lose_then_update(todo, expected_version=None):
+            api.todo_manager.delete_todo(todo.id)  # someone else deletes it
+            real_update(todo, expected_version)
+
+        api.todo_manager.update_todo = lose_then_update
+        status, _ = await client.call("PATCH", f"/todos/{todo['id']}", {"title": "Back"})
+        assert status == 404
+        assert api.todo_manager.get_todo_by_id(todo["id"]) is None
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_slow_io_does_not_block_the_event_loop(temp_data_dir):
+    async def scenario(api, connect):
+        slow, fast = await connect(), await connect()
+        await slow.login("alice")
+        _, todo = await slow.call("POST", "/todos", {"title": "A"})
+
+        real_get = api.todo_manager.get_todo_by_id
+
+        def sluggish(todo_id):
+            time.sleep(0.5)
+            return real_get(todo_id)
+
+        api.todo_manager.get_todo_by_id = sluggish
+        slow.writer.write(_request("GET", f"/todos/{todo['id']}", slow.token))
+        slow_response = asyncio.ensure_future(_response(slow.reader))
+        await asyncio.sleep(0.05)
+
+        assert (await fast.call("GET", "/todos"))[0] == 401
+        # The fast answer arrives while the slow call is still running.
+        assert not slow_response.done()
+        assert (await slow_response)[0] == 200
+
+    _serve(temp_data_dir, scenario)
+
+
+def test_sessions_expire():
+    sessions = SessionStore(ttl=0.05)
+    token = sessions.create("alice")
+    assert sessions.user_for(token) == "alice"
+    time.sleep(0.1)
+    assert sessions.user_for(token) is None
+    assert sessions.user_for("made-up") is None
@@ -0,0 +1,76 @@
+"""Tests for the persistent block-based ID allocator."""
+
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from idalloc import IdAllocator
+from managers import TodoManager
+from models import Priority
+
+
+def _allocate(path, count, queue):
+    allocator = IdAllocator(path, block_size=4)
+    queue.put([allocator.next_id() for _ in range(count)])
+
+
+def test_ids_increase_within_a_process(tmp_path):
+    allocator = IdAllocator(tmp_path / "todos.seq", block_size=3)
+    assert [allocator.next_id() for _ in range(5)] == ["1", "2", "3", "4", "5"]
+    assert (tmp_path / "todos.seq").read_text().strip() == "6"
+
+
+def test_allocators_sharing_a_counter_never_collide(tmp_path):
+    path = tmp_path / "todos.seq"
+    first = IdAllocator(path, block_size=4)
+    second = IdAllocator(path, block_size=4)
+
+    ids = [first.next_id(), second.next_id(), first.next_id(), second.next_id()]
+    assert len(set(ids)) == 4
+
+
+def test_concurrent_processes_get_disjoint_ids(tmp_path):
+    path = tmp_path / "todos.seq"
+    queue = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_allocate, args=(path, 25, queue))
+        for _ in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    ids = [todo_id for _ in procs for todo_id in queue.get(timeout=30)]
+    for proc in procs:
+        proc.join()
+
+    assert len(ids) == 100
+    assert len(set(ids)) == 100
+
+
+def test_seeds_from_existing_mixed_ids(temp_data_dir):
+    todos = [
+        {"id": "7", "title": "numeric", "owner": "alice"},
+        {"id": "2b9c8f1e-0a4d-4a55-9d4e-3f4c1b0e2a11", "title": "uuid"},
+        {"id": "12", "title": "numeric", "owner": "bob"},
+    ]
+    (Path(temp_data_dir) / "todos.json").write_text(json.dumps(todos))
+
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo = manager.create_todo("New", "", Priority.MID, owner="alice")
+
+    assert todo.id == "13"
+
+
+def test_existing_todos_are_not_scanned_once_seeded(temp_data_dir):
+    calls = []
+
+    def existing_ids():
+        calls.append(1)
+        return ["5"]
+
+    path = Path(temp_data_dir) / "todos.seq"
+    assert IdAllocator(path, block_size=1, existing_ids=existing_ids).next_id() == "6"
+    assert IdAllocator(path, block_size=1, existing_ids=existing_ids).next_id() == "7"
+    assert len(calls) == 1
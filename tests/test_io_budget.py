@@ -0,0 +1,96 @@
+"""I/O budgets of the CLI actions.
+
+Each App action is run against a seeded data directory with the
+instrumentation on, and the whole data files it reads and writes are
+checked against a fixed budget. A redundant reload or rewrite makes the
+action exceed its budget and fails here.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import metrics
+from main import APP_ACTIONS, App
+from managers import AuthManager, TodoManager
+from models import Priority
+
+# Action: (answers to its prompts, (reads, writes) cold, (reads, writes) warm).
+# Cold is a fresh process over valid snapshots: loading todos.json or
+# users.json reads the snapshot and the source its digest is checked
+# against. Warm is after the data was loaded once; then nothing that
+# only reads may touch the disk, and a change writes just its file.
+BUDGETS = {
+    "login": (["alice", "pw"], (2, 0), (0, 0)),
+    "sign_up": (["carol", "pw"], (2, 2), (0, 2)),
+    "create_todo": (["New", "", "1"], (2, 1), (0, 1)),
+    "view_todos": (["q"], (2, 0), (0, 0)),
+    "edit_todo": (["1", "1", "Edited"], (2, 1), (0, 1)),
+    "mark_completed": (["2"], (2, 1), (0, 1)),
+    "delete_todo": (["3"], (2, 1), (0, 1)),
+    "mark_completed_by_id": (["8"], (2, 1), (0, 1)),
+    "view_todo_details": (["6"], (2, 0), (0, 0)),
+    "view_all_todos": (["q"], (2, 0), (0, 0)),
+    "search_todos": (["Task"], (2, 0), (0, 0)),
+    "logout": ([], (0, 0), (0, 0)),
+}
+
+
+@pytest.fixture
+def data_dir(temp_data_dir):
+    """A data directory with two users, 30 todos and valid snapshots."""
+    auth = AuthManager(data_dir=temp_data_dir, snapshot=True)
+    auth.sign_up("alice", "pw")
+    auth.sign_up("bob", "pw")
+    manager = TodoManager(data_dir=temp_data_dir, snapshot=True)
+    for i in range(30):
+        manager.create_todo(f"Task {i}", "", Priority.MID, ("bob", "alice")[i % 2])
+    manager.close()
+    return temp_data_dir
+
+
+def _app(data_dir: str) -> App:
+    """Return an app logged in as alice, with nothing loaded yet."""
+    app = App(data_dir=data_dir)
+    app.current_user = "alice"
+    return app
+
+
+def _file_io(app: App, action: str, answers, monkeypatch) -> tuple:
+    """Run app's action and return the data files it read and wrote."""
+    replies = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+    targets = [(App, "app", APP_ACTIONS), (TodoManager, "todo_manager", None),
+               (AuthManager, "auth_manager", None)]
+    with metrics.collecting(targets) as collected:
+        getattr(app, action)()
+    stats = collected.snapshot()[f"app.{action}"]
+    return stats["files_read"], stats["files_written"]
+
+
+@pytest.mark.parametrize("action", APP_ACTIONS)
+def test_cold_action_budget(action, data_dir, monkeypatch, capsys):
+    answers, budget, _ = BUDGETS[action]
+    reads, writes = _file_io(_app(data_dir), action, answers, monkeypatch)
+    assert reads <= budget[0] and writes <= budget[1]
+    out = capsys.readouterr().out
+    assert "Invalid" not in out and "Failed" not in out
+
+
+@pytest.mark.parametrize("action", APP_ACTIONS)
+def test_warm_action_budget(action, data_dir, monkeypatch, capsys):
+    answers, _, budget = BUDGETS[action]
+    app = _app(data_dir)
+    app.auth_manager.user_exists("alice")
+    app.todo_manager.get_all_todos()
+    reads, writes = _file_io(app, action, answers, monkeypatch)
+    assert reads <= budget[0] and writes <= budget[1]
+    out = capsys.readouterr().out
+    assert "Invalid" not in out and "Failed" not in out
+
+
+def test_budgets_cover_every_action():
+    assert set(BUDGETS) == set(APP_ACTIONS)
@@ -0,0 +1,106 @@
+"""Tests for the append-only JSON-Lines storage backend."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from admin import main as admin_main
+from managers import TodoManager
+from models import Priority, Status
+
+
+def _lines(data_dir):
+    return (Path(data_dir) / "todos.jsonl").read_text().splitlines()
+
+
+def test_create_appends_one_line(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    manager.create_todo("A", "", Priority.HIGH, owner="alice")
+    manager.create_todo("B", "", Priority.LOW, owner="bob")
+
+    assert len(_lines(temp_data_dir)) == 2
+    assert not (Path(temp_data_dir) / "todos.json").exists()
+
+
+def test_update_and_delete_append_records(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    todo = manager.create_todo("A", "", Priority.HIGH, owner="alice")
+    other = manager.create_todo("B", "", Priority.LOW, owner="alice")
+
+    todo.title = "A2"
+    manager.update_todo(todo)
+    assert manager.mark_as_completed(todo.id, "alice") is True
+    assert manager.delete_todo(other.id) is True
+    assert manager.delete_todo(other.id) is False
+
+    lines = [json.loads(line) for line in _lines(temp_data_dir)]
+    assert len(lines) == 5
+    assert lines[-1] == {"id": other.id, "deleted": True}
+
+    loaded = manager.get_todo_by_id(todo.id)
+    assert loaded.title == "A2"
+    assert loaded.status == Status.COMPLETED
+    assert manager.get_todo_by_id(other.id) is None
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [todo.id]
+
+
+def test_storage_is_detected_on_reopen(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+
+    reopened = TodoManager(data_dir=temp_data_dir)
+    assert reopened.storage == "jsonl"
+    assert reopened.get_todo_by_id(todo.id).title == "A"
+
+
+def test_appends_from_other_process_are_indexed(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    other = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+    manager.get_all_todos()
+
+    todo = other.create_todo("B", "", Priority.MID, owner="alice")
+
+    assert manager.get_todo_by_id(todo.id).title == "B"
+    assert manager.cache_stats["reloads"] == 0
+
+
+def test_compact_drops_dead_records(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+    for i in range(3):
+        todo.title = f"A{i}"
+        manager.update_todo(todo)
+
+    assert manager.compact() == 3
+    assert len(_lines(temp_data_dir)) == 1
+    assert manager.get_todo_by_id(todo.id).title == "A2"
+
+
+def test_admin_compact_checkpoints_the_index(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    for i in range(3):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner="alice")
+    index = Path(temp_data_dir) / "todos.jsonl.idx"
+    assert not index.exists()
+
+    assert admin_main(["--data-dir", temp_data_dir, "compact"]) == 0
+    assert len(json.loads(index.read_text())["offsets"]) == 3
+
+
+def test_garbage_ratio_triggers_compaction(temp_data_dir):
+    manager = TodoManager(
+        data_dir=temp_data_dir,
+        storage="jsonl",
+        compact_ratio=0.5,
+        compact_min_lines=4,
+    )
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+    for i in range(3):
+        todo.title = f"A{i}"
+        manager.update_todo(todo)
+
+    assert len(_lines(temp_data_dir)) == 1
+    assert manager.get_todo_by_id(todo.id).title == "A2"
@@ -0,0 +1,37 @@
+"""Tests for the incremental JSON array reader."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from jsonstream import iter_array
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64 * 1024])
+def test_iter_array_matches_json_load(chunk_size):
+    data = [
+        {"id": "1", "title": "a, ] tricky", "nested": [1, {"x": None}]},
+        123456,
+        -1.5e10,
+        True,
+        "plain",
+        [],
+    ]
+    text = json.dumps(data, indent=2)
+
+    assert list(iter_array(io.StringIO(text), chunk_size)) == data
+
+
+def test_iter_array_empty():
+    assert list(iter_array(io.StringIO("  [ ]  "))) == []
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1,", "[1 2]"])
+def test_iter_array_rejects_malformed(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(io.StringIO(text), 2))
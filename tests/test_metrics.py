@@ -0,0 +1,104 @@
+"""Tests for the opt-in instrumentation."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import metrics
+from main import APP_ACTIONS, App, _dump_metrics
+from managers import AuthManager, TodoManager
+from metrics import Histogram
+from models import ConflictError, Priority
+
+
+@pytest.fixture
+def collected():
+    """Instrument the app and managers for one test."""
+    yield metrics.enable([
+        (App, "app", APP_ACTIONS),
+        (TodoManager, "todo_manager", None),
+        (AuthManager, "auth_manager", None),
+    ])
+    metrics.disable()
+
+
+def test_histogram_percentiles_are_close():
+    h = Histogram()
+    for value in range(1, 100_001):
+        h.record(value * 1000)
+    assert (h.count, h.min, h.max) == (100_000, 1000, 100_000_000)
+    for p in (50, 90, 99):
+        assert abs(h.percentile(p) - p * 1_000_000) <= p * 1_000_000 * 0.0625
+    assert h.cumulative([0.001, 0.01, 1.0]) == pytest.approx([1000, 10_000, 100_000], rel=0.07)
+
+
+def test_disabled_leaves_classes_untouched(temp_data_dir):
+    original = TodoManager.create_todo
+    metrics.enable([(TodoManager, "todo_manager", None)])
+    assert TodoManager.create_todo is not original
+    metrics.disable()
+    assert TodoManager.create_todo is original
+    assert metrics.active is None
+    TodoManager(data_dir=temp_data_dir).create_todo("Quiet", "", Priority.LOW, "alice")
+
+
+def test_records_calls_errors_and_io(collected, temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, lock_free_reads=False)
+    todo = manager.create_todo("Milk", "", Priority.LOW, "alice")
+    manager.clear_cache()
+    manager.get_todos_by_owner("alice")
+    with pytest.raises(ConflictError):
+        manager.update_todo(todo, expected_version=7)
+
+    ops = collected.snapshot()
+    create = ops["todo_manager.create_todo"]
+    assert create["calls"] == 1 and create["bytes_written"] > 0
+    assert create["latency_us"]["p50"] > 0
+    by_owner = ops["todo_manager.get_todos_by_owner"]
+    size = (Path(temp_data_dir) / "todos.json").stat().st_size
+    assert (by_owner["bytes_read"], by_owner["items_decoded"]) == (size, 1)
+    assert ops["todo_manager.update_todo"]["errors"] == 1
+
+
+def test_app_actions_include_manager_io(collected, temp_data_dir, monkeypatch, capsys):
+    app = App(data_dir=temp_data_dir)
+    app.current_user = "alice"
+    answers = iter(["Bread", "", "2"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    app.create_todo()
+
+    ops = collected.snapshot()
+    action = ops["app.create_todo"]
+    assert action["calls"] == 1
+    assert action["bytes_written"] == ops["todo_manager.create_todo"]["bytes_written"] > 0
+
+    app.show_metrics()
+    out = capsys.readouterr().out
+    assert "app.create_todo" in out and "todo_manager.create_todo" in out
+
+
+def test_show_metrics_when_off(capsys, temp_data_dir):
+    App(data_dir=temp_data_dir).show_metrics()
+    assert "Instrumentation is off" in capsys.readouterr().out
+
+
+def test_dump_formats(collected, temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    for i in range(3):
+        manager.create_todo(f"T{i}", "", Priority.MID, "alice")
+
+    path = Path(temp_data_dir) / "metrics.json"
+    _dump_metrics(collected, str(path), "json")
+    assert json.loads(path.read_text())["operations"]["todo_manager.create_todo"]["calls"] == 3
+
+    _dump_metrics(collected, str(path), "prometheus")
+    text = path.read_text()
+    assert 'todo_op_calls_total{op="todo_manager.create_todo"} 3' in text
+    assert 'todo_op_latency_seconds_bucket{op="todo_manager.create_todo",le="+Inf"} 3' in text
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+               if line.startswith('todo_op_latency_seconds_bucket{op="todo_manager.create_todo"')]
+    assert buckets == sorted(buckets)
@@ -0,0 +1,90 @@
+"""Tests for the owner -> todo ID secondary index."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from indexes import OwnerIndex
+from managers import TodoManager
+from models import Priority
+from storage import JsonlTodoStore
+
+
+def test_owner_index_add_move_remove():
+    index = OwnerIndex()
+    index.add("1", "alice")
+    index.add("2", "bob")
+    index.add("3", "alice")
+    index.add("1", "alice")
+
+    assert index.ids_for("alice") == ["1", "3"]
+
+    index.add("3", "bob")
+    assert index.ids_for("alice") == ["1"]
+    assert index.ids_for("bob") == ["2", "3"]
+
+    index.remove("1")
+    index.remove("missing")
+    assert index.ids_for("alice") == []
+    assert OwnerIndex.from_dict(index.to_dict()).ids_for("bob") == ["2", "3"]
+
+
+def test_json_store_owner_lookup_follows_writes(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    a = manager.create_todo("A", "", Priority.MID, owner="alice")
+    b = manager.create_todo("B", "", Priority.MID, owner="bob")
+
+    b.owner = "alice"
+    manager.update_todo(b)
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [a.id, b.id]
+    assert manager.get_todos_by_owner("bob") == []
+
+    manager.delete_todo(a.id)
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [b.id]
+
+
+def test_jsonl_owner_lookup_only_decodes_owner_records(temp_data_dir, monkeypatch):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    for i in range(20):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner="bulk")
+    mine = manager.create_todo("Mine", "", Priority.HIGH, owner="alice")
+
+    decoded = []
+    original = JsonlTodoStore._read_at
+
+    def counting_read_at(f, offset):
+        decoded.append(offset)
+        return original(f, offset)
+
+    monkeypatch.setattr(JsonlTodoStore, "_read_at", staticmethod(counting_read_at))
+
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [mine.id]
+    assert len(decoded) == 1
+
+
+def test_jsonl_cold_start_uses_checkpoint(temp_data_dir, monkeypatch):
+    manager = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    for i in range(5):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner="alice")
+    manager.close()
+    assert (Path(temp_data_dir) / "todos.jsonl.idx").exists()
+
+    writer = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    extra = writer.create_todo("Late", "", Priority.MID, owner="alice")
+
+    scans = []
+    original = JsonlTodoStore._scan_from
+
+    def recording_scan(self, start):
+        scans.append(start)
+        original(self, start)
+
+    monkeypatch.setattr(JsonlTodoStore, "_scan_from", recording_scan)
+
+    reader = TodoManager(data_dir=temp_data_dir, storage="jsonl")
+    todos = reader.get_todos_by_owner("alice")
+
+    assert len(todos) == 6
+    assert todos[-1].id == extra.id
+    assert len(scans) == 1 and scans[0] > 0
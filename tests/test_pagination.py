@@ -0,0 +1,132 @@
+"""Tests for cursor-based pagination and the paged listing screens."""
+
+import base64
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from main import App
+from managers import TodoManager
+from models import Priority
+from paging import encode_cursor
+
+PRIORITIES = [Priority.LOW, Priority.HIGH, Priority.MID]
+
+
+def _fill(manager, count=25):
+    return manager.create_many(
+        {"title": f"T{count - i:02d}", "owner": f"user{i % 2}",
+         "priority": PRIORITIES[i % 3]}
+        for i in range(count)
+    )
+
+
+def _walk(manager, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = manager.list_todos(cursor=cursor, **kwargs)
+        pages.append([t.id for t in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite", "binary"])
+@pytest.mark.parametrize("order_by", ["created", "-created", "priority", "-title"])
+def test_pages_match_full_sort(temp_data_dir, storage, order_by):
+    manager = TodoManager(data_dir=temp_data_dir, storage=storage)
+    todos = _fill(manager)
+
+    field = order_by.lstrip("-")
+    key = {
+        "created": lambda t: (t.created_at, int(t.id)),
+        "priority": lambda t: (["HIGH", "MID", "LOW"].index(t.priority.value), int(t.id)),
+        "title": lambda t: (t.title, int(t.id)),
+    }[field]
+    expected = [t.id for t in sorted(todos, key=key, reverse=order_by.startswith("-"))]
+
+    pages = _walk(manager, limit=10, order_by=order_by)
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert [i for p in pages for i in p] == expected
+
+    owned = _walk(manager, owner="user1", limit=4, order_by=order_by)
+    assert [i for p in owned for i in p] == [
+        i for i in expected if manager.get_todo_by_id(i).owner == "user1"
+    ]
+    manager.close()
+
+
+def test_cursor_survives_inserts_and_deletes(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todos = _fill(manager, 6)
+    first = manager.list_todos(limit=3)
+
+    manager.delete_todo(todos[0].id)
+    manager.create_todo("New", "", Priority.MID, "user0")
+    second = manager.list_todos(limit=3, cursor=first.next_cursor)
+
+    assert [t.id for t in second.items] == [t.id for t in todos[3:6]]
+
+
+def test_exact_last_page_has_no_cursor(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    _fill(manager, 4)
+    assert manager.list_todos(limit=4).next_cursor is None
+    assert manager.list_todos(owner="nobody").items == []
+
+
+def test_invalid_arguments(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    _fill(manager, 3)
+    cursor = manager.list_todos(limit=1).next_cursor
+
+    with pytest.raises(ValueError):
+        manager.list_todos(order_by="owner")
+    with pytest.raises(ValueError):
+        manager.list_todos(limit=0)
+    with pytest.raises(ValueError):
+        manager.list_todos(cursor="not a cursor!")
+    with pytest.raises(ValueError):
+        manager.list_todos(cursor=cursor, order_by="title")
+    with pytest.raises(ValueError):
+        manager.list_todos(cursor=encode_cursor("title", ("x", 1, "1")), order_by="created")
+    with pytest.raises(ValueError):
+        manager.list_todos(cursor=base64.urlsafe_b64encode(b'["created",5]').decode())
+    for key in ([[1, 2, 3]], [5, 1, "1"], ["x", "1", "1"], ["x", True, "1"]):
+        with pytest.raises(ValueError):
+            manager.list_todos(cursor=encode_cursor("created", key))
+    with pytest.raises(ValueError):
+        manager.list_todos(cursor=encode_cursor("priority", ("HIGH", 1, "1")), order_by="priority")
+
+
+def test_view_todos_pages_forward_and_back(monkeypatch, capsys, temp_data_dir):
+    app = App(data_dir=temp_data_dir)
+    app.current_user = "user0"
+    app.page_size = 5
+    _fill(app.todo_manager, 24)  # 12 todos for user0
+
+    answers = iter(["n", "n", "p", "q"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    app.view_todos()
+    out = capsys.readouterr().out
+
+    assert out.count("Page 1") == 1
+    assert out.count("Page 2") == 2
+    assert out.count("Page 3") == 1
+    assert "\n12. " in out and "\n13. " not in out
+
+
+def test_single_page_does_not_prompt(monkeypatch, capsys, temp_data_dir):
+    app = App(data_dir=temp_data_dir)
+    app.current_user = "user0"
+    _fill(app.todo_manager, 4)
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": pytest.fail("prompted"))
+    app.view_todos()
+    app.view_all_todos()
+    out = capsys.readouterr().out
+    assert "Owner: user1" in out
+    assert "Page" not in out
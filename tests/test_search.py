@@ -0,0 +1,106 @@
+"""Tests for the full-text search index and TodoManager.search_todos."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from main import App
+from managers import TodoManager
+from models import Priority, Status, TodoItem
+from search import SearchIndex, parse_query, tokenize
+
+
+def test_tokenize_and_parse_query():
+    assert tokenize("Buy MILK, eggs & to-do!") == ["buy", "milk", "eggs", "to", "do"]
+    assert parse_query("milk bread OR eggs") == [["milk", "bread"], ["eggs"]]
+    assert parse_query("OR | milk") == [["milk"]]
+    assert parse_query("   ") == []
+
+
+def test_and_or_queries_are_ranked(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    milk = manager.create_todo("Buy milk", "from the corner shop", Priority.MID, "alice")
+    both = manager.create_todo("Shopping", "milk and bread", Priority.MID, "alice")
+    eggs = manager.create_todo("Eggs", "a dozen", Priority.MID, "alice")
+
+    assert [t.id for t in manager.search_todos("milk bread")] == [both.id]
+    # A title hit outranks a details hit for the same word.
+    assert [t.id for t in manager.search_todos("milk")] == [milk.id, both.id]
+    assert {t.id for t in manager.search_todos("bread OR eggs")} == {both.id, eggs.id}
+    assert manager.search_todos("milk", limit=1)[0].id == milk.id
+    assert manager.search_todos("nothing") == []
+
+
+def test_owner_filter(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    mine = manager.create_todo("Report", "quarterly", Priority.MID, "alice")
+    manager.create_todo("Report", "annual", Priority.MID, "bob")
+
+    assert [t.id for t in manager.search_todos("report", owner="alice")] == [mine.id]
+    assert len(manager.search_todos("report")) == 2
+    assert manager.search_todos("report", owner="carol") == []
+
+
+def test_index_follows_writes(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo = manager.create_todo("Call plumber", "", Priority.MID, "alice")
+    assert len(manager.search_todos("plumber")) == 1
+
+    todo.title = "Call electrician"
+    manager.update_todo(todo)
+    assert manager.search_todos("plumber") == []
+    assert [t.id for t in manager.search_todos("electrician")] == [todo.id]
+
+    added = manager.create_many([{"title": "Electrician invoice", "owner": "alice"}])
+    assert len(manager.search_todos("electrician")) == 2
+
+    manager.delete_many([added[0].id])
+    manager.delete_todo(todo.id)
+    assert manager.search_todos("electrician") == []
+
+
+def test_index_follows_other_managers_writes(temp_data_dir):
+    first = TodoManager(data_dir=temp_data_dir)
+    pie = first.create_todo("Apple pie", "", Priority.MID, "alice")
+    assert [t.id for t in first.search_todos("apple")] == [pie.id]
+    index = first._search
+    first.create_todo("Plum jam", "", Priority.MID, "alice")
+    assert len(first.search_todos("jam")) == 1
+    assert first._search is index  # own writes update it in place
+
+    second = TodoManager(data_dir=temp_data_dir)
+    bread = second.create_todo("Banana bread", "", Priority.MID, "alice")
+    pie.title = "Cherry"
+    second.update_todo(pie)
+
+    assert [t.id for t in first.search_todos("banana")] == [bread.id]
+    assert [t.id for t in first.search_todos("cherry")] == [pie.id]
+    assert first.search_todos("apple") == []
+
+
+def test_remove_cleans_postings():
+    index = SearchIndex()
+    item = TodoItem(id="1", title="alpha beta", details="beta", priority=Priority.MID,
+                    status=Status.PENDING, owner="alice")
+    index.add(item)
+    index.add(item)
+    assert len(index) == 1
+    index.remove("1")
+    assert len(index) == 0
+    assert index._postings == {} and index._by_owner == {}
+    assert index._total_length == 0
+
+
+def test_search_menu_lists_matches(monkeypatch, capsys, temp_data_dir):
+    app = App(data_dir=temp_data_dir)
+    app.current_user = "alice"
+    app.todo_manager.create_todo("Water plants", "balcony", Priority.LOW, "alice")
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": "plants")
+    app.search_todos()
+    assert "Water plants" in capsys.readouterr().out
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": "cactus")
+    app.search_todos()
+    assert "No matching todos." in capsys.readouterr().out
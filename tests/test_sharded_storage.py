@@ -0,0 +1,110 @@
+"""Tests for the per-owner sharded storage backend."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from admin import main as admin_main
+from managers import TodoManager
+from models import Priority, Status
+from storage import shard_filename, shard_index
+
+
+def _shard_path(data_dir, owner, buckets):
+    return Path(data_dir) / "shards" / shard_filename(shard_index(owner, buckets))
+
+
+def test_write_touches_only_owner_shard(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="sharded", buckets=8)
+    owners = ["alice", "bob"]
+    assert shard_index("alice", 8) != shard_index("bob", 8)
+
+    bob_todo = manager.create_todo("B", "", Priority.LOW, owner="bob")
+    bob_mtime = _shard_path(temp_data_dir, "bob", 8).stat().st_mtime_ns
+    manager.create_todo("A", "", Priority.HIGH, owner="alice")
+
+    assert _shard_path(temp_data_dir, "bob", 8).stat().st_mtime_ns == bob_mtime
+    for owner in owners:
+        assert len(manager.get_todos_by_owner(owner)) == 1
+    assert manager.get_todo_by_id(bob_todo.id).title == "B"
+
+
+def test_crud_and_owner_change(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="sharded", buckets=8)
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+
+    assert manager.mark_as_completed(todo.id, "bob") is False
+    assert manager.mark_as_completed(todo.id, "alice") is True
+    assert manager.get_todo_by_id(todo.id).status == Status.COMPLETED
+
+    todo = manager.get_todo_by_id(todo.id)
+    todo.owner = "bob"
+    manager.update_todo(todo)
+    assert manager.get_todos_by_owner("alice") == []
+    assert [t.id for t in manager.get_todos_by_owner("bob")] == [todo.id]
+    assert len(manager.get_all_todos()) == 1
+
+    assert manager.delete_todo(todo.id) is True
+    assert manager.delete_todo(todo.id) is False
+
+
+def test_reopen_keeps_bucket_count(temp_data_dir):
+    TodoManager(data_dir=temp_data_dir, storage="sharded", buckets=4).create_todo(
+        "A", "", Priority.MID, owner="alice"
+    )
+
+    reopened = TodoManager(data_dir=temp_data_dir)
+    assert reopened.storage == "sharded"
+    assert reopened._store.buckets == 4
+    assert len(list(reopened.iter_todos())) == 1
+
+
+def test_migrate_command_splits_existing_file(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    for i in range(10):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner=f"user{i % 4}")
+
+    assert admin_main(["--data-dir", temp_data_dir, "migrate", "--to", "sharded",
+                       "--buckets", "3"]) == 0
+
+    meta = json.loads((Path(temp_data_dir) / "shards" / "meta.json").read_text())
+    assert meta == {"buckets": 3}
+    assert not (Path(temp_data_dir) / "todos.json").exists()
+
+    sharded = TodoManager(data_dir=temp_data_dir)
+    assert sharded.storage == "sharded"
+    assert sorted(int(t.id) for t in sharded.iter_todos()) == list(range(1, 11))
+    assert len(sharded.get_todos_by_owner("user1")) == 3
+
+
+def test_update_and_delete_load_one_shard(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="sharded", buckets=16)
+    todos = [manager.create_todo(f"T{i}", "", Priority.MID, owner=f"user{i}") for i in range(32)]
+
+    def loaded(m):
+        return sum(shard._cache is not None for shard in m._store._shards)
+
+    fresh = TodoManager(data_dir=temp_data_dir, lock_free_reads=False)
+    todo = todos[-1]
+    todo.title = "Edited"
+    fresh.update_todo(todo)
+    assert loaded(fresh) == 1
+    assert fresh.get_todo_by_id(todo.id).title == "Edited"
+    assert loaded(fresh) == 1
+
+    assert fresh.delete_todo(todo.id) is True
+    assert loaded(fresh) == 1
+    assert fresh.get_todo_by_id(todo.id) is None
+
+
+def test_owner_read_loads_one_shard(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="sharded", buckets=16)
+    for i in range(32):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner=f"user{i}")
+
+    fresh = TodoManager(data_dir=temp_data_dir)
+    assert not fresh.lock_free_reads
+    assert len(fresh.get_todos_by_owner("user3")) == 1
+    assert sum(shard._cache is not None for shard in fresh._store._shards) == 1
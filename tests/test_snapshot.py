@@ -0,0 +1,88 @@
+"""Tests for the parsed-snapshot cache used on cold start."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import codec
+from managers import AuthManager, TodoManager
+from models import Priority
+from snapshot import SnapshotCache
+
+
+def _fail_parse(*args, **kwargs):
+    raise AssertionError("JSON was parsed")
+
+
+def test_cold_start_uses_snapshot(temp_data_dir, monkeypatch):
+    manager = TodoManager(data_dir=temp_data_dir, snapshot=True)
+    for i in range(5):
+        manager.create_todo(f"T{i}", "", Priority.MID, owner=f"user{i % 2}")
+    manager.close()
+    assert (Path(temp_data_dir) / "todos.json.snap").exists()
+
+    monkeypatch.setattr(codec, "loads", _fail_parse)
+    reopened = TodoManager(data_dir=temp_data_dir, snapshot=True)
+    assert [t.title for t in reopened.get_all_todos()] == [f"T{i}" for i in range(5)]
+    assert len(reopened.get_todos_by_owner("user0")) == 3
+
+
+def test_snapshot_rejected_when_content_changes(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, snapshot=True)
+    todo = manager.create_todo("Before", "", Priority.MID, owner="alice")
+    manager.close()
+
+    # Rewrite with the same size and mtime; only the hash can tell.
+    path = Path(temp_data_dir) / "todos.json"
+    st = path.stat()
+    path.write_text(path.read_text().replace("Before", "Afters"))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    reopened = TodoManager(data_dir=temp_data_dir, snapshot=True)
+    assert reopened.get_todo_by_id(todo.id).title == "Afters"
+
+
+def test_missing_or_corrupt_snapshot_falls_back(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, snapshot=True)
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+    manager.close()
+    snap = Path(temp_data_dir) / "todos.json.snap"
+
+    snap.write_bytes(snap.read_bytes()[:40])
+    assert len(TodoManager(data_dir=temp_data_dir, snapshot=True).get_all_todos()) == 1
+
+    snap.unlink()
+    assert len(TodoManager(data_dir=temp_data_dir, snapshot=True).get_all_todos()) == 1
+    # A cold start without a valid snapshot writes a fresh one.
+    assert snap.exists()
+
+
+def test_snapshot_is_opt_in(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+    manager.close()
+    assert not (Path(temp_data_dir) / "todos.json.snap").exists()
+
+
+def test_auth_manager_snapshot(temp_data_dir, monkeypatch):
+    auth = AuthManager(data_dir=temp_data_dir, snapshot=True)
+    assert auth.sign_up("alice", "pw")
+    assert (Path(temp_data_dir) / "users.json.snap").exists()
+
+    monkeypatch.setattr(json, "loads", _fail_parse)
+    assert AuthManager(data_dir=temp_data_dir, snapshot=True).login("alice", "pw")
+
+
+def test_snapshot_cache_round_trip(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_bytes(b'{"a": 1}')
+    cache = SnapshotCache(source)
+    assert cache.load() is None
+
+    cache.save({"a": 1}, source.read_bytes())
+    assert cache.load() == {"a": 1}
+    cache.clear()
+    assert cache.load() is None
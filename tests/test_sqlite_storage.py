@@ -0,0 +1,99 @@
+"""Tests for the SQLite storage backend and the JSON migrator."""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import TodoManager
+from models import Priority, Status
+from storage import migrate_json_to_sqlite
+
+
+def test_crud_through_manager(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, storage="sqlite")
+    t1 = manager.create_todo("A", "a", Priority.HIGH, owner="alice")
+    t2 = manager.create_todo("B", "b", Priority.LOW, owner="bob")
+    t3 = manager.create_todo("C", "c", Priority.MID, owner="alice")
+
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [t1.id, t3.id]
+
+    t1.title = "A2"
+    manager.update_todo(t1)
+    assert manager.get_todo_by_id(t1.id).title == "A2"
+    assert [t.id for t in manager.get_all_todos()] == [t1.id, t2.id, t3.id]
+
+    assert manager.mark_as_completed(t2.id, "alice") is False
+    assert manager.mark_as_completed(t2.id, "bob") is True
+    assert manager.get_todo_by_id(t2.id).status == Status.COMPLETED
+
+    assert manager.delete_todo(t3.id) is True
+    assert manager.delete_todo(t3.id) is False
+    manager.close()
+
+    reopened = TodoManager(data_dir=temp_data_dir)
+    assert reopened.storage == "sqlite"
+    assert len(reopened.get_all_todos()) == 2
+    reopened.close()
+
+
+def test_database_uses_wal_and_indexes(temp_data_dir):
+    TodoManager(data_dir=temp_data_dir, storage="sqlite").close()
+
+    conn = sqlite3.connect(Path(temp_data_dir) / "todos.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM todos WHERE owner = ? ORDER BY seq",
+        ("alice",),
+    ).fetchall()
+    assert "idx_todos_owner" in plan[0][3]
+    conn.close()
+
+
+def test_migrate_json_to_sqlite(temp_data_dir):
+    json_manager = TodoManager(data_dir=temp_data_dir)
+    created = [
+        json_manager.create_todo(f"T{i}", "", Priority.MID, owner=f"user{i % 3}")
+        for i in range(7)
+    ]
+
+    assert migrate_json_to_sqlite(temp_data_dir, batch_size=3) == 7
+    assert not (Path(temp_data_dir) / "todos.json").exists()
+    assert (Path(temp_data_dir) / "todos.json.migrated").exists()
+
+    manager = TodoManager(data_dir=temp_data_dir)
+    assert manager.storage == "sqlite"
+    assert [t.id for t in manager.get_all_todos()] == [t.id for t in created]
+    assert len(manager.get_todos_by_owner("user0")) == 3
+    manager.close()
+
+
+def test_migrate_refuses_existing_database(temp_data_dir):
+    TodoManager(data_dir=temp_data_dir).create_todo("A", "", Priority.MID, "alice")
+    TodoManager(data_dir=temp_data_dir, storage="sqlite").close()
+
+    with pytest.raises(FileExistsError):
+        migrate_json_to_sqlite(temp_data_dir)
+
+
+def test_migrate_waits_for_writers(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+    migrated = []
+    migration = threading.Thread(target=lambda: migrated.append(migrate_json_to_sqlite(temp_data_dir)))
+
+    with manager._lock.exclusive():
+        migration.start()
+        migration.join(0.2)
+        assert migration.is_alive()
+        # A write made while the migration waits is part of what it copies.
+        manager.create_todo("B", "", Priority.MID, owner="alice")
+    migration.join()
+
+    assert migrated == [2]
+    titles = [t.title for t in TodoManager(data_dir=temp_data_dir).get_all_todos()]
+    assert titles == ["A", "B"]
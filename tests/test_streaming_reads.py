@@ -0,0 +1,96 @@
+"""Tests for streaming reads through TodoManager.iter_todos."""
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import TodoManager
+from models import Priority
+
+
+def _write_todos(data_dir, count, owners=("alice", "bob")):
+    todos = [
+        {
+            "id": str(i),
+            "title": f"Todo {i}",
+            "details": "x" * 100,
+            "priority": "MID",
+            "status": "PENDING",
+            "owner": owners[i % len(owners)],
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+        }
+        for i in range(1, count + 1)
+    ]
+    (Path(data_dir) / "todos.json").write_text(json.dumps(todos, indent=2))
+
+
+@pytest.mark.parametrize("storage", ["json", "jsonl", "sqlite", "sharded"])
+def test_iter_todos_filters_by_owner(temp_data_dir, storage):
+    manager = TodoManager(data_dir=temp_data_dir, storage=storage)
+    manager.create_many(
+        {"title": f"T{i}", "priority": Priority.MID, "owner": ("alice", "bob")[i % 2]}
+        for i in range(6)
+    )
+
+    assert len(list(manager.iter_todos())) == 6
+    assert [t.title for t in manager.iter_todos(owner="bob")] == ["T1", "T3", "T5"]
+    manager.close()
+
+
+def test_iter_todos_does_not_fill_cache(temp_data_dir):
+    _write_todos(temp_data_dir, 10)
+    manager = TodoManager(data_dir=temp_data_dir)
+
+    assert len(list(manager.iter_todos())) == 10
+    assert manager.cache_stats == {"hits": 0, "misses": 0, "reloads": 0}
+
+
+def test_non_resident_lookup_stops_at_match(temp_data_dir):
+    good = [{"id": "1", "title": "first", "owner": "alice"},
+            {"id": "2", "title": "second", "owner": "alice"}]
+    # Anything after the match is never parsed.
+    (Path(temp_data_dir) / "todos.json").write_text(
+        json.dumps(good)[:-1] + ', {"id": "3", "broken'
+    )
+    manager = TodoManager(data_dir=temp_data_dir, resident=False)
+
+    assert manager.get_todo_by_id("2").title == "second"
+    with pytest.raises(json.JSONDecodeError):
+        manager.get_todo_by_id("missing")
+
+
+def test_non_resident_lookups_still_stream_after_writes(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, resident=False)
+    todo = manager.create_todo("First", "", Priority.MID, "alice")
+    todo.title = "Edited"
+    manager.update_todo(todo)
+    stats = manager.cache_stats
+
+    assert manager.get_todo_by_id(todo.id).title == "Edited"
+    assert [t.id for t in manager.get_todos_by_owner("alice")] == [todo.id]
+    assert manager.cache_stats == stats  # answered without the cache
+    assert not manager._store.is_cached()
+
+
+def test_streaming_peak_memory_is_much_lower_than_full_load(temp_data_dir):
+    _write_todos(temp_data_dir, 5000)
+    streaming = TodoManager(data_dir=temp_data_dir, resident=False)
+    loading = TodoManager(data_dir=temp_data_dir)
+
+    tracemalloc.start()
+    assert len(streaming.get_todos_by_owner("nobody")) == 0
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    assert len(loading.get_todos_by_owner("nobody")) == 0
+    _, load_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert stream_peak * 4 < load_peak
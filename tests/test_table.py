@@ -0,0 +1,97 @@
+"""Tests for the columnar TodoTable."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+np = pytest.importorskip("numpy")
+
+from managers import TodoManager
+from models import Priority, Status, TodoItem
+from table import TodoTable
+
+
+def _todo(i, owner, priority, status, created):
+    return TodoItem(
+        id=str(i),
+        title=f"T{i}",
+        details=f"D{i}",
+        priority=priority,
+        status=status,
+        owner=owner,
+        created_at=created,
+        updated_at=created,
+        version=i,
+    )
+
+
+@pytest.fixture
+def table():
+    return TodoTable.from_todos([
+        _todo(1, "alice", Priority.HIGH, Status.PENDING, "2024-01-01T09:00:00"),
+        _todo(2, "bob", Priority.LOW, Status.COMPLETED, "2024-02-01T09:00:00"),
+        _todo(3, "alice", Priority.HIGH, Status.COMPLETED, "2024-03-01T09:00:00.250000"),
+        _todo(4, "carol", Priority.MID, Status.PENDING, "2024-03-15T00:00:00"),
+        _todo(5, "alice", Priority.LOW, Status.PENDING, "not a date"),
+    ])
+
+
+def test_columns_are_encoded(table):
+    assert table.owner.dtype == np.int32
+    assert table.priority.dtype == np.int8
+    assert table.created.dtype == np.int64
+    assert table.owners == ["alice", "bob", "carol"]
+    assert list(table.owner) == [0, 1, 0, 2, 0]
+
+
+def test_filter_combines_criteria(table):
+    assert list(table.filter(owner="alice", priority=Priority.HIGH).ids) == ["1", "3"]
+    assert list(table.filter(status=Status.PENDING, owner=["bob", "carol"]).ids) == ["4"]
+    assert list(
+        table.filter(created_from="2024-02-01T09:00:00", created_to="2024-03-15").ids
+    ) == ["2", "3"]
+    assert table.count(owner="nobody") == 0
+    assert len(table.filter(priority=[Priority.HIGH, Priority.LOW])) == 4
+    with pytest.raises(ValueError):
+        table.filter(created_from="not a date")
+    with pytest.raises(ValueError):
+        table.count(updated_to="2024-13-45")
+
+
+def test_count_by(table):
+    assert table.count_by("owner") == {"alice": 3, "bob": 1, "carol": 1}
+    assert table.count_by("status") == {Status.PENDING: 3, Status.COMPLETED: 2}
+    assert table.count_by("owner", "status") == {
+        ("alice", Status.PENDING): 2,
+        ("alice", Status.COMPLETED): 1,
+        ("bob", Status.COMPLETED): 1,
+        ("carol", Status.PENDING): 1,
+    }
+    with pytest.raises(ValueError):
+        table.count_by("title")
+
+
+def test_rows_materialize_on_demand(table):
+    filtered = table.filter(owner="alice", status=Status.COMPLETED)
+    (todo,) = list(filtered.rows())
+
+    assert todo.id == "3"
+    assert todo.owner == "alice"
+    assert todo.priority == Priority.HIGH
+    assert todo.created_at == "2024-03-01T09:00:00.250000"
+    assert todo.version == 3
+
+
+def test_from_manager(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    manager.create_todo("A", "", Priority.HIGH, owner="alice")
+    manager.create_todo("B", "", Priority.LOW, owner="bob")
+
+    table = TodoTable.from_manager(manager)
+
+    assert len(table) == 2
+    assert table.count_by("priority") == {Priority.HIGH: 1, Priority.LOW: 1}
+    assert len(TodoTable.from_todos([]).filter(owner="alice")) == 0
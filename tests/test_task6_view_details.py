@@ -24,9 +24,7 @@ def test_view_todo_details_shows_all_fields(monkeypatch, capsys, temp_data_dir):
         owner="tester",
     )
 
-    app = App()
-    # Use the test data dir
-    app.todo_manager = TodoManager(data_dir=temp_data_dir)
+    app = App(data_dir=temp_data_dir)
     app.current_user = "tester"
 
     # Simulate user entering the todo id
@@ -45,8 +43,7 @@ def test_view_todo_details_shows_all_fields(monkeypatch, capsys, temp_data_dir):
 
 
 def test_view_todo_details_nonexistent_id(monkeypatch, capsys, temp_data_dir):
-    app = App()
-    app.todo_manager = TodoManager(data_dir=temp_data_dir)
+    app = App(data_dir=temp_data_dir)
     app.current_user = "tester"
 
     monkeypatch.setattr("builtins.input", lambda prompt='': "nonexistent-id")
@@ -58,8 +55,7 @@ def test_view_todo_details_nonexistent_id(monkeypatch, capsys, temp_data_dir):
 
 
 def test_view_todo_details_empty_id(monkeypatch, capsys, temp_data_dir):
-    app = App()
-    app.todo_manager = TodoManager(data_dir=temp_data_dir)
+    app = App(data_dir=temp_data_dir)
     app.current_user = "tester"
 
     monkeypatch.setattr("builtins.input", lambda prompt='': "")
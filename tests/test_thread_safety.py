@@ -0,0 +1,159 @@
+"""Tests for sharing one TodoManager between threads."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import TodoManager
+from models import ConflictError, Priority, TodoItem
+from readview import ReadView
+
+
+def _run(workers):
+    threads = [threading.Thread(target=w) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_creates_get_unique_ids(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir, id_block_size=4)
+
+    def worker(n):
+        return lambda: [manager.create_todo(f"T{n}-{i}", "", Priority.LOW, f"u{n}") for i in range(25)]
+
+    _run([worker(n) for n in range(8)])
+    todos = manager.get_all_todos()
+    assert len(todos) == 200
+    assert len({t.id for t in todos}) == 200
+    assert len(TodoManager(data_dir=temp_data_dir).get_all_todos()) == 200
+
+
+def test_concurrent_cas_updates_lose_nothing(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo_id = manager.create_todo("Counter", "0", Priority.MID, "alice").id
+
+    def increment():
+        for _ in range(20):
+            while True:
+                todo = manager.get_todo_by_id(todo_id)
+                todo.details = str(int(todo.details) + 1)
+                try:
+                    manager.update_todo(todo, expected_version=todo.version)
+                    break
+                except ConflictError:
+                    pass
+
+    _run([increment] * 4)
+    todo = manager.get_todo_by_id(todo_id)
+    assert todo.details == "80"
+    assert todo.version == 81
+
+
+def test_readers_see_whole_writes(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    assert manager.lock_free_reads
+    done = threading.Event()
+    torn = []
+
+    def writer():
+        for i in range(30):
+            manager.create_many(
+                [{"title": f"B{i}", "owner": "alice"} for _ in range(5)]
+            )
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            count = len(manager.get_todos_by_owner("alice"))
+            if count % 5:
+                torn.append(count)
+
+    _run([writer, reader, reader])
+    assert torn == []
+    assert len(manager.get_todos_by_owner("alice")) == 150
+
+
+def test_view_notices_writes_by_other_managers(temp_data_dir):
+    first = TodoManager(data_dir=temp_data_dir)
+    second = TodoManager(data_dir=temp_data_dir)
+    todo = first.create_todo("Milk", "", Priority.LOW, "alice")
+    assert first.get_todo_by_id(todo.id).title == "Milk"
+
+    other = second.get_todo_by_id(todo.id)
+    other.title = "Oat milk"
+    second.update_todo(other)
+    second.create_todo("Bread", "", Priority.LOW, "alice")
+
+    assert first.get_todo_by_id(todo.id).title == "Oat milk"
+    assert [t.title for t in first.get_todos_by_owner("alice")] == ["Oat milk", "Bread"]
+
+
+def test_returned_todos_do_not_alias_the_view(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo = manager.create_todo("Milk", "", Priority.LOW, "alice")
+    manager.get_todo_by_id(todo.id).title = "Changed"
+    todo.title = "Also changed"
+    assert manager.get_todo_by_id(todo.id).title == "Milk"
+
+
+def test_updated_view_leaves_the_old_one_alone():
+    todos = [TodoItem(id=str(i), title=f"T{i}", owner="alice" if i % 2 else "bob") for i in range(1, 5)]
+    old = ReadView.build(todos, generation=1)
+    moved = TodoItem(id="1", title="Moved", owner="bob")
+    new = old.updated([moved, TodoItem(id="9", title="New", owner="carol")], ["2"], generation=2)
+
+    assert [t.title for t in old.by_owner("alice")] == ["T1", "T3"]
+    assert [t.title for t in old.by_owner("bob")] == ["T2", "T4"]
+    assert old.get("9") is None and len(old) == 4
+
+    assert [t.title for t in new.by_owner("alice")] == ["T3"]
+    assert [t.title for t in new.by_owner("bob")] == ["T4", "Moved"]
+    assert [t.title for t in new.by_owner("carol")] == ["New"]
+    assert [t.id for t in new.all()] == ["1", "3", "4", "9"]
+    assert new.generation == 2
+
+
+@pytest.mark.parametrize("storage, options", [
+    ("json", {}),
+    ("jsonl", {"compact_min_lines": 20, "compact_ratio": 0.2}),
+    ("binary", {"slot_count": 8}),
+    ("sqlite", {}),
+    ("sharded", {"buckets": 4}),
+])
+def test_streaming_reads_survive_concurrent_writes(temp_data_dir, storage, options):
+    manager = TodoManager(data_dir=temp_data_dir, storage=storage, lock_free_reads=False, **options)
+    manager.iter_chunk = 3
+    todos = [manager.create_todo(f"T{i}", "", Priority.LOW, f"u{i % 3}") for i in range(12)]
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        try:
+            for i in range(60):
+                todo = todos[i % len(todos)]
+                todo.details = f"edit {i}"
+                manager.update_todo(todo)
+                extra = manager.create_todo(f"X{i}", "", Priority.LOW, "u0")
+                manager.delete_todo(extra.id)
+        finally:
+            done.set()
+
+    def reader():
+        while not done.is_set():
+            try:
+                seen = [t.id for t in manager.iter_todos()]
+            except Exception as exc:  # noqa: BLE001 - reported below
+                errors.append(exc)
+                return
+            base = [t.id for t in todos]
+            if not set(base) <= set(seen) or len(seen) != len(set(seen)):
+                errors.append(seen)
+
+    _run([writer, reader, reader, reader])
+    assert errors == []
@@ -0,0 +1,59 @@
+"""Tests for the resident todo cache in TodoManager."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from managers import TodoManager
+from models import Priority
+
+
+def test_repeated_reads_hit_cache(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+
+    manager.get_todos_by_owner("alice")
+    manager.get_todo_by_id("1")
+    manager.get_all_todos()
+
+    assert manager.cache_stats["misses"] == 1
+    assert manager.cache_stats["reloads"] == 0
+    assert manager.cache_stats["hits"] >= 3
+
+
+def test_external_write_triggers_reload(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    other = TodoManager(data_dir=temp_data_dir)
+    manager.create_todo("A", "", Priority.MID, owner="alice")
+    assert len(manager.get_all_todos()) == 1
+
+    other.create_todo("B", "", Priority.LOW, owner="alice")
+
+    assert len(manager.get_todos_by_owner("alice")) == 2
+    assert manager.cache_stats["reloads"] == 1
+
+
+def test_file_rewritten_outside_manager_is_detected(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo = manager.create_todo("A", "", Priority.MID, owner="alice")
+    manager.get_all_todos()
+
+    todos_file = Path(temp_data_dir) / "todos.json"
+    data = json.loads(todos_file.read_text())
+    data[0]["title"] = "Changed elsewhere"
+    todos_file.write_text(json.dumps(data))
+
+    assert manager.get_todo_by_id(todo.id).title == "Changed elsewhere"
+
+
+def test_mutating_returned_todo_does_not_touch_cache(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo = manager.create_todo("Original", "", Priority.MID, owner="alice")
+
+    todo.title = "Unsaved edit"
+    fetched = manager.get_todo_by_id(todo.id)
+    fetched.title = "Another unsaved edit"
+
+    assert manager.get_todo_by_id(todo.id).title == "Original"
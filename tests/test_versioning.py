@@ -0,0 +1,160 @@
+"""Tests for per-todo versions and compare-and-swap updates."""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from main import App
+from managers import TodoManager
+from models import ConflictError, Priority, Status
+
+
+@pytest.mark.parametrize("storage", ["json", "jsonl", "sqlite", "binary", "sharded"])
+def test_every_write_bumps_version(temp_data_dir, storage):
+    manager = TodoManager(data_dir=temp_data_dir, storage=storage)
+    todo = manager.create_todo("A", "", Priority.MID, "alice")
+    assert todo.version == 1
+
+    todo.title = "B"
+    manager.update_todo(todo, expected_version=1)
+    assert todo.version == 2
+    assert manager.mark_as_completed(todo.id, "alice")
+    manager.update_many([manager.get_todo_by_id(todo.id)])
+    manager.complete_many([todo.id], "alice")
+    manager.close()
+
+    reopened = TodoManager(data_dir=temp_data_dir, storage=storage)
+    assert reopened.get_todo_by_id(todo.id).version == 5
+
+
+def test_stale_update_raises_conflict(temp_data_dir):
+    first = TodoManager(data_dir=temp_data_dir)
+    second = TodoManager(data_dir=temp_data_dir)
+    todo = first.create_todo("Original", "", Priority.MID, "alice")
+
+    mine = first.get_todo_by_id(todo.id)
+    theirs = second.get_todo_by_id(todo.id)
+    theirs.title = "Theirs"
+    second.update_todo(theirs, expected_version=theirs.version)
+
+    mine.title = "Mine"
+    with pytest.raises(ConflictError) as excinfo:
+        first.update_todo(mine, expected_version=mine.version)
+    assert (excinfo.value.expected_version, excinfo.value.actual_version) == (1, 2)
+    assert first.get_todo_by_id(todo.id).title == "Theirs"
+
+    # Without expected_version the update is unconditional, as before.
+    first.update_todo(mine)
+    assert first.get_todo_by_id(todo.id).title == "Mine"
+    assert mine.version == 3
+
+
+def test_update_of_deleted_todo_conflicts(temp_data_dir):
+    manager = TodoManager(data_dir=temp_data_dir)
+    todo = manager.create_todo("A", "", Priority.MID, "alice")
+    manager.delete_todo(todo.id)
+
+    with pytest.raises(ConflictError) as excinfo:
+        manager.update_todo(todo, expected_version=1)
+    assert excinfo.value.actual_version is None
+    assert manager.get_todo_by_id(todo.id) is None
+
+
+def test_records_without_version_read_as_version_one(temp_data_dir):
+    record = {"id": "1", "title": "Old", "details": "", "priority": "MID",
+              "status": "PENDING", "owner": "alice",
+              "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+    (Path(temp_data_dir) / "todos.json").write_text(json.dumps([record]))
+    assert TodoManager(data_dir=temp_data_dir).get_todo_by_id("1").version == 1
+
+
+def test_sqlite_database_without_version_column_is_upgraded(temp_data_dir):
+    conn = sqlite3.connect(Path(temp_data_dir) / "todos.db")
+    conn.execute(
+        "CREATE TABLE todos (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE,"
+        " title TEXT NOT NULL, details TEXT NOT NULL, priority TEXT NOT NULL,"
+        " status TEXT NOT NULL, owner TEXT NOT NULL, created_at TEXT NOT NULL,"
+        " updated_at TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO todos (id, title, details, priority, status, owner, created_at,"
+        " updated_at) VALUES ('1', 'Old', '', 'MID', 'PENDING', 'alice', 'x', 'x')"
+    )
+    conn.commit()
+    conn.close()
+
+    manager = TodoManager(data_dir=temp_data_dir, storage="sqlite")
+    todo = manager.get_todo_by_id("1")
+    assert todo.version == 1
+    manager.update_todo(todo, expected_version=1)
+    assert manager.get_todo_by_id("1").version == 2
+    manager.close()
+
+
+def _edit_during_prompt(monkeypatch, temp_data_dir, retry):
+    app = App(data_dir=temp_data_dir)
+    app.current_user = "alice"
+    todo = app.todo_manager.create_todo("Original", "", Priority.MID, "alice")
+    other = TodoManager(data_dir=temp_data_dir)
+
+    def answer(prompt=""):
+        if prompt.startswith("New title"):
+            # Someone else saves while this user is still typing.
+            theirs = other.get_todo_by_id(todo.id)
+            theirs.details = "Their details"
+            other.update_todo(theirs, expected_version=theirs.version)
+            return "Mine"
+        return next(answers)
+
+    answers = iter(["1", "1", retry])
+    monkeypatch.setattr("builtins.input", answer)
+    app.edit_todo()
+    return app.todo_manager.get_todo_by_id(todo.id)
+
+
+def test_cli_edit_retries_on_conflict(monkeypatch, capsys, temp_data_dir):
+    saved = _edit_during_prompt(monkeypatch, temp_data_dir, "y")
+    out = capsys.readouterr().out
+
+    assert "changed by someone else" in out
+    assert "Title updated!" in out
+    assert (saved.title, saved.details, saved.version) == ("Mine", "Their details", 3)
+
+
+def test_cli_edit_can_discard_on_conflict(monkeypatch, capsys, temp_data_dir):
+    saved = _edit_during_prompt(monkeypatch, temp_data_dir, "n")
+    out = capsys.readouterr().out
+
+    assert "Edit discarded." in out
+    assert "Title updated!" not in out
+    assert (saved.title, saved.details, saved.version) == ("Original", "Their details", 2)
+
+
+def test_cli_mark_completed_does_not_overwrite_concurrent_edit(monkeypatch, capsys, temp_data_dir):
+    app = App(data_dir=temp_data_dir)
+    app.current_user = "alice"
+    todo = app.todo_manager.create_todo("Original", "", Priority.MID, "alice")
+    other = TodoManager(data_dir=temp_data_dir)
+
+    def answer(prompt=""):
+        if prompt.startswith("Re-fetch"):
+            return "n"
+        # Someone else saves while this user is picking the todo.
+        theirs = other.get_todo_by_id(todo.id)
+        theirs.title = "Theirs"
+        other.update_todo(theirs, expected_version=theirs.version)
+        return "1"
+
+    monkeypatch.setattr("builtins.input", answer)
+    app.mark_completed()
+    out = capsys.readouterr().out
+
+    assert "changed by someone else" in out
+    assert "marked as completed" not in out
+    saved = app.todo_manager.get_todo_by_id(todo.id)
+    assert (saved.title, saved.status, saved.version) == ("Theirs", Status.PENDING, 2)